@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+import contextlib
+import importlib
+import rdflib
+from generate_catalog import generate_catalog
+from catalog_loader import load_graph
+from text_analysis import clear_caches
+
+# Modules imported before measuring, so that no check is charged for its imports
+WARM_UP_MODULES = [
+    "check_accuracy", "check_compatibility", "check_completeness", "check_consistency", "check_licensing",
+    "check_lineage_provenance", "check_readability", "check_scalability", "check_similarity", "check_timeliness",
+    "similarity_matrix", "textstat", "nltk",
+]
+
+# Catalog sizes, in datasets and distributions
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5]
+
+# A check is reported as a regression when it is this many times slower than its baseline
+REGRESSION_RATIO = 1.5
+
+# Checks faster than this in the baseline are too noisy to be compared, in seconds
+MIN_BASELINE_SECONDS = 0.05
+
+
+def _completeness_dcat(graph, other):
+    from check_completeness import check_completeness
+    return check_completeness(graph, "dcat")
+
+
+def _completeness_dct(graph, other):
+    from check_completeness import check_completeness
+    return check_completeness(graph, "dct")
+
+
+def _consistency(graph, other):
+    from check_consistency import consistency_report
+    return {entity_type: rate["percentage"] for entity_type, rate in consistency_report(graph).items()}
+
+
+def _licensing(graph, other):
+    from check_licensing import check_licensing
+    return check_licensing(graph)
+
+
+def _timeliness(graph, other):
+    from check_timeliness import check_timeliness
+    return check_timeliness(graph)
+
+
+def _lineage_provenance(graph, other):
+    from check_lineage_provenance import check_lineage_provenance
+    return check_lineage_provenance(graph)
+
+
+def _readability(graph, other):
+    from check_readability import check_readability
+    return check_readability(graph)
+
+
+def _duplicates(graph, other):
+    from check_accuracy import calculate_duplicates
+    return calculate_duplicates(graph)
+
+
+def _core_links(graph, other):
+    from check_accuracy import core_links
+    return core_links(graph, "dcat")
+
+
+def _scalability(graph, other):
+    from check_scalability import check_scalability
+    return check_scalability(graph)
+
+
+def _compatibility(graph, other):
+    from check_compatibility import check_compatibility
+    return check_compatibility(graph, other)
+
+
+def _similarity(graph, other):
+    from check_similarity import check_similarity
+    return check_similarity(graph, other)
+
+
+# Benchmarked checks by name; link checking is left out because it measures the network
+CHECKS = {
+    "completeness_dcat": _completeness_dcat,
+    "completeness_dct": _completeness_dct,
+    "consistency": _consistency,
+    "licensing": _licensing,
+    "timeliness": _timeliness,
+    "lineage_provenance": _lineage_provenance,
+    "readability": _readability,
+    "duplicates": _duplicates,
+    "core_links": _core_links,
+    "scalability": _scalability,
+    "compatibility": _compatibility,
+    "similarity": _similarity,
+}
+
+
+def measure(function, memory=True):
+    """
+    Runs a function once for its wall and CPU time, and once more under tracemalloc for its peak memory.
+    The memoized text analysis is cleared before each run, so that neither run reuses the other's work.
+
+    Returns:
+        dict: The wall and CPU seconds, the peak of traced memory in bytes (None if not measured), and the result or error.
+    """
+    measurement = {}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            clear_caches()
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            result = function()
+            measurement["seconds"] = time.perf_counter() - wall_start
+            measurement["cpu_seconds"] = time.process_time() - cpu_start
+            measurement["peak_bytes"] = None
+            if memory:
+                clear_caches()
+                tracemalloc.start()
+                try:
+                    function()
+                    measurement["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+        measurement["result"] = result
+    except Exception as e:
+        measurement["error"] = f"{type(e).__name__}: {e}"
+    return measurement
+
+
+def benchmark(entities, checks=None, memory=True, distributions=2, seed=0):
+    """
+    Generates a synthetic catalog of the given size and a second one to compare it with, and measures every check on it.
+
+    Args:
+        entities (int): The number of datasets and distributions of the catalog.
+        checks (list): The names of the checks to measure. Defaults to every check.
+        memory (bool): Whether to measure peak memory too, which runs every check twice.
+        distributions (int): The average number of distributions per dataset.
+        seed (int): The seed of the generated catalogs.
+
+    Returns:
+        dict: The measurement of parsing and of each check, keyed by name, with the triples scanned and their rate.
+    """
+    for module in WARM_UP_MODULES:
+        importlib.import_module(module)
+
+    datasets = max(1, entities // (1 + distributions))
+    rdf_data = generate_catalog(datasets, distributions=distributions, seed=seed)
+    other = load_graph(generate_catalog(datasets, distributions=distributions, seed=seed + 1))
+
+    graph = None
+    def parse():
+        nonlocal graph
+        graph = load_graph(rdf_data)
+        return len(graph)
+
+    measurements = {"parse": measure(parse, memory)}
+    triples = len(graph)
+    for name in checks or CHECKS:
+        measurements[name] = measure(lambda: CHECKS[name](graph, other), memory)
+    for measurement in measurements.values():
+        measurement["triples"] = triples
+        if "seconds" in measurement:
+            measurement["triples_per_second"] = triples / measurement["seconds"] if measurement["seconds"] else None
+    return measurements
+
+
+def compare(report, baseline, ratio=REGRESSION_RATIO):
+    """
+    Lists the checks of a report that are slower than in the baseline by more than the given ratio.
+
+    Returns:
+        list: (entities, check, seconds, baseline seconds) for every regression.
+    """
+    regressions = []
+    for entities, measurements in report["sizes"].items():
+        for name, measurement in measurements.items():
+            previous = baseline.get("sizes", {}).get(entities, {}).get(name, {})
+            if "seconds" not in measurement or previous.get("seconds", 0) < MIN_BASELINE_SECONDS:
+                continue
+            if measurement["seconds"] > previous["seconds"] * ratio:
+                regressions.append((entities, name, measurement["seconds"], previous["seconds"]))
+    return regressions
+
+
+"""
+Measures how every check scales on synthetic catalogs, reporting wall time, triples per second and peak memory.
+
+Usage: python benchmark_checks.py [--sizes 1000,10000,100000] [--checks completeness_dcat,licensing] [--no-memory]
+           [--save baseline.json] [--baseline baseline.json] [--ratio 1.5]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Measure how the quality checks scale on synthetic catalogs.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES), help="Comma-separated numbers of datasets and distributions")
+    parser.add_argument("--checks", help=f"Comma-separated checks to measure (default: all). Available: {', '.join(CHECKS)}")
+    parser.add_argument("--no-memory", action="store_true", help="Do not measure peak memory, which runs every check twice")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated catalogs")
+    parser.add_argument("--save", help="Write the measurements to this JSON file, e.g. as a new baseline")
+    parser.add_argument("--baseline", help="Compare the measurements with a JSON file written by --save")
+    parser.add_argument("--ratio", type=float, default=REGRESSION_RATIO, help="Slowdown over the baseline reported as a regression")
+    args = parser.parse_args()
+
+    checks = args.checks.split(",") if args.checks else None
+    unknown = [name for name in checks or [] if name not in CHECKS]
+    if unknown:
+        print(f"Unknown checks: {', '.join(unknown)}")
+        sys.exit(1)
+
+    report = {"python": platform.python_version(), "rdflib": rdflib.__version__, "machine": platform.machine(), "sizes": {}}
+    print(f"{'entities':>9} {'triples':>9} {'check':<20} {'seconds':>9} {'triples/s':>11} {'peak MB':>8}")
+    for entities in (int(size) for size in args.sizes.split(",")):
+        measurements = benchmark(entities, checks, not args.no_memory, seed=args.seed)
+        report["sizes"][str(entities)] = measurements
+        for name, measurement in measurements.items():
+            if "error" in measurement:
+                print(f"{entities:>9} {measurement['triples']:>9} {name:<20} {measurement['error']}")
+                continue
+            peak = f"{measurement['peak_bytes'] / 1024 ** 2:>8.1f}" if measurement["peak_bytes"] is not None else f"{'-':>8}"
+            print(f"{entities:>9} {measurement['triples']:>9} {name:<20} {measurement['seconds']:>9.3f} "
+                  f"{measurement['triples_per_second'] or 0:>11.0f} {peak}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.ratio)
+        for entities, name, seconds, previous in regressions:
+            print(f"Regression: {name} on {entities} entities took {seconds:.3f}s against {previous:.3f}s in the baseline.")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import glob
+import time
+from rdflib import Graph, RDF
+from check_consistency import ENTITY_CLASSES, consistency_report
+
+
+def legacy_consistency(rdf_data, entity_type):
+    """
+    The check that consistency_report replaced: one parse and one walk per entity type, with the values of
+    each (subject, predicate) pair kept in a list, and only the last entity's pairs in the denominator.
+    """
+    graph = Graph()
+    graph.parse(data=rdf_data, format="turtle")
+    contradictions = set()
+    subjects_predicates = {}
+    for entity in graph.subjects(RDF.type, ENTITY_CLASSES[entity_type]):
+        subjects_predicates = {}
+        for subj, pred, obj in graph.triples((entity, None, None)):
+            if (subj, pred) in subjects_predicates:
+                objects = subjects_predicates[(subj, pred)]
+                if obj not in objects:
+                    contradictions.add((subj, pred))
+                objects.append(obj)
+            else:
+                subjects_predicates[(subj, pred)] = [obj]
+    return len(contradictions) / len(subjects_predicates) * 100 if subjects_predicates else 0
+
+
+"""
+Compares one consistency_report pass over every entity type with the former one-type-per-invocation check.
+
+Usage: python benchmark_consistency.py [catalog.ttl ...] [--repeat N]
+"""
+def main():
+    arguments = sys.argv[1:]
+    repeat = 5
+    if "--repeat" in arguments:
+        position = arguments.index("--repeat")
+        repeat = int(arguments[position + 1])
+        del arguments[position:position + 2]
+    paths = arguments or sorted(glob.glob("Official catalogs/*.ttl"))
+
+    try:
+        print(f"{'catalog':<32} {'triples':>8} {'legacy (ms)':>12} {'engine (ms)':>12} {'speedup':>8}")
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                rdf_data = f.read()
+
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                legacy = {entity_type: legacy_consistency(rdf_data, entity_type) for entity_type in ENTITY_CLASSES}
+            legacy_time = (time.perf_counter() - start_time) / repeat
+
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                graph = Graph()
+                graph.parse(data=rdf_data, format="turtle")
+                report = consistency_report(graph)
+            engine_time = (time.perf_counter() - start_time) / repeat
+
+            print(f"{path[-32:]:<32} {len(graph):>8} {legacy_time * 1000:>12.1f} {engine_time * 1000:>12.1f} {legacy_time / engine_time:>7.1f}x")
+            for entity_type in ENTITY_CLASSES:
+                print(f"    {entity_type:<14} legacy {legacy[entity_type]:6.2f}%  pooled {report[entity_type]['percentage']:6.2f}%")
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import subprocess
+
+# Import-time budget of each module, in seconds, on a typical development machine
+IMPORT_BUDGETS = {
+    "check_accuracy": 0.3,
+    "check_compatibility": 0.3,
+    "check_completeness": 0.3,
+    "check_consistency": 0.3,
+    "check_licensing": 0.3,
+    "check_lineage_provenance": 0.3,
+    "check_readability": 0.3,
+    "check_scalability": 0.3,
+    "check_similarity": 0.3,
+    "check_timeliness": 0.3,
+    "check_all": 0.3,
+}
+
+# Heavy dependencies that no module may import until a check actually needs them
+LAZY_MODULES = ["nltk", "textstat", "requests", "numpy", "scipy"]
+
+# Each measurement keeps the best of this many fresh interpreters
+REPEATS = 3
+
+
+def import_time(module):
+    """
+    Measures the cumulative import time of a module in a fresh interpreter with python -X importtime.
+
+    Returns:
+        tuple: The import time in seconds, and the heavy modules that got imported with it.
+    """
+    code = f"import sys, {module}; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    # Lines look like "import time: self [us] | cumulative | imported package"
+    cumulative = None
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1]) / 1e6
+    loaded = [name for name in completed.stdout.strip().split(",") if name]
+    return cumulative, loaded
+
+
+"""
+Measures the import time of every check module against its budget and verifies that heavy dependencies are imported lazily.
+
+Usage: python benchmark_imports.py [scale]
+    scale multiplies every budget, e.g. 2 on a slow machine.
+"""
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+
+    failed = False
+    print(f"{'module':<26} {'import (s)':>10} {'budget (s)':>10}  eager heavy imports")
+    for module, budget in IMPORT_BUDGETS.items():
+        timings = [import_time(module) for _ in range(REPEATS)]
+        seconds = min(cumulative for cumulative, _ in timings)
+        loaded = timings[-1][1]
+        over = seconds > budget * scale or loaded
+        failed = failed or over
+        print(f"{module:<26} {seconds:>10.3f} {budget * scale:>10.3f}  {', '.join(loaded) or '-'}{'  OVER BUDGET' if over else ''}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
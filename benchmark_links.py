@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from link_checker import LinkChecker
+from link_cache import LinkCache
+
+# Seconds the slow endpoint waits before answering; the hanging one outlives the read timeout
+SLOW_DELAY = 0.2
+HANG_DELAY = 3.0
+STAND_IN_ETAG = '"stand-in-v1"'
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Accept bursts of concurrent connections from every checker worker
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # Clients dropping idle keep-alive connections or timing out is expected here
+        pass
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the hosts linked from a catalog, simulating slow, failing and redirecting servers.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def _answer(self, include_body):
+        path = self.path.split("?")[0]
+        if path.startswith("/slow"):
+            time.sleep(SLOW_DELAY)
+        if path.startswith("/hang"):
+            time.sleep(HANG_DELAY)
+        if path.startswith("/fail"):
+            status = 500
+        elif path.startswith("/missing"):
+            status = 404
+        elif path.startswith("/no-head") and not include_body:
+            status = 405
+        elif path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", "/ok" + path[len("/redirect"):])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        elif self.headers.get("If-None-Match") == STAND_IN_ETAG:
+            self.send_response(304)
+            self.send_header("ETag", STAND_IN_ETAG)
+            self.end_headers()
+            return
+        else:
+            status = 200
+        body = b"stand-in"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", STAND_IN_ETAG)
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._answer(include_body=False)
+
+    def do_GET(self):
+        self._answer(include_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_hosts(count):
+    """
+    Starts several local HTTP servers, one per simulated host.
+
+    Returns:
+        list: The running servers.
+    """
+    servers = []
+    for _ in range(count):
+        server = StandInServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def build_uris(servers, per_kind):
+    """
+    Builds the URIs to check together with the status each one is expected to end with.
+    """
+    kinds = {"ok": 200, "slow": 200, "redirect": 200, "no-head": 200, "fail": 500, "missing": 404, "hang": None}
+    expected = {}
+    for server in servers:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        for kind, status in kinds.items():
+            count = 1 if kind == "hang" else per_kind
+            for i in range(count):
+                expected[f"{base}/{kind}/{i}"] = status
+    return expected
+
+
+def timed_check(occurrences, cache=None):
+    """
+    Checks the URIs once and returns their statuses together with the elapsed seconds.
+    """
+    with LinkChecker(max_workers=32, per_host=8, connect_timeout=1.0, read_timeout=1.0, cache=cache) as checker:
+        start_time = time.perf_counter()
+        statuses = checker.check_uris(occurrences)
+        return statuses, time.perf_counter() - start_time
+
+
+"""
+Benchmarks the concurrent link checker against local stand-in hosts and reports its throughput in checked URIs per second,
+without a cache, with a warm LinkCache and when revalidating expired cache entries.
+
+Usage: python benchmark_links.py [hosts] [uris_per_kind]
+"""
+def main():
+    hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    per_kind = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+
+    servers = start_stand_in_hosts(hosts)
+    expected = build_uris(servers, per_kind)
+    # Catalogs repeat the same links many times; repeated URIs must not be fetched again
+    occurrences = list(expected) * 3
+
+    runs = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        try:
+            runs.append(("no cache", *timed_check(occurrences)))
+            with LinkCache(os.path.join(cache_dir, "links.sqlite")) as cache:
+                runs.append(("cold cache", *timed_check(occurrences, cache)))
+                runs.append(("warm cache", *timed_check(occurrences, cache)))
+                # Expire every entry so that good links are revalidated with conditional requests
+                cache.good_ttl = cache.broken_ttl = 0
+                runs.append(("revalidation", *timed_check(occurrences, cache)))
+        finally:
+            for server in servers:
+                server.shutdown()
+
+    print(f"{len(expected)} distinct URIs ({len(occurrences)} occurrences) on {hosts} hosts.")
+    failed = False
+    for name, statuses, elapsed in runs:
+        print(f"{name:>12}: {elapsed:.3f}s, {len(statuses) / elapsed:.1f} checked URIs per second")
+        for uri, status in statuses.items():
+            if status != expected[uri]:
+                print(f"Unexpected status for {uri}: {status} (expected {expected[uri]})")
+                failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
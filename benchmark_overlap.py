@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+# Fraction of the triples of the first catalog that the second one also has
+OVERLAP = 0.5
+
+# Catalogs above this many triples are not compared in memory, which would not fit
+MAX_IN_MEMORY_TRIPLES = 10 ** 6
+
+# Memory budget of the out-of-core engine, in bytes
+MEMORY_BUDGET = 64 * 1024 ** 2
+
+
+def write_synthetic_catalog(path, triples, offset):
+    """
+    Writes an N-Triples catalog of datasets with a title, a description, a license and a distribution,
+    numbering its datasets from offset so that two catalogs overlap where their numbers do.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(offset, offset + triples // 4):
+            dataset = f"<http://example.org/dataset/{number}>"
+            f.write(f'{dataset} <http://purl.org/dc/terms/title> "Dataset {number}" .\n')
+            f.write(f'{dataset} <http://purl.org/dc/terms/description> "Synthetic dataset number {number} of the benchmark."@en .\n')
+            f.write(f"{dataset} <http://purl.org/dc/terms/license> <http://example.org/license/{number % 7}> .\n")
+            f.write(f"{dataset} <http://www.w3.org/ns/dcat#distribution> <http://example.org/distribution/{number}> .\n")
+
+
+def measure(mode, path1, path2):
+    """
+    Computes the compatibility in a fresh interpreter, so that its peak memory is not shared with other runs.
+    """
+    code = (
+        "import sys, json, time, resource\n"
+        "start_time = time.perf_counter()\n"
+        "if sys.argv[1] == 'out-of-core':\n"
+        "    from triple_overlap import compatibility\n"
+        "    result = compatibility(sys.argv[2], sys.argv[3], 'nt', int(sys.argv[4]))\n"
+        "else:\n"
+        "    from check_compatibility import check_compatibility\n"
+        "    from catalog_loader import load_catalog_file\n"
+        "    result = check_compatibility(load_catalog_file(sys.argv[2], 'nt'), load_catalog_file(sys.argv[3], 'nt'))\n"
+        "seconds = time.perf_counter() - start_time\n"
+        "peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024\n"
+        "print(json.dumps({'result': result, 'seconds': seconds, 'peak': peak}))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code, mode, path1, path2, str(MEMORY_BUDGET)],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(completed.stdout)
+
+
+"""
+Measures the time and peak memory of the out-of-core compatibility engine on synthetic catalogs,
+and compares it with the in-memory check_compatibility where that fits.
+
+Usage: python benchmark_overlap.py [triples ...]
+    e.g. python benchmark_overlap.py 1000000 10000000 100000000
+"""
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10 ** 5, 10 ** 6]
+
+    print(f"{'triples':>11} {'mode':>12} {'seconds':>9} {'triples/s':>10} {'peak MB':>8} {'result':>8}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path1 = os.path.join(directory, "catalog1.nt")
+            path2 = os.path.join(directory, "catalog2.nt")
+            write_synthetic_catalog(path1, size, 0)
+            write_synthetic_catalog(path2, size, int(size // 4 * (1 - OVERLAP)))
+
+            modes = ["out-of-core"] + (["in-memory"] if size <= MAX_IN_MEMORY_TRIPLES else [])
+            results = []
+            for mode in modes:
+                measurement = measure(mode, path1, path2)
+                results.append(measurement["result"])
+                print(f"{size:>11} {mode:>12} {measurement['seconds']:>9.1f} {2 * size / measurement['seconds']:>10.0f} "
+                      f"{measurement['peak'] / 1024 ** 2:>8.0f} {measurement['result']:>7.1f}%")
+            if len(set(results)) > 1:
+                print(f"Results differ for {size} triples: {results}")
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
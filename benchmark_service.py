@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import glob
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Checks requested by default; the pairwise and link-checking ones depend on a second catalog or the network
+CHECKS = ["completeness", "consistency", "timeliness", "licensing", "lineage_provenance", "readability"]
+
+
+def score(url, path, checks):
+    """
+    Sends one scoring request and returns its latency in seconds, and whether it succeeded: a request
+    fails if the service answers with an error or if any of the checks failed.
+    """
+    body = json.dumps({"path": path, "checks": checks}).encode("utf-8")
+    request = urllib.request.Request(f"{url}/score", data=body, headers={"Content-Type": "application/json"})
+    start_time = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            report = json.load(response)
+            ok = response.status == 200 and "error" not in report and not report.get("errors")
+    except Exception:
+        ok = False
+    return time.perf_counter() - start_time, ok
+
+
+def load_test(url, paths, checks, requests, concurrency):
+    """
+    Sends requests for the catalogs in turn from concurrent clients.
+
+    Returns:
+        dict: The number of requests and failures, the requests per second, and the p50, p99 and maximum latencies in milliseconds.
+    """
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda i: score(url, paths[i % len(paths)], checks), range(requests)))
+    elapsed = time.perf_counter() - start_time
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    return {
+        "requests": requests,
+        "failures": sum(1 for _, ok in results if not ok),
+        "requests_per_second": requests / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "max_ms": float(latencies.max()),
+    }
+
+
+"""
+Load-tests the scoring service, started in this process unless a URL is given, with warm catalogs.
+
+Usage: python benchmark_service.py [glob] [--url http://127.0.0.1:8750] [--requests 200] [--concurrency 8] [--workers 4] [--checks completeness,licensing]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Reports the latency and throughput of the scoring service.")
+    parser.add_argument("pattern", nargs="?", default="Official catalogs/*.ttl", help="The catalogs to request.")
+    parser.add_argument("--url", help="A running scoring service; by default one is started in this process.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients.")
+    parser.add_argument("--workers", type=int, default=4, help="Worker threads of the service started here.")
+    parser.add_argument("--checks", default=",".join(CHECKS), help="Comma-separated checks to request.")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.pattern))
+    if not paths:
+        print(f"No catalogs match {args.pattern}")
+        sys.exit(1)
+    checks = args.checks.split(",")
+
+    server = None
+    try:
+        url = args.url
+        if url is None:
+            from scoring_service import serve
+            server = serve(port=0, workers=args.workers)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+        # The first round parses every catalog; the measured rounds find them warm
+        cold = load_test(url, paths, checks, len(paths), 1)
+        print(f"Cold: {cold['p50_ms']:.1f} ms p50 over {len(paths)} catalogs")
+        warm = load_test(url, paths, checks, args.requests, args.concurrency)
+        print(f"Warm: {warm['requests']} requests from {args.concurrency} clients, {warm['failures']} failed")
+        print(f"    {warm['requests_per_second']:.1f} requests/s, p50 {warm['p50_ms']:.1f} ms, "
+              f"p99 {warm['p99_ms']:.1f} ms, max {warm['max_ms']:.1f} ms")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            server.service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import time
+import random
+from check_similarity import jaccard_similarity
+from similarity_matrix import mean_jaccard_similarity
+
+# Pairwise loops above this many pairs are too slow to be worth timing
+MAX_LOOP_PAIRS = 4 * 10 ** 6
+
+
+def synthetic_token_sets(count, vocabulary_size, rng):
+    """
+    Builds title-like token sets drawn from a skewed vocabulary, so that common words overlap often.
+    """
+    vocabulary = [f"token{i}" for i in range(vocabulary_size)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    return [set(rng.choices(vocabulary, weights, k=rng.randint(1, 12))) for _ in range(count)]
+
+
+def loop_mean_jaccard(sets1, sets2):
+    """
+    The pairwise Python loop that check_similarity used before the sparse engine.
+    """
+    return sum(jaccard_similarity(set1, set2) for set1 in sets1 for set2 in sets2) / (len(sets1) * len(sets2))
+
+
+"""
+Compares the pairwise Python loop with the sparse-matrix engine for the mean Jaccard similarity as catalogs grow.
+
+Usage: python benchmark_similarity.py [size ...]
+"""
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 300, 1000, 3000, 10000, 30000]
+    rng = random.Random(42)
+
+    print(f"{'datasets':>9} {'loop (s)':>10} {'sparse (s)':>11} {'speedup':>8}")
+    for size in sizes:
+        sets1 = synthetic_token_sets(size, 5000, rng)
+        sets2 = synthetic_token_sets(size, 5000, rng)
+
+        start_time = time.perf_counter()
+        sparse_result = mean_jaccard_similarity(sets1, sets2)
+        sparse_time = time.perf_counter() - start_time
+
+        if size * size > MAX_LOOP_PAIRS:
+            print(f"{size:>9} {'-':>10} {sparse_time:>11.3f} {'-':>8}")
+            continue
+        start_time = time.perf_counter()
+        loop_result = loop_mean_jaccard(sets1, sets2)
+        loop_time = time.perf_counter() - start_time
+
+        if abs(loop_result - sparse_result) > 1e-9:
+            print(f"Results differ for {size} datasets: {loop_result} != {sparse_result}")
+            sys.exit(1)
+        print(f"{size:>9} {loop_time:>10.3f} {sparse_time:>11.3f} {loop_time / sparse_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+from rdflib import Graph
+from instrumentation import phase, scanned
+
+# Directory of the parsed-graph cache; when set, every check loads cached catalogs instead of reparsing them
+GRAPH_CACHE_ENV = "DATAQ_GRAPH_CACHE"
+
+_graph_cache = None
+
+
+def configure_graph_cache(directory, max_bytes=None):
+    """
+    Enables the content-addressed cache of parsed catalogs for every check, or disables it.
+
+    Args:
+        directory (str): The cache directory, or None to disable the cache.
+        max_bytes (int): The size of the directory above which entries are evicted.
+    """
+    global _graph_cache
+    if directory is None:
+        _graph_cache = None
+        return
+    from graph_cache import GraphCache, MAX_BYTES
+    _graph_cache = GraphCache(directory, max_bytes or MAX_BYTES)
+
+
+def is_graph(rdf_data):
+    """
+    Tells whether a catalog is already parsed: an rdflib graph, or a read-only graph such as
+    compact_store.CompactGraph that answers the same lookups.
+    """
+    return isinstance(rdf_data, Graph) or hasattr(rdf_data, "triples")
+
+
+def load_graph(rdf_data, format="turtle"):
+    """
+    Returns an RDF graph for the given Data Catalog, parsing it only if needed.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+        format (str): The serialization format of rdf_data when it is a string.
+
+    Returns:
+        rdflib.Graph: The parsed RDF graph.
+    """
+    if is_graph(rdf_data):
+        scanned(rdf_data)
+        return rdf_data
+    with phase("parse"):
+        if _graph_cache is not None:
+            graph = _graph_cache.get_graph(rdf_data, format)
+        else:
+            graph = Graph()
+            graph.parse(data=rdf_data, format=format)
+    scanned(graph)
+    return graph
+
+
+def load_catalog_file(path, format="turtle"):
+    """
+    Reads a Data Catalog file and parses it into an RDF graph.
+
+    Args:
+        path (str): The path to the Data Catalog file.
+        format (str): The serialization format of the file.
+
+    Returns:
+        rdflib.Graph: The parsed RDF graph.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        rdf_data = f.read()
+    return load_graph(rdf_data, format=format)
+
+
+if os.environ.get(GRAPH_CACHE_ENV):
+    configure_graph_cache(os.environ[GRAPH_CACHE_ENV])
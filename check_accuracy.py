@@ -5,9 +5,12 @@
 @author: Jorge Martinez-Gil
 """
 import sys
-from collections import defaultdict
-from rdflib import Graph, RDF, Namespace, URIRef
-import requests
+from collections import defaultdict, Counter
+from rdflib import Namespace, URIRef
+from catalog_loader import load_graph
+from instrumentation import instrumented
+from link_checker import LinkChecker
+from link_cache import LinkCache
 
 # Define some RDF prefixes
 dcat = Namespace("http://www.w3.org/ns/dcat#")
@@ -21,50 +24,51 @@ dct_properties = [
     dct.description
 ]
 
-def check_links(rdf_data):
+@instrumented("links")
+def check_links(rdf_data, checker=None):
     """
     Checks the links in an RDF graph to see if they are broken.
 
+    Every distinct link is fetched once, concurrently, and its result is counted for each of its occurrences.
+
     Args:
-        rdf_data (str): The RDF data to check for broken links.
+        rdf_data (str or rdflib.Graph): The RDF data to check for broken links.
+        checker (LinkChecker): The link checker to use. Defaults to a LinkChecker with default limits.
 
     Returns:
         float: The percentage of broken links in the RDF data.
     """
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
-    total_links = 0
-    broken_links = 0
-    for s, p, o in graph:
-        if isinstance(o, URIRef):
-            total_links += 1
-            try:
-                response = requests.get(o)
-                if response.status_code != 200:
-                    broken_links += 1
-            except:
-                broken_links += 1
+    graph = load_graph(rdf_data)
+    occurrences = Counter(str(o) for o in graph.objects() if isinstance(o, URIRef))
+    total_links = sum(occurrences.values())
     if total_links == 0:
         print("No links found in the RDF data.")
         return 0
+
+    if checker is None:
+        with LinkChecker() as checker:
+            statuses = checker.check_uris(occurrences)
     else:
-        percentage_broken = (broken_links / total_links) * 100
-        print(f"{percentage_broken}% of links are broken.")
-        return percentage_broken
+        statuses = checker.check_uris(occurrences)
+    broken_links = sum(count for uri, count in occurrences.items() if statuses[uri] != 200)
+
+    percentage_broken = (broken_links / total_links) * 100
+    print(f"{percentage_broken}% of links are broken.")
+    return percentage_broken
 
 
+@instrumented("duplicates")
 def calculate_duplicates(rdf_data):
     """
     Calculates the percentage of duplicated datasets or distributions in a Data Catalog.
 
     Args:
-        rdf_data (str): The RDF data to check for duplicates.
+        rdf_data (str or rdflib.Graph): The RDF data to check for duplicates.
 
     Returns:
         float: The percentage of duplicated datasets or distributions in the RDF data.
     """
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
+    graph = load_graph(rdf_data)
 
     duplicates = defaultdict(int)
     for s, p, o in graph.triples((None, None, None)):
@@ -81,12 +85,13 @@ def calculate_duplicates(rdf_data):
         return percentage_duplicates
 
 
+@instrumented("core_links")
 def core_links(rdf_data, property_set):
     """
     Calculates the percentage of missing core properties in a Data Catalog.
 
     Args:
-        rdf_data (str): The RDF data to check for missing core properties.
+        rdf_data (str or rdflib.Graph): The RDF data to check for missing core properties.
         property_set (str): The property set to use ('dcat' or 'dct').
 
     Returns:
@@ -96,32 +101,31 @@ def core_links(rdf_data, property_set):
         dcat.title,
         rdf.type
     ]
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
-    completeness_scores = []
-    for subject_type in [dcat.Catalog, dcat.Dataset, dcat.Distribution]:
-        for subject in graph.subjects(RDF.type, subject_type):
-            completeness_score = calculate_completeness(graph, subject, required_properties)
-            completeness_scores.append(completeness_score)
-    result = sum(completeness_scores) / len(completeness_scores)
+    profile = {subject_type: required_properties for subject_type in [dcat.Catalog, dcat.Dataset, dcat.Distribution]}
+    from completeness_engine import PresenceMatrix
+    result = PresenceMatrix(rdf_data).evaluate(profile)["completeness"]
     print(f"{result}% of core properties are not present using {property_set.upper()} properties.")
     return result
 
 
-def check_accuracy(rdf_data, property_set):
+@instrumented("accuracy")
+def check_accuracy(rdf_data, property_set, checker=None):
     """
     Calculates the accuracy of a Data Catalog file by averaging the percentages of broken links, duplicated datasets or distributions, and missing core properties.
 
     Args:
-        rdf_data (str): The RDF data to check for accuracy.
+        rdf_data (str or rdflib.Graph): The RDF data to check for accuracy.
         property_set (str): The property set to use ('dcat' or 'dct').
+        checker (LinkChecker): The link checker to use, e.g. one backed by a LinkCache.
 
     Returns:
         float: The accuracy of the RDF data file.
     """
-    core_result = core_links(rdf_data, property_set)
-    duplicates_result = calculate_duplicates(rdf_data)
-    check_links_result = check_links(rdf_data)
+    # Parse once and share the graph between the three measures
+    graph = load_graph(rdf_data)
+    core_result = core_links(graph, property_set)
+    duplicates_result = calculate_duplicates(graph)
+    check_links_result = check_links(graph, checker)
     mean = (core_result + duplicates_result + check_links_result) / 3
     return mean
     
@@ -147,12 +151,12 @@ def calculate_completeness(graph, subject, required_properties):
 """
 This program checks the accuracy of a Data Catalog by calculating the percentage of broken links, duplicated datasets or distributions, and missing core properties.
 
-Usage: python check_accuracy.py filepath
+Usage: python check_accuracy.py filepath [dcat|dct] [link_cache.sqlite]
 """
 def main():
     try:
         if len(sys.argv) < 3:
-            print("Usage: python check_accuracy.py filepath [dcat|dct]")
+            print("Usage: python check_accuracy.py filepath [dcat|dct] [link_cache.sqlite]")
             sys.exit(1)
 
         rdf_data_path = sys.argv[1]
@@ -165,7 +169,12 @@ def main():
         with open(rdf_data_path, "r", encoding="utf-8") as f:
             rdf_data = f.read()
 
-        result = check_accuracy(rdf_data, property_set)
+        if len(sys.argv) > 3:
+            # Reuse the link results of previous runs stored in the given cache file
+            with LinkCache(sys.argv[3]) as cache, LinkChecker(cache=cache) as checker:
+                result = check_accuracy(rdf_data, property_set, checker)
+        else:
+            result = check_accuracy(rdf_data, property_set)
         print(f"The accuracy of {rdf_data_path} using {property_set.upper()} properties is {result}%.")
 
     except FileNotFoundError:
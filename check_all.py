@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import json
+import argparse
+import instrumentation
+from catalog_loader import load_graph, configure_graph_cache
+from graph_cache import content_key
+from result_cache import VOLATILE_CHECKS, FORMAT_VERSION, configure_result_cache, get_result_cache, implementation_version
+
+# Entity types evaluated by the consistency check
+ENTITY_TYPES = ["catalog", "dataset", "distribution"]
+
+
+class CatalogContext:
+    """
+    Holds a Data Catalog parsed once, together with the options shared by the quality checks.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+        property_set (str): The property set to use ('dcat' or 'dct').
+        entity_types (list): The entity types evaluated by the consistency check.
+        other (str or rdflib.Graph): An optional second catalog for the compatibility and similarity checks.
+        link_checker (LinkChecker): The link checker used by the accuracy check.
+    """
+
+    def __init__(self, rdf_data, property_set="dcat", entity_types=None, other=None, link_checker=None):
+        self.rdf_data = rdf_data
+        self.property_set = property_set
+        self.entity_types = entity_types or ENTITY_TYPES
+        self.other_data = other
+        self.link_checker = link_checker
+        self._graph = None
+        self._other = None
+
+    # Both catalogs are parsed on first use, so that a run answered entirely from the result cache parses neither
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            self._graph = load_graph(self.rdf_data)
+        return self._graph
+
+    @property
+    def other(self):
+        if self._other is None and self.other_data is not None:
+            self._other = load_graph(self.other_data)
+        return self._other
+
+
+def _run_accuracy(context):
+    from check_accuracy import check_accuracy
+    return check_accuracy(context.graph, context.property_set, context.link_checker)
+
+
+def _run_completeness(context):
+    from check_completeness import check_completeness
+    return check_completeness(context.graph, context.property_set)
+
+
+def _run_consistency(context):
+    from check_consistency import consistency_report
+    report = consistency_report(context.graph, context.entity_types)
+    return {entity_type: report[entity_type]["percentage"] for entity_type in context.entity_types}
+
+
+def _run_scalability(context):
+    from check_scalability import check_scalability
+    return check_scalability(context.graph)
+
+
+def _run_timeliness(context):
+    from check_timeliness import check_timeliness
+    return check_timeliness(context.graph)
+
+
+def _run_licensing(context):
+    from check_licensing import check_licensing
+    return check_licensing(context.graph)
+
+
+def _run_lineage_provenance(context):
+    from check_lineage_provenance import check_lineage_provenance
+    return check_lineage_provenance(context.graph)
+
+
+def _run_readability(context):
+    from check_readability import check_readability
+    return check_readability(context.graph)
+
+
+def _run_compatibility(context):
+    from check_compatibility import check_compatibility
+    if context.other is None:
+        raise ValueError("The compatibility check requires a second catalog.")
+    return check_compatibility(context.graph, context.other)
+
+
+def _run_similarity(context):
+    from check_similarity import check_similarity
+    if context.other is None:
+        raise ValueError("The similarity check requires a second catalog.")
+    return check_similarity(context.graph, context.other)
+
+
+# Quality checks by name; the check modules are imported only when their check runs
+CHECKS = {
+    "accuracy": _run_accuracy,
+    "completeness": _run_completeness,
+    "consistency": _run_consistency,
+    "scalability": _run_scalability,
+    "timeliness": _run_timeliness,
+    "licensing": _run_licensing,
+    "lineage_provenance": _run_lineage_provenance,
+    "readability": _run_readability,
+    "compatibility": _run_compatibility,
+    "similarity": _run_similarity,
+}
+
+# Checks that compare the catalog against a second one
+PAIRWISE_CHECKS = ["compatibility", "similarity"]
+
+
+def run_checks(rdf_data, checks=None, property_set="dcat", entity_types=None, other=None, link_checker=None):
+    """
+    Parses a Data Catalog once and runs a subset of the quality checks against it.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+        checks (list): The names of the checks to run. Defaults to every check that applies.
+        property_set (str): The property set to use ('dcat' or 'dct').
+        entity_types (list): The entity types evaluated by the consistency check.
+        other (str or rdflib.Graph): An optional second catalog for the compatibility and similarity checks.
+        link_checker (LinkChecker): The link checker used by the accuracy check, e.g. one backed by a LinkCache.
+
+    When a result cache is configured and rdf_data is the catalog's content, the results of the checks that
+    depend only on the catalog are reused, and the catalog is parsed only if one of them is missing.
+
+    Returns:
+        dict: A report with the number of triples, the result of every check that succeeded
+        and the error message of every check that failed.
+    """
+    if checks is None:
+        checks = [name for name in CHECKS if other is not None or name not in PAIRWISE_CHECKS]
+    unknown = [name for name in checks if name not in CHECKS]
+    if unknown:
+        raise ValueError(f"Invalid check name(s): {', '.join(unknown)}")
+
+    context = CatalogContext(rdf_data, property_set, entity_types, other, link_checker)
+    cache = get_result_cache()
+    digest = content_key(rdf_data) if cache is not None and isinstance(rdf_data, (str, bytes)) else None
+    other_digest = content_key(other) if isinstance(other, (str, bytes)) else None
+    params = {"completeness": [property_set], "consistency": [context.entity_types],
+              "compatibility": [other_digest], "similarity": [other_digest]}
+
+    def run(name):
+        cacheable = (digest is not None and name not in VOLATILE_CHECKS
+                     and (name not in PAIRWISE_CHECKS or other_digest is not None))
+        if not cacheable:
+            return CHECKS[name](context)
+        return cache.get_or_compute(name, implementation_version(f"check_{name}", CHECKS[name]), digest, params.get(name, []),
+                                    lambda: CHECKS[name](context))
+
+    if digest is None:
+        triples = len(context.graph)
+    else:
+        triples = cache.get_or_compute("triples", FORMAT_VERSION, digest, [], lambda: len(context.graph))
+    report = {"triples": triples, "results": {}, "errors": {}}
+    for name in checks:
+        try:
+            report["results"][name] = run(name)
+        except Exception as e:
+            report["errors"][name] = f"{type(e).__name__}: {e}"
+    return report
+
+
+"""
+This program parses a Data Catalog once and runs any subset of the quality checks against it, printing one JSON report.
+
+Usage: python check_all.py filepath [--checks accuracy,completeness,...] [--property-set dcat|dct] [--other filepath2] [--link-cache file.sqlite] [--graph-cache directory]
+       [--result-cache file.sqlite] [--metrics-json file.json] [--metrics-prometheus file.prom] [--metrics-memory]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Runs the quality checks against a Data Catalog parsed once.")
+    parser.add_argument("filepath", help="The Data Catalog in Turtle format.")
+    parser.add_argument("--checks", help=f"Comma-separated checks to run ({', '.join(CHECKS)}).")
+    parser.add_argument("--property-set", choices=["dcat", "dct"], default="dcat")
+    parser.add_argument("--entity-types", help=f"Comma-separated entity types for consistency ({', '.join(ENTITY_TYPES)}).")
+    parser.add_argument("--other", help="A second Data Catalog for the compatibility and similarity checks.")
+    parser.add_argument("--link-cache", help="An SQLite file caching link check results between runs.")
+    parser.add_argument("--graph-cache", help="A directory caching parsed catalogs by content hash.")
+    parser.add_argument("--result-cache", help="An SQLite file caching check results by catalog content hash.")
+    parser.add_argument("--metrics-json", help="Write the time, memory and counters of each check to this JSON file.")
+    parser.add_argument("--metrics-prometheus", help="Write the same metrics to this file in the Prometheus text format.")
+    parser.add_argument("--metrics-memory", action="store_true", help="Also trace the peak memory of each check, which is slower.")
+    args = parser.parse_args()
+
+    checks = args.checks.split(",") if args.checks else None
+    entity_types = args.entity_types.split(",") if args.entity_types else None
+
+    if args.graph_cache:
+        configure_graph_cache(args.graph_cache)
+    if args.result_cache:
+        configure_result_cache(args.result_cache)
+    if args.metrics_json or args.metrics_prometheus or args.metrics_memory:
+        instrumentation.enable(memory=args.metrics_memory)
+
+    try:
+        with open(args.filepath, "r", encoding="utf-8") as f:
+            rdf_data = f.read()
+        other = None
+        if args.other:
+            with open(args.other, "r", encoding="utf-8") as f:
+                other = f.read()
+
+        if args.link_cache:
+            from link_cache import LinkCache
+            from link_checker import LinkChecker
+            with LinkCache(args.link_cache) as cache, LinkChecker(cache=cache) as checker:
+                report = run_checks(rdf_data, checks, args.property_set, entity_types, other, checker)
+        else:
+            report = run_checks(rdf_data, checks, args.property_set, entity_types, other)
+        report = {"catalog": args.filepath, **report}
+        print(json.dumps(report, indent=2, default=str))
+        if args.metrics_json:
+            instrumentation.to_json(args.metrics_json)
+        if args.metrics_prometheus:
+            instrumentation.to_prometheus(args.metrics_prometheus)
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
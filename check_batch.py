@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import io
+import os
+import sys
+import glob
+import json
+import time
+import signal
+import argparse
+import contextlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from check_all import CHECKS, run_checks
+from catalog_loader import configure_graph_cache
+from result_cache import configure_result_cache
+
+# Catalogs handled by a worker process before it is replaced, so that rdflib memory growth stays bounded
+MAX_TASKS_PER_CHILD = 50
+
+# Seconds allowed to score a single catalog
+TIMEOUT = 600
+
+# Seconds the parent waits past a catalog's timeout before it kills a worker that did not stop by itself
+GRACE = 5
+
+# Link checker shared by the catalogs scored in a worker process
+_link_checker = None
+
+
+class CatalogTimeout(BaseException):
+    """
+    Raised in a worker when its catalog runs out of time. It is not an Exception, so that the
+    per-check error handling of run_checks lets it through and the catalog stops at once.
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise CatalogTimeout()
+
+
+def _init_worker(graph_cache, link_cache, result_cache=None):
+    """
+    Configures the caches of a worker process.
+    """
+    global _link_checker
+    if graph_cache:
+        configure_graph_cache(graph_cache)
+    if result_cache:
+        configure_result_cache(result_cache)
+    if link_cache:
+        from link_cache import LinkCache
+        from link_checker import LinkChecker
+        _link_checker = LinkChecker(cache=LinkCache(link_cache))
+
+
+def score_catalog(path, checks=None, property_set="dcat", timeout=TIMEOUT):
+    """
+    Runs the quality checks against one catalog file; called inside a worker process.
+
+    Args:
+        path (str): The path to the Data Catalog file.
+        checks (list): The names of the checks to run. Defaults to every single-catalog check.
+        property_set (str): The property set to use ('dcat' or 'dct').
+        timeout (float): Seconds allowed before the catalog is abandoned, or None for no limit.
+
+    Returns:
+        dict: The report of run_checks with the catalog path and elapsed seconds, or an error.
+    """
+    start_time = time.perf_counter()
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rdf_data = f.read()
+        # The checks print their intermediate results; keep them out of the JSON Lines output
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = run_checks(rdf_data, checks, property_set, link_checker=_link_checker)
+        result = {"catalog": path, **report}
+    except CatalogTimeout:
+        result = {"catalog": path, "error": f"Timed out after {timeout}s"}
+    except Exception as e:
+        result = {"catalog": path, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result["seconds"] = time.perf_counter() - start_time
+    return result
+
+
+def _terminate_workers(executor):
+    """
+    Terminates the worker processes of a pool, which shutdown() alone leaves running until their task ends.
+    """
+    # The executor has no public handle on its processes. _processes has held the multiprocessing.Process
+    # of every live worker since Python 3.2, and unlike PIDs collected by the workers themselves these
+    # handles cannot point to an unrelated process that reused the PID of a worker that already exited.
+    # Without it, a stuck worker is left to finish its task and the final shutdown waits for it.
+    processes = getattr(executor, "_processes", None) or {}
+    for process in list(processes.values()):
+        process.terminate()
+
+
+def find_catalogs(patterns):
+    """
+    Expands directories and glob patterns into catalog paths, lazily.
+
+    Args:
+        patterns (list): Directories (scanned recursively for .ttl files), glob patterns or paths.
+
+    Yields:
+        str: The path of every matching catalog file.
+    """
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*.ttl")
+        for path in glob.iglob(pattern, recursive=True):
+            if os.path.isfile(path):
+                yield path
+
+
+def score_batch(paths, workers=None, checks=None, property_set="dcat", timeout=TIMEOUT,
+                max_tasks_per_child=MAX_TASKS_PER_CHILD, graph_cache=None, link_cache=None, result_cache=None):
+    """
+    Scores many catalogs in a process pool and yields each report as soon as its catalog finishes.
+
+    A catalog that raises or times out is reported with an error. When a worker process dies, the pool
+    is restarted and the catalogs it was scoring are retried one at a time, so that only the catalog
+    that actually crashes is reported as failed. A worker still busy GRACE seconds past its catalog's
+    timeout is killed with its pool, and the other catalogs it was scoring are submitted again.
+
+    Args:
+        paths (iterable): The catalog files to score.
+        workers (int): The number of worker processes. Defaults to the number of cores.
+        checks (list): The names of the checks to run. Defaults to every single-catalog check.
+        property_set (str): The property set to use ('dcat' or 'dct').
+        timeout (float): Seconds allowed per catalog, or None for no limit.
+        max_tasks_per_child (int): Catalogs scored by a worker process before it is replaced.
+        graph_cache (str): An optional directory caching parsed catalogs.
+        link_cache (str): An optional SQLite file caching link check results.
+        result_cache (str): An optional SQLite file caching check results by catalog content hash.
+
+    Yields:
+        dict: One report per catalog, in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    pool_options = {"max_workers": workers, "initializer": _init_worker, "initargs": (graph_cache, link_cache, result_cache)}
+    if sys.version_info >= (3, 11):
+        pool_options["max_tasks_per_child"] = max_tasks_per_child
+
+    paths = iter(paths)
+    retries = deque()
+    requeued = deque()
+    in_flight = {}
+    started = {}
+    executor = ProcessPoolExecutor(**pool_options)
+    exhausted = False
+    # With a timeout, no more catalogs are submitted than there are workers, so that a running future
+    # is really being scored and the parent can hold it to a wall-clock deadline
+    max_in_flight = workers if timeout else workers * 2
+    try:
+        while True:
+            # Catalogs caught in a crash are retried alone, so a second crash identifies the culprit
+            if retries and not in_flight:
+                path = retries.popleft()
+                in_flight[executor.submit(score_catalog, path, checks, property_set, timeout)] = (path, True)
+            while not retries and len(in_flight) < max_in_flight:
+                if requeued:
+                    path = requeued.popleft()
+                elif exhausted or (path := next(paths, None)) is None:
+                    exhausted = True
+                    break
+                in_flight[executor.submit(score_catalog, path, checks, property_set, timeout)] = (path, False)
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, timeout=min(timeout, 1) if timeout else None, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in in_flight:
+                if future not in started and future.running():
+                    started[future] = now
+            # A worker stuck where the alarm cannot interrupt it, e.g. in C code, is killed with its pool
+            overdue = [future for future in in_flight if future not in done and future in started
+                       and now - started[future] > timeout + GRACE]
+            if overdue:
+                for future in overdue:
+                    path, _ = in_flight.pop(future)
+                    yield {"catalog": path, "error": f"Timed out after {timeout}s", "seconds": now - started[future]}
+                for future, (path, isolated) in in_flight.items():
+                    if future not in done:
+                        (retries if isolated else requeued).append(path)
+                in_flight = {future: entry for future, entry in in_flight.items() if future in done}
+                _terminate_workers(executor)
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(**pool_options)
+            broken = False
+            for future in done:
+                started.pop(future, None)
+                if future not in in_flight:
+                    continue
+                path, isolated = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    if isolated:
+                        yield {"catalog": path, "error": "The worker process crashed."}
+                    else:
+                        retries.append(path)
+                except Exception as e:
+                    yield {"catalog": path, "error": f"{type(e).__name__}: {e}"}
+            if broken:
+                # Every other catalog in the broken pool fails too; retry them in a fresh pool
+                for future, (path, isolated) in in_flight.items():
+                    retries.append(path)
+                in_flight.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(**pool_options)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+"""
+This program scores every catalog of a directory or glob in a process pool, writing one JSON report per line as each catalog finishes.
+
+Usage: python check_batch.py "Official catalogs/*.ttl" [--workers N] [--checks completeness,licensing] [--timeout seconds]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Scores many Data Catalogs in parallel as JSON Lines.")
+    parser.add_argument("patterns", nargs="+", help="Directories, glob patterns or catalog files.")
+    parser.add_argument("--workers", type=int, help="Worker processes (defaults to the number of cores).")
+    parser.add_argument("--checks", help=f"Comma-separated checks to run ({', '.join(CHECKS)}).")
+    parser.add_argument("--property-set", choices=["dcat", "dct"], default="dcat")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Seconds allowed per catalog.")
+    parser.add_argument("--max-tasks-per-child", type=int, default=MAX_TASKS_PER_CHILD,
+                        help="Catalogs scored by a worker process before it is replaced.")
+    parser.add_argument("--graph-cache", help="A directory caching parsed catalogs by content hash.")
+    parser.add_argument("--link-cache", help="An SQLite file caching link check results between runs.")
+    parser.add_argument("--result-cache", help="An SQLite file caching check results by catalog content hash.")
+    parser.add_argument("--output", help="Write the JSON Lines to this file instead of stdout.")
+    args = parser.parse_args()
+
+    checks = args.checks.split(",") if args.checks else None
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        results = score_batch(find_catalogs(args.patterns), args.workers, checks, args.property_set,
+                              args.timeout, args.max_tasks_per_child, args.graph_cache, args.link_cache, args.result_cache)
+        for result in results:
+            output.write(json.dumps(result, default=str) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,25 +5,30 @@
 @author: Jorge Martinez-Gil
 """
 import sys
-from rdflib import Graph
+from catalog_loader import load_graph
+from instrumentation import instrumented
 
-def check_compatibility(rdf_data, rdf_data2):
+@instrumented("compatibility")
+def check_compatibility(rdf_data, rdf_data2, memory_budget=None):
     """
     Checks the compatibility of two Data Catalogs by calculating the percentage of triples they have in common.
 
     Args:
-        rdf_data (str): The first RDF data to check for compatibility.
-        rdf_data2 (str): The second RDF data to check for compatibility.
+        rdf_data (str or rdflib.Graph): The first RDF data to check for compatibility.
+        rdf_data2 (str or rdflib.Graph): The second RDF data to check for compatibility.
+        memory_budget (int): If given, the triples are intersected out of core as fingerprints, using
+            at most this many bytes for them (see triple_overlap).
 
     Returns:
         float: The percentage of triples the two Data Catalogs have in common.
     """
-    graph1 = Graph()
-    graph1.parse(data=rdf_data, format="turtle")
-    
-    graph2 = Graph()
-    graph2.parse(data=rdf_data2, format="turtle")
-    
+    if memory_budget is not None:
+        from triple_overlap import compatibility
+        return compatibility(rdf_data, rdf_data2, memory_budget=memory_budget)
+
+    graph1 = load_graph(rdf_data)
+    graph2 = load_graph(rdf_data2)
+
     # Calculate intersection of triples in both graphs
     triples1 = set(graph1)
     triples2 = set(graph2)
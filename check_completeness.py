@@ -1,5 +1,7 @@
 import sys
-from rdflib import Graph, RDF, Namespace
+from rdflib import Namespace
+from instrumentation import instrumented
+from result_cache import memoized
 
 # Define some RDF prefixes
 dcat = Namespace("http://www.w3.org/ns/dcat#")
@@ -31,19 +33,15 @@ def calculate_completeness(graph, subject, required_properties):
             present_properties.add(predicate)
     return len(present_properties) / len(required_properties) * 100
 
-def check_completeness(rdf_data: str, property_set: str) -> float:
+@memoized
+@instrumented("completeness")
+def check_completeness(rdf_data, property_set: str) -> float:
     """
-    Checks the completeness of RDF data.
+    Checks the completeness of RDF data, given as a Turtle string or an already-parsed Graph.
     """
-    required_properties = dct_properties if property_set == 'dct' else dcat_properties
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
-    completeness_scores = []
-    for subject_type in [dcat.Catalog, dcat.Dataset, dcat.Distribution]:
-        for subject in graph.subjects(RDF.type, subject_type):
-            score = calculate_completeness(graph, subject, required_properties)
-            completeness_scores.append(score)
-    return sum(completeness_scores) / len(completeness_scores) if completeness_scores else 0
+    from completeness_engine import PresenceMatrix, PROFILES
+    profile = PROFILES['dct' if property_set == 'dct' else 'dcat']
+    return PresenceMatrix(rdf_data).evaluate(profile)["completeness"]
 
 def main():
     try:
@@ -5,84 +5,137 @@
 @author: Jorge Martinez-Gil
 """
 import sys
-from rdflib import Graph, Namespace, RDF
+from rdflib import Namespace, RDF, URIRef
+from catalog_loader import load_graph
+from instrumentation import instrumented
+from result_cache import memoized
 
-def check_consistency(rdf_data: str, entity_type: str) -> float:
+DCAT_NS = Namespace("http://www.w3.org/ns/dcat#")
+
+# Entity types evaluated by default, by name
+ENTITY_CLASSES = {
+    "catalog": DCAT_NS.Catalog,
+    "dataset": DCAT_NS.Dataset,
+    "distribution": DCAT_NS.Distribution,
+}
+
+
+def _rate(inconsistent, pairs):
+    return {"pairs": pairs, "inconsistent": inconsistent, "percentage": inconsistent / pairs * 100 if pairs else 0}
+
+
+@instrumented("consistency")
+def consistency_report(rdf_data, entity_types=None, classes=None):
+    """
+    Checks the attribute values of several entity types in one pass over the graph.
+
+    A (subject, predicate) pair is inconsistent when it has more than one distinct value. The rate of an
+    entity type is the share of inconsistent pairs among the pairs of all entities of that type.
+
+    Args:
+        rdf_data: A string containing RDF data in Turtle format, or an already-parsed Graph.
+        entity_types: The names of the entity types to report, among ENTITY_CLASSES and classes. Defaults to all of them.
+        classes: Additional entity types to report, as a dict from name to class URI.
+
+    Returns:
+        A dict with, per entity type, its number of pairs, of inconsistent pairs, their percentage, and the same
+        figures per predicate.
+    """
+    graph = load_graph(rdf_data)
+
+    known = {**ENTITY_CLASSES, **(classes or {})}
+    names = entity_types or list(known)
+    invalid = [name for name in names if name not in known]
+    if invalid:
+        raise ValueError(f"Invalid entity type: {', '.join(invalid)}")
+    names_by_class = {}
+    for name in names:
+        names_by_class.setdefault(known[name], []).append(name)
+
+    # The first value of every (subject, predicate) pair, and the distinct values of pairs with more than one
+    first_values = {}
+    multiple_values = {}
+    entity_types_of = {}
+    for subj, pred, obj in graph.triples((None, None, None)):
+        key = (subj, pred)
+        first = first_values.setdefault(key, obj)
+        if first != obj:
+            multiple_values.setdefault(key, {first}).add(obj)
+        if pred == RDF.type and obj in names_by_class:
+            entity_types_of.setdefault(subj, set()).update(names_by_class[obj])
+
+    predicates = {name: {} for name in names}
+    for (subj, pred) in first_values:
+        types = entity_types_of.get(subj)
+        if not types:
+            continue
+        inconsistent = (subj, pred) in multiple_values
+        for name in types:
+            counts = predicates[name].setdefault(pred, [0, 0])
+            counts[0] += 1
+            counts[1] += inconsistent
+
+    report = {}
+    for name in names:
+        pairs = sum(counts[0] for counts in predicates[name].values())
+        inconsistent = sum(counts[1] for counts in predicates[name].values())
+        report[name] = _rate(inconsistent, pairs)
+        report[name]["predicates"] = {str(pred): _rate(counts[1], counts[0]) for pred, counts in predicates[name].items()}
+    return report
+
+
+@memoized
+def check_consistency(rdf_data, entity_type: str) -> float:
     """
     Checks if there are inconsistencies in the attribute values for a specific entity type.
 
     Args:
-        rdf_data: A string containing RDF data in Turtle format.
+        rdf_data: A string containing RDF data in Turtle format, or an already-parsed Graph.
         entity_type: The type of entity to compare (e.g. "catalog", "dataset", "distribution").
 
     Returns:
         A float representing the percentage of (subject, predicate) pairs that have inconsistent attribute values for the specified entity type.
     """
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
-
-    contradictions = set()
-
-    # Define namespaces for RDF and DCAT
-    RDF_NS = Namespace("http://www.w3.org/1999/02/22-rdf-syntax-ns#")
-    DCAT_NS = Namespace("http://www.w3.org/ns/dcat#")
-
-    # Query the RDF graph for entities of the specified type
-    if entity_type == "catalog":
-        entities = graph.subjects(RDF.type, DCAT_NS.Catalog)
-    elif entity_type == "dataset":
-        entities = graph.subjects(RDF.type, DCAT_NS.Dataset)
-    elif entity_type == "distribution":
-        entities = graph.subjects(RDF.type, DCAT_NS.Distribution)
-    else:
-        raise ValueError(f"Invalid entity type: {entity_type}")
-
-    # Iterate through the entities and check for inconsistencies in their attribute values
-    for entity in entities:
-        subjects_predicates = {}  # Dictionary to store (subject, predicate) pairs and their corresponding objects
-
-        # Iterate through the triples in the RDF graph for the entity and store (subject, predicate) pairs and their objects
-        for subj, pred, obj in graph.triples((entity, None, None)):
-            if (subj, pred) in subjects_predicates:
-                objects = subjects_predicates[(subj, pred)]
-                if obj not in objects:
-                    contradictions.add((subj, pred))
-                objects.append(obj)
-            else:
-                subjects_predicates[(subj, pred)] = [obj]
-
-    # Calculate the percentage of inconsistencies
-    total_pairs = len(subjects_predicates)
-    inconsistent_pairs = len(contradictions)
-    percentage = (inconsistent_pairs / total_pairs) * 100
-
-    return percentage
+    return consistency_report(rdf_data, [entity_type])[entity_type]["percentage"]
 
 """
 This program checks the consistency of a Data Catalog for a specific entity type.
 
 Usage:
-    python check_consistency.py cataglog.ttl entity_type
+    python check_consistency.py cataglog.ttl entity_type|all [name=classURI ...]
 
-The function `check_consistency` takes an RDF data string and an entity type as input and returns a set of (subject, predicate) pairs that have inconsistent attribute values for the specified entity type.
+The function `check_consistency` takes an RDF data string and an entity type as input and returns the percentage of (subject, predicate) pairs that have inconsistent attribute values for the specified entity type.
+With 'all', every entity type, including the classes given as name=classURI, is reported in one pass with a breakdown per predicate.
 """
 
 def main():
     try:
         # Get path to Data Catalog and entity type from command line arguments
         if len(sys.argv) < 3:
-            print("Usage: python check_consistency.py filepath entity_type")
+            print("Usage: python check_consistency.py filepath entity_type|all [name=classURI ...]")
             sys.exit(1)
 
         rdf_data_path = sys.argv[1]
         entity_type = sys.argv[2]
+        classes = dict(argument.split("=", 1) for argument in sys.argv[3:])
+        classes = {name: URIRef(uri) for name, uri in classes.items()}
 
         # Load RDF data from file
         with open(rdf_data_path, "r", encoding="utf-8") as f:
             rdf_data = f.read()
 
-        result = check_consistency(rdf_data, entity_type)
-        print(f"The percentage of inconsistencies in {rdf_data_path} for {entity_type} is {result:.2f}%.")
+        if entity_type != "all":
+            result = check_consistency(rdf_data, entity_type)
+            print(f"The percentage of inconsistencies in {rdf_data_path} for {entity_type} is {result:.2f}%.")
+            return
+
+        report = consistency_report(rdf_data, classes=classes)
+        for name, rate in report.items():
+            print(f"The percentage of inconsistencies in {rdf_data_path} for {name} is {rate['percentage']:.2f}% "
+                  f"({rate['inconsistent']} of {rate['pairs']} pairs).")
+            for predicate, predicate_rate in sorted(report[name]["predicates"].items(), key=lambda item: -item[1]["inconsistent"]):
+                if predicate_rate["inconsistent"]:
+                    print(f"    {predicate}: {predicate_rate['percentage']:.2f}% ({predicate_rate['inconsistent']} of {predicate_rate['pairs']})")
 
     except FileNotFoundError:
         print(f"File not found: {rdf_data_path}")
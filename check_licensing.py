@@ -5,7 +5,10 @@
 @author: Jorge Martinez-Gil
 """
 import sys
-from rdflib import Graph, RDF, Namespace
+from rdflib import RDF, Namespace
+from catalog_loader import load_graph
+from instrumentation import instrumented
+from result_cache import memoized
 
 # Define the RDF namespaces
 dcat = Namespace("http://www.w3.org/ns/dcat#")
@@ -17,18 +20,19 @@ dcterms = Namespace("http://purl.org/dc/terms/")
 prov = Namespace("http://www.w3.org/ns/prov#")
 
 
+@memoized
+@instrumented("licensing")
 def check_licensing(rdf_data):
     """
     Check the licensing of an RDF data string and return the percentage of datasets that have a license.
 
     Args:
-        rdf_data (str): The RDF data string to check.
+        rdf_data (str or rdflib.Graph): The RDF data string to check, or an already-parsed graph.
 
     Returns:
         float: The percentage of datasets that have a license, between 0 and 100.
     """
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
+    graph = load_graph(rdf_data)
     
     # Count licensed items and total items in all datasets
     licensed_items = 0
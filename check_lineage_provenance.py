@@ -6,7 +6,10 @@
 """
 
 import sys
-from rdflib import Graph, RDF, RDFS, Namespace
+from rdflib import Namespace
+from instrumentation import instrumented
+from result_cache import memoized
+from provenance_engine import ProvenanceIndex
 
 # Define the RDF namespaces
 dcat = Namespace("http://www.w3.org/ns/dcat#")
@@ -17,53 +20,30 @@ xsd = Namespace("http://www.w3.org/2001/XMLSchema#")
 dcterms = Namespace("http://purl.org/dc/terms/")
 prov = Namespace("http://www.w3.org/ns/prov#")
 
+@memoized
+@instrumented("lineage_provenance")
 def check_lineage_provenance(rdf_data):
     """
     Calculates the lineage and provenance score for an RDF graph.
 
     Parameters:
-    rdf_data (str): The RDF data in Turtle format.
+    rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+
+    Returns:
+    float: The lineage and provenance score as a percentage.
+    """
+    # The indicators are read from the adjacency indexes of the provenance engine, built in one pass per relation
+    return lineage_provenance_score(*ProvenanceIndex(rdf_data).indicators())
+
+
+def lineage_provenance_score(has_lineage_info, has_ancestors, has_descendants,
+                             has_provenance_info, has_data_sources, has_data_processing_steps):
+    """
+    Combines the lineage and provenance indicators found in a catalog into its score.
 
     Returns:
     float: The lineage and provenance score as a percentage.
     """
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
-    
-    # Check for lineage information
-    has_lineage_info = False
-    for s, p, o in graph.triples((None, None, None)):
-        if p == RDFS.subClassOf or p == RDFS.subPropertyOf:
-            has_lineage_info = True
-            break
-    
-    # Check for ancestors and descendants
-    has_ancestors = False
-    has_descendants = False
-    for s, p, o in graph.triples((None, RDFS.subClassOf, None)):
-        has_ancestors = True
-        break
-    for s, p, o in graph.triples((None, RDFS.subClassOf, None)):
-        has_descendants = True
-        break
-    
-    # Check for provenance information
-    has_provenance_info = False
-    for s, p, o in graph.triples((None, RDF.type, prov.Entity)):
-        has_provenance_info = True
-        break
-    
-    # Check for data sources and data processing steps
-    has_data_sources = False
-    has_data_processing_steps = False
-    for s, p, o in graph.triples((None, RDF.type, prov.Activity)):
-        for s2, p2, o2 in graph.triples((s, prov.used, None)):
-            has_data_sources = True
-            break
-        for s2, p2, o2 in graph.triples((s, prov.wasAssociatedWith, None)):
-            has_data_processing_steps = True
-            break
-    
     # Calculate lineage and provenance scores
     lineage_score = 0
     if has_lineage_info:
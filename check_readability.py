@@ -6,8 +6,10 @@
 """
 
 import sys
-from rdflib import Graph, RDF, Namespace
-import textstat
+from rdflib import RDF, Namespace
+from catalog_loader import load_graph
+from instrumentation import instrumented
+from result_cache import memoized
 
 # Define the RDF namespaces
 dcat = Namespace("http://www.w3.org/ns/dcat#")
@@ -18,39 +20,70 @@ xsd = Namespace("http://www.w3.org/2001/XMLSchema#")
 dcterms = Namespace("http://purl.org/dc/terms/")
 prov = Namespace("http://www.w3.org/ns/prov#")
 
-def check_readability(rdf_data):
+def dataset_texts(graph):
     """
-    Calculates the readability score for each dataset in the RDF data.
-    
-    Parameters:
-        rdf_data (str): RDF data in turtle format
-        
+    Collects the title and description of each dataset.
+
     Returns:
-        float: the average readability score for all datasets in the RDF data, or 0 if there are no datasets
+        list: (dataset, literal) pairs, in the order the graph yields the datasets.
     """
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
-    
-    # Calculate readability score for each dataset
-    readability_scores = []
+    texts = []
     for subject in graph.subjects(RDF.type, dcat.Dataset):
         title = graph.value(subject, dcat.title)
         description = graph.value(subject, dcterms.description)
         if title:
-            # Calculate readability score for title
-            title_score = textstat.flesch_kincaid_grade(title)
-            readability_scores.append(title_score)
+            texts.append((subject, title))
         if description:
-            # Calculate readability score for description
-            description_score = textstat.flesch_kincaid_grade(description)
-            readability_scores.append(description_score)
-            
-    if len(readability_scores) > 0:
-        average = sum(readability_scores) / len(readability_scores)
-    else:
-        average = 0
+            texts.append((subject, description))
+    return texts
+
+
+def readability_report(rdf_data, formulas=("flesch_kincaid_grade",), workers=None):
+    """
+    Scores the titles and descriptions of every dataset in one batch with the readability engine, from
+    the features text_analysis memoizes per text.
+
+    Parameters:
+        rdf_data (str or rdflib.Graph): RDF data in turtle format, or an already-parsed graph
+        formulas (tuple): The readability formulas to compute, among readability_engine.FORMULAS
+        workers (int): The number of processes for catalogs with very many texts
+
+    Returns:
+        dict: the average of each formula over all texts, as check_readability computes it for the
+            Flesch-Kincaid grade, and the average of each formula over the texts of each dataset
+    """
+    graph = load_graph(rdf_data)
+    texts = dataset_texts(graph)
+    from readability_engine import grades
+    from text_analysis import readability_features
+    features = readability_features([text for _, text in texts], workers)
+    scores = {formula: grades(features, formula) for formula in formulas}
+
+    report = {"average": {}, "datasets": {}}
+    for formula, grades in scores.items():
+        grades = grades.tolist()
+        report["average"][formula] = sum(grades) / len(grades) if grades else 0
+        totals = {}
+        for (subject, _), grade in zip(texts, grades):
+            totals.setdefault(subject, []).append(grade)
+        for subject, dataset_grades in totals.items():
+            report["datasets"].setdefault(str(subject), {})[formula] = sum(dataset_grades) / len(dataset_grades)
+    return report
+
+
+@memoized
+@instrumented("readability")
+def check_readability(rdf_data):
+    """
+    Calculates the readability score for each dataset in the RDF data.
+    
+    Parameters:
+        rdf_data (str or rdflib.Graph): RDF data in turtle format, or an already-parsed graph
         
-    return average
+    Returns:
+        float: the average readability score for all datasets in the RDF data, or 0 if there are no datasets
+    """
+    return readability_report(rdf_data)["average"]["flesch_kincaid_grade"]
 
 """
 Main function that loads Data Catalog from a file and calculates the readability score for the data.
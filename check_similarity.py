@@ -5,15 +5,16 @@
 @author: Jorge Martinez-Gil
 """
 
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from rdflib import Graph, Namespace
+from rdflib import Namespace
 import sys
+from catalog_loader import is_graph, load_catalog_file
+from instrumentation import instrumented
+from text_analysis import token_set, token_sets
+from graph_digest import canonical_digest, cached_file_digest, file_digest
 
-# Download required NLTK resources
-nltk.download('punkt')
-nltk.download('stopwords')
+# NLTK, NumPy and SciPy are imported on first use, and the NLTK resources are provisioned
+# once with download_resources.py instead of at import time; tokenization is shared with
+# the other checks through text_analysis
 
 
 def preprocess_text(text):
@@ -26,18 +27,7 @@ def preprocess_text(text):
     Returns:
         set: A set of preprocessed words.
     """
-    # Tokenize the sentences and convert to lowercase
-    sentences = sent_tokenize(text.lower())
-
-    # Tokenize words in each sentence and remove stopwords
-    stop_words = set(stopwords.words('english'))
-    tokens = []
-    for sentence in sentences:
-        words = word_tokenize(sentence)
-        words = [word for word in words if word not in stop_words]
-        tokens.extend(words)
-    
-    return set(tokens)
+    return set(token_set(str(text)))
 
 
 def jaccard_similarity(set1, set2):
@@ -58,7 +48,7 @@ def jaccard_similarity(set1, set2):
 
 def are_graphs_identical(g1, g2):
     """
-    Checks if two RDF graphs are identical.
+    Checks if two RDF graphs are identical, up to the labels of their blank nodes.
 
     Args:
         g1 (rdflib.Graph): The first RDF graph.
@@ -67,29 +57,48 @@ def are_graphs_identical(g1, g2):
     Returns:
         bool: True if the graphs are identical, False otherwise.
     """
-    return len(g1) == len(g2) and all(t in g2 for t in g1) and all(t in g1 for t in g2)
+    # Graphs of different sizes cannot be isomorphic, which spares most digests
+    return g1 is g2 or (len(g1) == len(g2) and canonical_digest(g1) == canonical_digest(g2))
+
+
+def _as_graph(catalog):
+    """
+    Returns the catalog as an RDF graph, parsing it from a Turtle file path if needed.
+    """
+    if is_graph(catalog):
+        return catalog
+    return load_catalog_file(catalog)
 
 
+@instrumented("similarity")
 def check_similarity(catalog1_file, catalog2_file):
     """
     Calculates the similarity between two DCAT catalogs in Turtle format.
 
     Args:
-        catalog1_file (str): The path to the first catalog file.
-        catalog2_file (str): The path to the second catalog file.
+        catalog1_file (str or rdflib.Graph): The path to the first catalog file, or an already-parsed graph.
+        catalog2_file (str or rdflib.Graph): The path to the second catalog file, or an already-parsed graph.
 
     Returns:
         float: The similarity between the two catalogs as a percentage.
     """
+    # Catalog files whose stored digests match are identical without parsing either of them
+    files = not is_graph(catalog1_file) and not is_graph(catalog2_file)
+    if files:
+        digest1 = cached_file_digest(catalog1_file)
+        if digest1 is not None and digest1 == cached_file_digest(catalog2_file):
+            return 100.0
+
     # Parse Turtle files into RDF graph
-    g1 = Graph()
-    g1.parse(catalog1_file, format='ttl')
-    
-    g2 = Graph()
-    g2.parse(catalog2_file, format='ttl')
+    g1 = _as_graph(catalog1_file)
+    g2 = _as_graph(catalog2_file)
     
-    # Check if the graphs are identical
-    if are_graphs_identical(g1, g2):
+    # Check if the graphs are identical, storing the digests of catalog files for the next comparison
+    if files and len(g1) == len(g2):
+        identical = file_digest(catalog1_file, graph=g1) == file_digest(catalog2_file, graph=g2)
+    else:
+        identical = are_graphs_identical(g1, g2)
+    if identical:
         return 100.0
     
     # Define DCAT namespace
@@ -102,22 +111,17 @@ def check_similarity(catalog1_file, catalog2_file):
     descriptions1 = [str(desc) for desc in g1.objects(predicate=dcat.description)]
     descriptions2 = [str(desc) for desc in g2.objects(predicate=dcat.description)]
     
-    # Preprocess titles and descriptions
-    titles1 = [preprocess_text(title) for title in titles1]
-    titles2 = [preprocess_text(title) for title in titles2]
-    descriptions1 = [preprocess_text(desc) for desc in descriptions1]
-    descriptions2 = [preprocess_text(desc) for desc in descriptions2]
+    # Preprocess titles and descriptions, tokenizing each distinct text once
+    titles1 = token_sets(titles1)
+    titles2 = token_sets(titles2)
+    descriptions1 = token_sets(descriptions1)
+    descriptions2 = token_sets(descriptions2)
     
-    # Calculate Jaccard similarity for titles and descriptions
-    if titles1 and titles2:
-        title_similarity = sum(jaccard_similarity(title1, title2) for title1 in titles1 for title2 in titles2) / (len(titles1) * len(titles2))
-    else:
-        title_similarity = 0.0
+    from similarity_matrix import mean_jaccard_similarity
 
-    if descriptions1 and descriptions2:
-        description_similarity = sum(jaccard_similarity(desc1, desc2) for desc1 in descriptions1 for desc2 in descriptions2) / (len(descriptions1) * len(descriptions2))
-    else:
-        description_similarity = 0.0
+    # Calculate the mean pairwise Jaccard similarity for titles and descriptions
+    title_similarity = mean_jaccard_similarity(titles1, titles2)
+    description_similarity = mean_jaccard_similarity(descriptions1, descriptions2)
     
     # Overall similarity as the average of title and description similarity
     overall_similarity = (title_similarity + description_similarity) / 2
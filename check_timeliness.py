@@ -5,9 +5,10 @@
 @author: Jorge Martinez-Gil
 """
 import sys
-from datetime import datetime, timedelta
-from rdflib import Graph, RDF, Namespace
-import pytz
+from datetime import datetime, timedelta, timezone
+from rdflib import RDF, Namespace
+from catalog_loader import load_graph
+from instrumentation import instrumented
 
 # Define some RDF prefixes
 dcat = Namespace("http://www.w3.org/ns/dcat#")
@@ -15,18 +16,18 @@ foaf = Namespace("http://xmlns.com/foaf/0.1/")
 rdf = Namespace("http://www.w3.org/1999/02/22-rdf-syntax-ns#")
 dcterms = Namespace("http://purl.org/dc/terms/")
 
+@instrumented("timeliness")
 def check_timeliness(rdf_data):
     """
     Checks the timeliness of an RDF data file containing a DCAT catalog.
 
     Args:
-        rdf_data (str): The RDF data as a string.
+        rdf_data (str or rdflib.Graph): The RDF data as a string, or an already-parsed graph.
 
     Returns:
         bool: True if the catalog is timely, False otherwise.
     """
-    graph = Graph()
-    graph.parse(data=rdf_data, format="turtle")
+    graph = load_graph(rdf_data)
     
     # Get the modified date of the catalog
     modified_date = None
@@ -36,12 +37,25 @@ def check_timeliness(rdf_data):
             break
         break
     
-    # Check if the modified date is within the last year
+    return is_timely(modified_date)
+
+
+def is_timely(modified_date):
+    """
+    Checks if a modified date lies within the last year.
+
+    Args:
+        modified_date (rdflib.Literal or str): The modified date, or None if the catalog has none.
+
+    Returns:
+        bool: True if the date is within the last year, False otherwise.
+    """
     if modified_date:
-        modified_date_str = str(modified_date)
-        modified_date = datetime.strptime(modified_date_str, '%Y-%m-%dT%H:%M:%S%z')
-        one_year_ago = datetime.now(pytz.UTC) - timedelta(days=365)
-        if modified_date > one_year_ago:
+        # xsd:date values and fractional seconds are accepted too; dates that cannot be parsed are not timely
+        from timeliness_engine import parse_timestamp
+        timestamp = parse_timestamp(str(modified_date))
+        one_year_ago = datetime.now(timezone.utc) - timedelta(days=365)
+        if timestamp is not None and timestamp > one_year_ago.timestamp():
             return True
     
     return False
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+from array import array
+import numpy as np
+from rdflib import RDF
+from rdflib.exceptions import UniquenessError
+
+# Term identifiers are stored as unsigned 32-bit integers, as in the graph cache
+ID_DTYPE = np.uint32
+
+
+def _narrow(column, value, start, stop):
+    # The range of rows [start, stop) of a sorted column that hold value
+    window = column[start:stop]
+    return start + int(np.searchsorted(window, value, side="left")), start + int(np.searchsorted(window, value, side="right"))
+
+
+def _offsets(column, size):
+    # The first row of every identifier in a sorted column, and the number of rows at the end
+    return np.searchsorted(column, np.arange(size + 1, dtype=np.int64)).astype(np.int64)
+
+
+class TripleView:
+    """
+    A read-only run of triples of a CompactGraph, decoded into RDF terms only when iterated.
+
+    Args:
+        graph (CompactGraph): The graph the rows belong to.
+        rows (numpy.ndarray): The (subject, predicate, object) identifiers of the triples.
+    """
+
+    __slots__ = ("graph", "rows")
+
+    def __init__(self, graph, rows):
+        self.graph = graph
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        terms = self.graph.terms
+        for s, p, o in self.rows.tolist():
+            yield terms[s], terms[p], terms[o]
+
+    def column(self, position):
+        """
+        Returns the terms of one position of the triples (0 subject, 1 predicate, 2 object), in order.
+        """
+        terms = self.graph.terms
+        return [terms[term_id] for term_id in self.rows[:, position].tolist()]
+
+
+class CompactGraph:
+    """
+    A read-only, integer-encoded catalog for the checks, which only read their graphs.
+
+    Terms are interned once in a table; the triples are two arrays of 32-bit identifiers, one sorted by
+    (subject, predicate) and one by (predicate, object), so that each lookup is a binary search for a
+    contiguous range. Within a range the triples keep the order of the source graph, so that the objects
+    of a subject and value() come out as rdflib returns them. It answers the access patterns of the checks
+    (triples, subjects, objects, predicates, subject_objects, predicate_objects and value) with the same
+    results as rdflib.Graph, and load_graph passes it to the checks unchanged.
+
+    Args:
+        terms (list): The distinct RDF terms, indexed by identifier.
+        triples (array-like): Three term identifiers per triple, as graph_cache.encode_graph returns them.
+        pos_triples (array-like): The same triples in the order kept for the (predicate, object) lookups;
+            defaults to triples.
+    """
+
+    __slots__ = ("terms", "ids", "spo", "pos", "subject_offsets", "predicate_offsets", "__weakref__")
+
+    # No method changes the graph, so results derived from it, such as its canonical digest, can be kept
+    READ_ONLY = True
+
+    def __init__(self, terms, triples, pos_triples=None):
+        self.terms = terms
+        self.ids = {term: term_id for term_id, term in enumerate(terms)}
+        rows = np.asarray(triples, dtype=ID_DTYPE).reshape(-1, 3)
+        pos_rows = rows if pos_triples is None else np.asarray(pos_triples, dtype=ID_DTYPE).reshape(-1, 3)
+        # lexsort is stable: within a key, the triples keep the order in which they were given
+        self.spo = np.ascontiguousarray(rows[np.lexsort((rows[:, 1], rows[:, 0]))])
+        self.pos = np.ascontiguousarray(pos_rows[np.lexsort((pos_rows[:, 2], pos_rows[:, 1]))][:, [1, 2, 0]])
+        # The rows of a subject, or of a predicate, are then found without a search over the whole array
+        self.subject_offsets = _offsets(self.spo[:, 0], len(terms))
+        self.predicate_offsets = _offsets(self.pos[:, 0], len(terms))
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Encodes an rdflib graph, keeping the order in which its store returns the objects of a subject and the
+        subjects of a (predicate, object) pair, which a plain iteration over the graph does not preserve.
+        """
+        term_ids = {}
+        triples = array("I")
+        for subject in dict.fromkeys(graph.subjects()):
+            for predicate, obj in graph.predicate_objects(subject):
+                for term in (subject, predicate, obj):
+                    triples.append(term_ids.setdefault(term, len(term_ids)))
+        pos_triples = array("I")
+        for predicate in dict.fromkeys(graph.predicates()):
+            for subject, obj in graph.subject_objects(predicate):
+                pos_triples.extend((term_ids[subject], term_ids[predicate], term_ids[obj]))
+        return cls(list(term_ids), triples, pos_triples)
+
+    @classmethod
+    def from_cache(cls, cache, key, format="turtle"):
+        """
+        Loads a catalog from a GraphCache entry without building an rdflib graph. Like GraphCache.load, it
+        does not keep the order of the parsed graph, so value() may pick another of several objects.
+
+        Returns:
+            CompactGraph: The graph, or None on a miss.
+        """
+        encoded = cache.load_encoded(key, format)
+        if encoded is None:
+            return None
+        terms, triples = encoded
+        graph = cls(terms, triples)
+        triples.release()
+        return graph
+
+    def __len__(self):
+        return len(self.spo)
+
+    def __iter__(self):
+        return iter(TripleView(self, self.spo))
+
+    def __contains__(self, triple):
+        return len(self._match(*triple)) > 0
+
+    def _match(self, s, p, o):
+        # The identifier rows matching a pattern, in (subject, predicate, object) order
+        ids = []
+        for term in (s, p, o):
+            if term is None:
+                ids.append(None)
+                continue
+            term_id = self.ids.get(term)
+            if term_id is None:
+                return self.spo[:0]
+            ids.append(term_id)
+        s, p, o = ids
+
+        if s is not None:
+            lo, hi = int(self.subject_offsets[s]), int(self.subject_offsets[s + 1])
+            if p is not None:
+                lo, hi = _narrow(self.spo[:, 1], p, lo, hi)
+            rows = self.spo[lo:hi]
+            return rows[rows[:, 2] == o] if o is not None else rows
+        if p is not None:
+            lo, hi = int(self.predicate_offsets[p]), int(self.predicate_offsets[p + 1])
+            if o is not None:
+                lo, hi = _narrow(self.pos[:, 1], o, lo, hi)
+            return self.pos[lo:hi][:, [2, 0, 1]]
+        if o is not None:
+            # No index leads with the object; the checks never look triples up by object alone
+            rows = self.pos[self.pos[:, 1] == o]
+            return rows[:, [2, 0, 1]]
+        return self.spo
+
+    def triples(self, pattern):
+        """
+        Returns the triples matching a (subject, predicate, object) pattern, where None matches any term.
+
+        Returns:
+            TripleView: The matching triples.
+        """
+        return TripleView(self, self._match(*pattern))
+
+    def subjects(self, predicate=None, object=None):
+        return iter(self.triples((None, predicate, object)).column(0))
+
+    def predicates(self, subject=None, object=None):
+        return iter(self.triples((subject, None, object)).column(1))
+
+    def objects(self, subject=None, predicate=None):
+        return iter(self.triples((subject, predicate, None)).column(2))
+
+    def subject_objects(self, predicate=None):
+        return ((s, o) for s, _, o in self.triples((None, predicate, None)))
+
+    def subject_predicates(self, object=None):
+        return ((s, p) for s, p, _ in self.triples((None, None, object)))
+
+    def predicate_objects(self, subject=None):
+        return ((p, o) for _, p, o in self.triples((subject, None, None)))
+
+    def value(self, subject=None, predicate=RDF.value, object=None, default=None, any=True):
+        """
+        Returns the missing term of a (subject, predicate) or (predicate, object) pair, as rdflib.Graph.value does.
+        """
+        if predicate is None or (subject is None) == (object is None):
+            return default
+        position = 2 if object is None else 0
+        rows = self._match(subject, predicate, object)
+        if len(rows) == 0:
+            return default
+        if not any and len(rows) > 1:
+            raise UniquenessError([self.terms[term_id] for term_id in rows[:, position].tolist()])
+        return self.terms[int(rows[0, position])]
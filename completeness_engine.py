@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import json
+import math
+import argparse
+import numpy as np
+from rdflib import RDF, URIRef
+from catalog_loader import load_graph
+from instrumentation import instrumented
+
+# Prefixes accepted in the classes and properties of user-defined profiles
+PREFIXES = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "dcat": "http://www.w3.org/ns/dcat#",
+    "dct": "http://purl.org/dc/terms/",
+    "foaf": "http://xmlns.com/foaf/0.1/",
+    "adms": "http://www.w3.org/ns/adms#",
+    "prov": "http://www.w3.org/ns/prov#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "odrl": "http://www.w3.org/ns/odrl/2/",
+    "spdx": "http://spdx.org/rdf/terms#",
+    "dcatap": "http://data.europa.eu/r5r/",
+}
+
+# The three entity types scored by check_completeness and core_links
+CORE_CLASSES = ["dcat:Catalog", "dcat:Dataset", "dcat:Distribution"]
+
+# Properties of the DCAT-AP 2.1 classes, by obligation
+DCAT_AP = {
+    "mandatory": {
+        "dcat:Catalog": ["dcat:dataset", "dct:description", "dct:publisher", "dct:title"],
+        "dcat:Dataset": ["dct:description", "dct:title"],
+        "dcat:Distribution": ["dcat:accessURL"],
+        "foaf:Agent": ["foaf:name"],
+    },
+    "recommended": {
+        "dcat:Catalog": ["foaf:homepage", "dct:language", "dct:license", "dct:issued", "dcat:themeTaxonomy", "dct:modified"],
+        "dcat:Dataset": ["dcat:contactPoint", "dcat:distribution", "dcat:keyword", "dct:publisher", "dct:spatial",
+                         "dct:temporal", "dcat:theme"],
+        "dcat:Distribution": ["dcatap:availability", "dct:description", "dct:format", "dct:license"],
+        "foaf:Agent": ["dct:type"],
+    },
+    "optional": {
+        "dcat:Catalog": ["dct:hasPart", "dct:isPartOf", "dcat:record", "dct:rights", "dcat:service", "dcat:catalog",
+                         "dct:creator", "dct:spatial"],
+        "dcat:Dataset": ["dct:accessRights", "dct:conformsTo", "foaf:page", "dct:accrualPeriodicity", "dct:hasVersion",
+                         "dct:identifier", "dct:isReferencedBy", "dct:isVersionOf", "dcat:landingPage", "dct:language",
+                         "adms:identifier", "dct:provenance", "dct:relation", "dct:issued", "adms:sample", "dct:source",
+                         "dcat:spatialResolutionInMeters", "dcat:temporalResolution", "dct:type", "dct:modified",
+                         "owl:versionInfo", "adms:versionNotes", "prov:wasGeneratedBy", "prov:qualifiedAttribution",
+                         "dcat:qualifiedRelation", "dct:creator"],
+        "dcat:Distribution": ["dcat:accessService", "dcat:byteSize", "dcat:compressFormat", "dcat:downloadURL",
+                              "dcat:mediaType", "dcat:packageFormat", "spdx:checksum", "foaf:page", "dct:conformsTo",
+                              "dct:language", "dct:rights", "dct:issued", "dct:modified", "adms:status", "dct:title",
+                              "odrl:hasPolicy", "dcat:spatialResolutionInMeters", "dcat:temporalResolution"],
+    },
+}
+
+# Built-in profiles: per class, the properties whose presence is scored
+PROFILES = {
+    "dcat": {cls: ["dcat:title", "dcat:downloadURL", "dcat:size"] for cls in CORE_CLASSES},
+    "dct": {cls: ["dct:title", "dct:identifier", "dct:description"] for cls in CORE_CLASSES},
+    **{f"dcat_ap_{obligation}": classes for obligation, classes in DCAT_AP.items()},
+}
+
+
+def expand(name):
+    """
+    Expands a prefixed name such as 'dct:title' into a URI; full URIs are returned unchanged.
+    """
+    prefix, _, local = str(name).partition(":")
+    if prefix in PREFIXES and not local.startswith("//"):
+        return URIRef(PREFIXES[prefix] + local)
+    return URIRef(name)
+
+
+class PresenceMatrix:
+    """
+    The subject x predicate presence bitmap of a catalog, built in one pass over the triples of its typed subjects,
+    which are the only ones to get a row. Every completeness profile is then scored by column reductions
+    over the rows of each class, without walking the graph again.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+    """
+
+    def __init__(self, rdf_data):
+        graph = load_graph(rdf_data)
+        self.subjects = {}
+        self.predicates = {}
+        self.classes = {}
+        for subject, cls in graph.subject_objects(RDF.type):
+            row = self.subjects.setdefault(subject, len(self.subjects))
+            self.classes.setdefault(cls, {})[row] = None
+
+        # Only the triples of typed subjects are visited, through the subject index of the store
+        rows = []
+        columns = []
+        for subject, row in self.subjects.items():
+            for predicate in graph.predicates(subject):
+                rows.append(row)
+                columns.append(self.predicates.setdefault(predicate, len(self.predicates)))
+
+        self.matrix = np.zeros((len(self.subjects), len(self.predicates)), dtype=bool)
+        self.matrix[np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)] = True
+        self.classes = {cls: np.fromiter(members, dtype=np.int64, count=len(members)) for cls, members in self.classes.items()}
+
+    def presence(self, cls, properties):
+        """
+        Returns the boolean matrix of the given properties over the subjects of a class.
+        """
+        members = self.classes.get(expand(cls), np.zeros(0, dtype=np.int64))
+        present = np.zeros((len(members), len(properties)), dtype=bool)
+        for position, prop in enumerate(properties):
+            column = self.predicates.get(expand(prop))
+            if column is not None:
+                present[:, position] = self.matrix[members, column]
+        return present
+
+    def evaluate(self, profile):
+        """
+        Scores a profile.
+
+        Args:
+            profile (dict): The properties scored for each class, as prefixed names or URIs.
+
+        Returns:
+            dict: The completeness over every subject of every class of the profile, computed as
+                check_completeness does, and per class its number of subjects, its mean completeness
+                and the fill rate of each property, all as percentages.
+        """
+        report = {"completeness": 0, "classes": {}}
+        scores = []
+        for cls, properties in profile.items():
+            present = self.presence(cls, properties)
+            subject_scores = present.sum(axis=1) / len(properties) * 100 if properties else np.zeros(len(present))
+            scores.append(subject_scores)
+            fill_rates = present.mean(axis=0) * 100 if len(present) else np.zeros(len(properties))
+            report["classes"][str(expand(cls))] = {
+                "subjects": len(present),
+                "completeness": math.fsum(subject_scores) / len(present) if len(present) else 0,
+                "properties": {str(expand(prop)): rate for prop, rate in zip(properties, fill_rates.tolist())},
+            }
+        scores = np.concatenate(scores) if scores else np.zeros(0)
+        # fsum is exactly rounded, so the average does not depend on the order of the subjects
+        report["completeness"] = math.fsum(scores) / len(scores) if len(scores) else 0
+        return report
+
+
+@instrumented("completeness_profiles")
+def completeness_report(rdf_data, profiles=None):
+    """
+    Scores several completeness profiles against a catalog, building its presence bitmap once.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+        profiles (dict): The profiles to score, by name; defaults to PROFILES.
+
+    Returns:
+        dict: The report of each profile, as PresenceMatrix.evaluate returns it.
+    """
+    matrix = PresenceMatrix(rdf_data)
+    return {name: matrix.evaluate(profile) for name, profile in (profiles or PROFILES).items()}
+
+
+"""
+This program scores the built-in DCAT and DCAT-AP completeness profiles, or those of a JSON file, against a Data Catalog.
+
+Usage: python completeness_engine.py filepath [--profiles profiles.json] [--only name,name] [--properties]
+
+A profiles file maps each profile name to its classes, and each class to the list of its properties, e.g.
+{"minimal": {"dcat:Dataset": ["dct:title", "dct:description"], "dcat:Distribution": ["dcat:accessURL"]}}
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Scores completeness profiles against a Data Catalog.")
+    parser.add_argument("filepath", help="The Data Catalog in Turtle format.")
+    parser.add_argument("--profiles", help="A JSON file of profiles, scored instead of the built-in ones.")
+    parser.add_argument("--only", help=f"Comma-separated profiles to score (built-in: {', '.join(PROFILES)}).")
+    parser.add_argument("--properties", action="store_true", help="Print the full report, with the fill rate of every property, as JSON.")
+    args = parser.parse_args()
+
+    try:
+        profiles = PROFILES
+        if args.profiles:
+            with open(args.profiles, "r", encoding="utf-8") as f:
+                profiles = json.load(f)
+        if args.only:
+            unknown = [name for name in args.only.split(",") if name not in profiles]
+            if unknown:
+                raise ValueError(f"Invalid profile name(s): {', '.join(unknown)}")
+            profiles = {name: profiles[name] for name in args.only.split(",")}
+
+        with open(args.filepath, "r", encoding="utf-8") as f:
+            rdf_data = f.read()
+        report = completeness_report(rdf_data, profiles)
+
+        if args.properties:
+            print(json.dumps(report, indent=2))
+            return
+        for name, result in report.items():
+            print(f"{name}: {result['completeness']:.2f}%")
+            for cls, class_result in result["classes"].items():
+                print(f"    {cls}: {class_result['completeness']:.2f}% over {class_result['subjects']} subjects")
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+
+# NLTK resources used to tokenize titles and descriptions
+NLTK_RESOURCES = ["punkt", "stopwords"]
+
+
+def download_resources(download_dir=None):
+    """
+    Downloads the NLTK resources needed by the similarity checks; run once per machine or image.
+
+    Args:
+        download_dir (str): The directory to store the resources in. Defaults to NLTK's data directory.
+
+    Returns:
+        bool: True if every resource is available.
+    """
+    import nltk
+    return all(nltk.download(resource, download_dir=download_dir) for resource in NLTK_RESOURCES)
+
+
+"""
+This program provisions the NLTK resources once, so that the checks never reach the network at start-up.
+
+Usage: python download_resources.py [download_dir]
+"""
+def main():
+    download_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    if not download_resources(download_dir):
+        print("Some NLTK resources could not be downloaded.")
+        sys.exit(1)
+    print("All NLTK resources are available.")
+
+
+if __name__ == "__main__":
+    main()
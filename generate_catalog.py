@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import io
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+
+# Base IRI of the generated resources
+BASE = "http://example.org/synthetic/"
+
+PREFIXES = """@prefix dcat: <http://www.w3.org/ns/dcat#> .
+@prefix dct:  <http://purl.org/dc/terms/> .
+@prefix foaf: <http://xmlns.com/foaf/0.1/> .
+@prefix prov: <http://www.w3.org/ns/prov#> .
+@prefix xsd:  <http://www.w3.org/2001/XMLSchema#> .
+"""
+
+# Controlled vocabularies used by the official catalogs
+AUTHORITY = "http://publications.europa.eu/resource/authority/"
+LANGUAGES = ["en", "de", "fr", "es", "it", "nl", "pl", "pt"]
+THEMES = ["AGRI", "ECON", "EDUC", "ENER", "ENVI", "GOVE", "HEAL", "INTR", "JUST", "REGI", "SOCI", "TECH", "TRAN"]
+FORMATS = ["CSV", "JSON", "PDF", "XML", "ZIP", "XLSX", "RDF_TURTLE"]
+LICENSES = ["CC_BY_4_0", "CC0", "CC_BYSA_4_0", "OP_DATPRO"]
+PUBLISHERS = ["ESTAT", "EEA", "EASA", "HADEA", "JRC", "EMSA", "ECDC", "OP"]
+
+# Words of the generated titles and descriptions, drawn with Zipf-like frequencies
+WORDS = (
+    "data survey european union member states annual report statistics population health energy transport "
+    "agriculture environment emissions water quality monitoring regional national level indicators results "
+    "analysis time series methodology collection public sector information research innovation programme "
+    "funding projects network infrastructure safety aviation maritime air pollution climate change economic "
+    "growth employment education training digital services market trade production consumption household "
+    "income expenditure labour force migration urban rural areas land use biodiversity species habitats "
+    "register database records annex technical specifications guidelines assessment evaluation impact"
+).split()
+
+# Earliest modification date, as a number of days before the reference date
+MAX_AGE_DAYS = 3 * 365
+
+
+def _literal(text, language=None):
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"@{language}' if language else f'"{escaped}"'
+
+
+def _date(rng, now):
+    moment = now - timedelta(seconds=rng.randrange(MAX_AGE_DAYS * 86400))
+    return f'"{moment.strftime("%Y-%m-%dT%H:%M:%SZ")}"^^xsd:dateTime'
+
+
+class _Text:
+    """
+    Draws titles and descriptions from the word list with Zipf-like frequencies.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+
+    def words(self, count):
+        return self.rng.choices(WORDS, self.weights, k=count)
+
+    def title(self):
+        return " ".join(self.words(self.rng.randint(3, 9))).capitalize()
+
+    def description(self, words):
+        sentences = []
+        while words > 0:
+            length = min(words, self.rng.randint(8, 20))
+            sentences.append(" ".join(self.words(length)).capitalize() + ".")
+            words -= length
+        return " ".join(sentences)
+
+
+def write_catalog(f, datasets, distributions=2, missing_rate=0.1, duplicate_rate=0.05, description_words=40,
+                  languages=1, lineage_rate=0.1, seed=0, now=None):
+    """
+    Writes a synthetic DCAT catalog in Turtle, modelled on the structure of the official catalogs.
+
+    Every dataset has a type and a title, and each of its other properties and those of its
+    distributions is left out with probability missing_rate. A duplicated dataset repeats the
+    titles, description and download URLs of an earlier one.
+
+    Args:
+        f (file): The text file to write to.
+        datasets (int): The number of datasets.
+        distributions (int): The average number of distributions per dataset.
+        missing_rate (float): The probability that an optional property is missing.
+        duplicate_rate (float): The probability that a dataset duplicates an earlier one.
+        description_words (int): The average number of words of a dataset description.
+        languages (int): The number of languages of each title and description.
+        lineage_rate (float): The probability that a dataset is derived from an earlier one.
+        seed (int): The seed of the generator; the same arguments, seed and reference date give the same catalog.
+        now (datetime): The reference date of the issued and modified dates. Defaults to the current time,
+            so that timeliness stays comparable between runs.
+
+    Returns:
+        int: The number of datasets and distributions written.
+    """
+    rng = random.Random(seed)
+    text = _Text(rng)
+    now = now or datetime.now(timezone.utc)
+    languages = LANGUAGES[:max(1, languages)]
+
+    def present():
+        return rng.random() >= missing_rate
+
+    f.write(PREFIXES)
+    f.write(f"\n<{BASE}catalog> a dcat:Catalog ;\n")
+    f.write(f"    dct:title {_literal('Synthetic catalog', 'en')} ;\n")
+    f.write(f"    dct:description {_literal(text.description(description_words), 'en')} ;\n")
+    f.write(f"    dct:publisher <{AUTHORITY}corporate-body/{PUBLISHERS[0]}> ;\n")
+    f.write(f"    dct:issued {_date(rng, now)} ;\n    dct:modified {_date(rng, now)} .\n")
+
+    entities = 1
+    originals = []
+    distribution_number = 0
+    for number in range(datasets):
+        dataset = f"<{BASE}dataset/{number}>"
+        original = rng.choice(originals) if originals and rng.random() < duplicate_rate else None
+        if original is None:
+            original = {
+                "titles": [text.title() for _ in languages],
+                "description": text.description(max(1, int(rng.gauss(description_words, description_words / 4)))),
+                "downloads": [],
+            }
+            originals.append(original)
+
+        lines = [f"\n<{BASE}catalog> dcat:dataset {dataset} .\n{dataset} a dcat:Dataset"]
+        lines += [f"dct:title {_literal(title, language)}" for title, language in zip(original["titles"], languages)]
+        if present():
+            lines += [f"dct:description {_literal(original['description'], language)}" for language in languages]
+        if present():
+            lines.append(f'dct:identifier "{number}"')
+        if present():
+            lines.append(f"dct:issued {_date(rng, now)}")
+        if present():
+            lines.append(f"dct:modified {_date(rng, now)}")
+        if present():
+            lines.append(f"dct:publisher <{AUTHORITY}corporate-body/{rng.choice(PUBLISHERS)}>")
+        if present():
+            lines.append(f"dct:license <{AUTHORITY}licence/{rng.choice(LICENSES)}>")
+        if present():
+            lines.append(f"dct:accessRights <{AUTHORITY}access-right/PUBLIC>")
+        if present():
+            lines.append(f"dcat:theme <{AUTHORITY}data-theme/{rng.choice(THEMES)}>")
+        if present():
+            lines.append(f"dcat:contactPoint <{BASE}contact/{rng.randrange(max(1, datasets // 20))}>")
+        if present():
+            lines.append(f"dcat:landingPage <{BASE}page/{number}>")
+        lines += [f"dct:language <{AUTHORITY}language/{language.upper()}>" for language in languages]
+        lines += [f"dcat:keyword {_literal(word, 'en')}" for word in dict.fromkeys(text.words(3))]
+        if number > 0 and rng.random() < lineage_rate:
+            lines.append(f"prov:wasDerivedFrom <{BASE}dataset/{rng.randrange(number)}>")
+
+        count = rng.randint(max(0, distributions - 1), distributions + 1) if distributions else 0
+        names = []
+        for index in range(count):
+            distribution = f"<{BASE}distribution/{distribution_number}>"
+            distribution_number += 1
+            names.append(distribution)
+            file_format = rng.choice(FORMATS)
+            if index < len(original["downloads"]):
+                download = original["downloads"][index]
+            else:
+                download = f"<{BASE}download/{distribution_number}.{file_format.lower()}>"
+                original["downloads"].append(download)
+
+            fields = [f"{distribution} a dcat:Distribution", f"dct:title {_literal(file_format + ' file', 'en')}"]
+            if present():
+                fields.append(f"dcat:accessURL <{BASE}access/{distribution_number}>")
+            if present():
+                fields.append(f"dcat:downloadURL {download}")
+            if present():
+                fields.append(f"dct:format <{AUTHORITY}file-type/{file_format}>")
+            if present():
+                fields.append(f"dct:license <{AUTHORITY}licence/{rng.choice(LICENSES)}>")
+            if present():
+                fields.append(f'dcat:byteSize "{rng.randrange(1, 10 ** 9)}"^^xsd:decimal')
+            if present():
+                fields.append(f"dct:modified {_date(rng, now)}")
+            f.write("\n" + " ;\n    ".join(fields) + " .\n")
+        lines += [f"dcat:distribution {name}" for name in names]
+
+        f.write(" ;\n    ".join(lines) + " .\n")
+        entities += 1 + count
+    return entities
+
+
+def generate_catalog(datasets, **options):
+    """
+    Generates a synthetic DCAT catalog in Turtle; the options are those of write_catalog.
+
+    Returns:
+        str: The catalog.
+    """
+    f = io.StringIO()
+    write_catalog(f, datasets, **options)
+    return f.getvalue()
+
+
+"""
+This program writes a synthetic DCAT catalog in Turtle.
+
+Usage: python generate_catalog.py datasets [--distributions 2] [--missing-rate 0.1] [--duplicate-rate 0.05]
+           [--description-words 40] [--languages 1] [--lineage-rate 0.1] [--seed 0] [--output file]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic DCAT catalog in Turtle.")
+    parser.add_argument("datasets", type=int, help="Number of datasets")
+    parser.add_argument("--distributions", type=int, default=2, help="Average number of distributions per dataset")
+    parser.add_argument("--missing-rate", type=float, default=0.1, help="Probability that an optional property is missing")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05, help="Probability that a dataset duplicates an earlier one")
+    parser.add_argument("--description-words", type=int, default=40, help="Average number of words of a description")
+    parser.add_argument("--languages", type=int, default=1, help="Number of languages of titles and descriptions")
+    parser.add_argument("--lineage-rate", type=float, default=0.1, help="Probability that a dataset is derived from an earlier one")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator")
+    parser.add_argument("--output", help="File to write; defaults to standard output")
+    args = parser.parse_args()
+
+    options = {
+        "distributions": args.distributions,
+        "missing_rate": args.missing_rate,
+        "duplicate_rate": args.duplicate_rate,
+        "description_words": args.description_words,
+        "languages": args.languages,
+        "lineage_rate": args.lineage_rate,
+        "seed": args.seed,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            entities = write_catalog(f, args.datasets, **options)
+        print(f"Wrote {entities} datasets and distributions to {args.output}.", file=sys.stderr)
+    else:
+        write_catalog(sys.stdout, args.datasets, **options)
+
+
+if __name__ == "__main__":
+    main()
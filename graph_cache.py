@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import mmap
+import pickle
+import hashlib
+from array import array
+from rdflib import BNode, Graph
+
+# Bumped whenever the layout of the cached files changes
+FORMAT_VERSION = 1
+
+# Default size of the cache directory before the least recently used entries are evicted
+MAX_BYTES = 512 * 1024 * 1024
+
+# Term identifiers are stored as unsigned 32-bit integers
+_ID_TYPECODE = "I"
+
+
+def content_key(rdf_data):
+    """
+    Returns the SHA-256 of a Data Catalog's content, used as its cache key.
+
+    Args:
+        rdf_data (str or bytes): The content of the Data Catalog file.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    if isinstance(rdf_data, str):
+        rdf_data = rdf_data.encode("utf-8")
+    return hashlib.sha256(rdf_data).hexdigest()
+
+
+def encode_graph(graph):
+    """
+    Interns the terms of a graph and encodes its triples as integer identifiers.
+
+    Args:
+        graph (rdflib.Graph): The graph to encode.
+
+    Returns:
+        tuple: The list of distinct terms, and an array with three term identifiers per triple.
+    """
+    term_ids = {}
+    triples = array(_ID_TYPECODE)
+    for triple in graph:
+        for term in triple:
+            term_id = term_ids.get(term)
+            if term_id is None:
+                term_id = term_ids[term] = len(term_ids)
+            triples.append(term_id)
+    return list(term_ids), triples
+
+
+class GraphCache:
+    """
+    Content-addressed cache of parsed Data Catalogs.
+
+    Each entry is a pickled term table plus a file of 32-bit term identifiers, three per triple,
+    which is memory-mapped when loaded. Entries are keyed by the SHA-256 of the catalog's content
+    and the least recently used ones are evicted once the directory exceeds max_bytes.
+
+    Args:
+        directory (str): The directory holding the cached entries.
+        max_bytes (int): The size of the directory above which entries are evicted.
+    """
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key, format):
+        stem = os.path.join(self.directory, f"{key}.{format}.v{FORMAT_VERSION}")
+        return stem + ".terms", stem + ".triples"
+
+    def load_encoded(self, key, format="turtle"):
+        """
+        Loads the encoded form of a cached catalog.
+
+        Args:
+            key (str): The content key of the catalog.
+            format (str): The serialization format the catalog was parsed from.
+
+        Returns:
+            tuple: The list of terms, with new blank nodes on every load, and a memory-mapped view of the
+                triple identifiers, or None on a miss.
+        """
+        terms_path, triples_path = self._paths(key, format)
+        try:
+            with open(terms_path, "rb") as f:
+                terms = pickle.load(f)
+            with open(triples_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    triples = memoryview(array(_ID_TYPECODE))
+                else:
+                    triples = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast(_ID_TYPECODE)
+        except FileNotFoundError:
+            return None
+        # A parse labels blank nodes afresh, so a cached catalog must not share them with earlier loads
+        terms = [BNode() if isinstance(term, BNode) else term for term in terms]
+        # Touch the entry so that eviction sees it as recently used
+        os.utime(terms_path)
+        os.utime(triples_path)
+        return terms, triples
+
+    def load(self, key, format="turtle"):
+        """
+        Loads a cached catalog as an RDF graph.
+
+        Returns:
+            rdflib.Graph: The graph, or None on a miss.
+        """
+        encoded = self.load_encoded(key, format)
+        if encoded is None:
+            return None
+        terms, triples = encoded
+        graph = Graph()
+        add = graph.store.add
+        for i in range(0, len(triples), 3):
+            add((terms[triples[i]], terms[triples[i + 1]], terms[triples[i + 2]]), graph)
+        triples.release()
+        return graph
+
+    def store(self, key, graph, format="turtle"):
+        """
+        Stores a parsed catalog under its content key, then evicts entries beyond max_bytes.
+        """
+        terms, triples = encode_graph(graph)
+        terms_path, triples_path = self._paths(key, format)
+        # Write to temporary files first so that concurrent readers never see a partial entry
+        with open(triples_path + ".tmp", "wb") as f:
+            triples.tofile(f)
+        with open(terms_path + ".tmp", "wb") as f:
+            pickle.dump(terms, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(triples_path + ".tmp", triples_path)
+        os.replace(terms_path + ".tmp", terms_path)
+        self.evict()
+
+    def get_graph(self, rdf_data, format="turtle"):
+        """
+        Returns the graph of a catalog, parsing and caching it on a miss.
+
+        Args:
+            rdf_data (str): The content of the Data Catalog.
+            format (str): The serialization format of rdf_data.
+
+        Returns:
+            rdflib.Graph: The parsed RDF graph.
+        """
+        key = content_key(rdf_data)
+        graph = self.load(key, format)
+        if graph is None:
+            graph = Graph()
+            graph.parse(data=rdf_data, format=format)
+            self.store(key, graph, format)
+        return graph
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the directory fits in max_bytes.
+        """
+        entries = {}
+        total = 0
+        for name in os.listdir(self.directory):
+            stem, extension = os.path.splitext(name)
+            if extension in (".terms", ".triples"):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                mtime, size, paths = entries.get(stem, (0, 0, []))
+                entries[stem] = (max(mtime, stat.st_mtime), size + stat.st_size, paths + [path])
+                total += stat.st_size
+        for mtime, size, paths in sorted(entries.values()):
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
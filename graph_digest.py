@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import sys
+import json
+import hashlib
+import weakref
+from catalog_loader import load_catalog_file
+
+# Suffix of the file stored next to each catalog with its canonical digest
+SIDECAR_SUFFIX = ".digest"
+
+# Version of the digest; bump it when the canonicalization changes to ignore old sidecars
+DIGEST_VERSION = 1
+
+# Digests of the read-only graphs already canonicalized; an rdflib graph can be edited in place, so its
+# digest is never reused
+_digests = weakref.WeakKeyDictionary()
+
+
+def canonical_digest(graph):
+    """
+    Computes a stable digest of a graph, with its blank nodes canonicalized.
+
+    Two graphs have the same digest if and only if they are isomorphic, so a catalog that is
+    re-harvested with different blank-node labels keeps its digest. The digest of a read-only graph,
+    such as a compact_store.CompactGraph, is kept while the graph lives; catalog files keep theirs in
+    sidecars (see file_digest).
+
+    Args:
+        graph (rdflib.Graph): The graph to digest.
+
+    Returns:
+        str: The digest, built from SHA-256 hashes of the canonical triples, in hexadecimal.
+    """
+    # Canonicalization is the costly part of comparing catalogs, so each read-only graph is digested once
+    read_only = getattr(graph, "READ_ONLY", False)
+    if read_only and graph in _digests:
+        return _digests[graph]
+    from rdflib.compare import to_isomorphic
+    digest = f"{to_isomorphic(graph).graph_digest():064x}"
+    if read_only:
+        _digests[graph] = digest
+    return digest
+
+
+def _sidecar_path(path):
+    return path + SIDECAR_SUFFIX
+
+
+def _content_hash(path):
+    """
+    Returns the SHA-256 of the bytes of a file, which is far cheaper than parsing it.
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def cached_file_digest(path, content=None):
+    """
+    Returns the canonical digest of a catalog file from its sidecar, without parsing the catalog.
+
+    Args:
+        path (str): The path to the catalog file.
+        content (str): The content hash of the file, if already known.
+
+    Returns:
+        str: The digest, or None if there is no sidecar or the file changed since it was written.
+    """
+    try:
+        with open(_sidecar_path(path), "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        content = content or _content_hash(path)
+    except (OSError, ValueError):
+        return None
+    if sidecar.get("version") != DIGEST_VERSION or sidecar.get("content") != content:
+        return None
+    return sidecar.get("digest")
+
+
+def file_digest(path, format="turtle", graph=None):
+    """
+    Returns the canonical digest of a catalog file, computing it and storing it in a sidecar
+    next to the file unless the sidecar already holds the digest of the current content.
+
+    Args:
+        path (str): The path to the catalog file.
+        format (str): The RDF format of the file.
+        graph (rdflib.Graph): The already-parsed catalog, if available, to avoid parsing it again.
+
+    Returns:
+        str: The digest in hexadecimal.
+    """
+    content = _content_hash(path)
+    digest = cached_file_digest(path, content)
+    if digest is not None:
+        return digest
+
+    if graph is None:
+        graph = load_catalog_file(path, format)
+    digest = canonical_digest(graph)
+
+    sidecar = {"version": DIGEST_VERSION, "content": content, "digest": digest}
+    temporary_path = _sidecar_path(path) + ".tmp"
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(sidecar, f)
+        os.replace(temporary_path, _sidecar_path(path))
+    except OSError:
+        pass  # A read-only catalog directory only loses the cache
+    return digest
+
+
+def is_unchanged(path, previous_path, format="turtle"):
+    """
+    Checks whether a newly harvested catalog has the same content as the previous harvest, up to blank-node labels.
+
+    Args:
+        path (str): The path to the new catalog file.
+        previous_path (str): The path to the previous catalog file.
+        format (str): The RDF format of both files.
+
+    Returns:
+        bool: True if both catalogs are isomorphic.
+    """
+    return file_digest(path, format) == file_digest(previous_path, format)
+
+
+"""
+This program prints the canonical digest of each catalog, storing it next to the file for later runs.
+With two files, it also reports whether the second is unchanged from the first.
+
+Usage: python graph_digest.py filepath [previous_filepath]
+"""
+def main():
+    try:
+        if len(sys.argv) < 2:
+            print("Usage: python graph_digest.py filepath [previous_filepath]")
+            sys.exit(1)
+
+        for rdf_data_path in sys.argv[1:3]:
+            print(f"{file_digest(rdf_data_path)}  {rdf_data_path}")
+        if len(sys.argv) > 2:
+            if is_unchanged(sys.argv[1], sys.argv[2]):
+                print(f"{sys.argv[1]} is unchanged since {sys.argv[2]}.")
+            else:
+                print(f"{sys.argv[1]} has changed since {sys.argv[2]}.")
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import json
+import sqlite3
+import hashlib
+from collections import Counter
+from rdflib import RDF, BNode, Namespace, URIRef
+from catalog_loader import load_graph
+from check_completeness import calculate_completeness, dcat_properties, dct_properties
+from text_analysis import readability_grade
+
+# Define some RDF prefixes
+dcat = Namespace("http://www.w3.org/ns/dcat#")
+dcterms = Namespace("http://purl.org/dc/terms/")
+
+# Bits of the entity types a subject has
+TYPE_BITS = {
+    "catalog": (dcat.Catalog, 1 << 0),
+    "dataset": (dcat.Dataset, 1 << 1),
+    "distribution": (dcat.Distribution, 1 << 2),
+}
+
+# Predicates whose objects identify duplicated datasets or distributions, as in check_accuracy
+DUPLICATE_PREDICATES = (dcat.title, dcat.downloadURL)
+
+# Version of the per-subject partial results; bump it when a metric changes to rescore from scratch
+STATE_VERSION = 2
+
+
+def subject_digest(graph, subject):
+    """
+    Hashes the outgoing triples of a subject, ignoring blank-node labels, which change on every parse.
+    """
+    lines = sorted(
+        f"{predicate.n3()} {'_:' if isinstance(obj, BNode) else obj.n3()}"
+        for predicate, obj in graph.predicate_objects(subject)
+    )
+    return hashlib.blake2b("\n".join(lines).encode("utf-8"), digest_size=16).digest()
+
+
+def subject_partials(graph, subject):
+    """
+    Computes the contribution of one subject to every metric, from its outgoing triples only.
+
+    Returns:
+        dict: The types bitmask, completeness scores, license count, consistency counts,
+            readability sum and count, duplicate keys and link occurrences of the subject.
+    """
+    types = 0
+    for entity_type, bit in TYPE_BITS.values():
+        if (subject, RDF.type, entity_type) in graph:
+            types |= bit
+
+    objects = {}
+    duplicate_keys = []
+    links = Counter()
+    for predicate, obj in graph.predicate_objects(subject):
+        objects.setdefault(predicate, set()).add(obj)
+        if predicate in DUPLICATE_PREDICATES:
+            duplicate_keys.append(obj.n3())
+        if isinstance(obj, URIRef):
+            links[str(obj)] += 1
+
+    readability = []
+    if types & TYPE_BITS["dataset"][1]:
+        for text in (graph.value(subject, dcat.title), graph.value(subject, dcterms.description)):
+            if text:
+                readability.append(readability_grade(str(text)))
+
+    return {
+        "types": types,
+        "completeness_dcat": calculate_completeness(graph, subject, dcat_properties),
+        "completeness_dct": calculate_completeness(graph, subject, dct_properties),
+        "licenses": len(objects.get(dcterms.license, ())),
+        "pairs": len(objects),
+        "inconsistent": sum(1 for values in objects.values() if len(values) > 1),
+        "readability_sum": sum(readability),
+        "readability_count": len(readability),
+        "duplicate_keys": duplicate_keys,
+        "links": dict(links),
+    }
+
+
+class IncrementalScorer:
+    """
+    Scores successive versions of a catalog, recomputing only the subjects that changed.
+
+    The contribution of every subject to each metric is stored in an SQLite file. A new version is
+    diffed against it by hashing the outgoing triples of each subject; only added and changed
+    subjects are scored, removed ones are subtracted, and the catalog-level metrics are aggregated
+    from the stored contributions. Subjects are identified by IRI, and blank-node subjects by their content.
+
+    Args:
+        path (str): The SQLite file holding the state of the previous run.
+        checker (LinkChecker): If given, the links of the catalog are checked with it on every update,
+            best with a LinkCache so that only the links whose results expired are requested again.
+    """
+
+    def __init__(self, path, checker=None):
+        self.checker = checker
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value INTEGER)")
+        version = self.connection.execute("SELECT value FROM settings WHERE name = 'version'").fetchone()
+        if version != (STATE_VERSION,):
+            # State written by another version of the metrics cannot be reused
+            for table in ("subjects", "duplicate_keys", "link_status"):
+                self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self.connection.execute("INSERT OR REPLACE INTO settings VALUES ('version', ?)", (STATE_VERSION,))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS subjects (key TEXT PRIMARY KEY, digest BLOB, types INTEGER,"
+            " completeness_dcat REAL, completeness_dct REAL, licenses INTEGER, pairs INTEGER, inconsistent INTEGER,"
+            " readability_sum REAL, readability_count INTEGER, duplicate_keys TEXT, links TEXT)"
+        )
+        self.connection.execute("CREATE TABLE IF NOT EXISTS duplicate_keys (key TEXT PRIMARY KEY, count INTEGER)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS link_status (uri TEXT PRIMARY KEY, occurrences INTEGER, status INTEGER, checked INTEGER)")
+        self.connection.commit()
+
+    def update(self, rdf_data):
+        """
+        Brings the stored state up to date with a new version of the catalog.
+
+        Args:
+            rdf_data (str or rdflib.Graph): The new version, as RDF data or an already-parsed graph.
+
+        Returns:
+            dict: The number of added, changed, removed and unchanged subjects.
+        """
+        graph = load_graph(rdf_data)
+        stored = dict(self.connection.execute("SELECT key, digest FROM subjects"))
+
+        current = {}
+        blank_subjects = Counter()
+        for subject in set(graph.subjects()):
+            digest = subject_digest(graph, subject)
+            if isinstance(subject, BNode):
+                # Blank nodes with the same content are interchangeable, so they are only numbered
+                key = f"_:{digest.hex()}:{blank_subjects[digest]}"
+                blank_subjects[digest] += 1
+            else:
+                key = str(subject)
+            current[key] = (subject, digest)
+
+        removed = [key for key in stored if key not in current]
+        changed = [key for key, (_, digest) in current.items() if key in stored and stored[key] != digest]
+        added = [key for key in current if key not in stored]
+
+        for key in removed + changed:
+            self._remove(key)
+        for key in changed + added:
+            subject = current[key][0]
+            partials = subject_partials(graph, subject)
+            self._add(key, current[key][1], partials)
+        if self.checker is not None:
+            # Every link is checked on every run, unchanged subjects included, since a link can break while
+            # its subject stays the same; the checker's cache answers the links that are still fresh
+            checked_links = [uri for (uri,) in self.connection.execute("SELECT uri FROM link_status")]
+        if self.checker is not None and checked_links:
+            statuses = self.checker.check_uris(checked_links)
+            self.connection.executemany("UPDATE link_status SET status = ?, checked = 1 WHERE uri = ?", [(statuses[uri], uri) for uri in checked_links])
+        self.connection.commit()
+
+        return {
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+            "unchanged": len(current) - len(added) - len(changed),
+        }
+
+    def _add(self, key, digest, partials):
+        self.connection.execute(
+            "INSERT INTO subjects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, digest, partials["types"], partials["completeness_dcat"], partials["completeness_dct"],
+             partials["licenses"], partials["pairs"], partials["inconsistent"], partials["readability_sum"],
+             partials["readability_count"], json.dumps(partials["duplicate_keys"]), json.dumps(partials["links"])),
+        )
+        self.connection.executemany(
+            "INSERT INTO duplicate_keys VALUES (?, 1) ON CONFLICT (key) DO UPDATE SET count = count + 1",
+            [(duplicate_key,) for duplicate_key in partials["duplicate_keys"]],
+        )
+        self.connection.executemany(
+            "INSERT INTO link_status VALUES (?, ?, NULL, 0) ON CONFLICT (uri) DO UPDATE SET occurrences = occurrences + excluded.occurrences",
+            partials["links"].items(),
+        )
+
+    def _remove(self, key):
+        duplicate_keys, links = self.connection.execute("SELECT duplicate_keys, links FROM subjects WHERE key = ?", (key,)).fetchone()
+        self.connection.executemany(
+            "UPDATE duplicate_keys SET count = count - 1 WHERE key = ?",
+            [(duplicate_key,) for duplicate_key in json.loads(duplicate_keys)],
+        )
+        self.connection.executemany(
+            "UPDATE link_status SET occurrences = occurrences - ? WHERE uri = ?",
+            [(count, uri) for uri, count in json.loads(links).items()],
+        )
+        self.connection.execute("DELETE FROM duplicate_keys WHERE count <= 0")
+        self.connection.execute("DELETE FROM link_status WHERE occurrences <= 0")
+        self.connection.execute("DELETE FROM subjects WHERE key = ?", (key,))
+
+    def report(self):
+        """
+        Aggregates the stored contributions into the catalog-level metrics of the last version.
+
+        Returns:
+            dict: completeness_dcat and completeness_dct as in check_completeness, licensing as in
+                check_licensing, duplicates as in calculate_duplicates, readability as in
+                check_readability, the consistency of each entity type as the percentage of its
+                (subject, predicate) pairs with several values, and links as in check_links, or
+                None if some links were never checked.
+        """
+        def ratio(numerator, denominator, scale=1):
+            return numerator / denominator * scale if denominator else 0
+
+        weight = " + ".join(f"((types & {bit}) > 0)" for _, bit in TYPE_BITS.values())
+        weights, completeness_dcat, completeness_dct = self.connection.execute(
+            f"SELECT SUM({weight}), SUM(({weight}) * completeness_dcat), SUM(({weight}) * completeness_dct) FROM subjects"
+        ).fetchone()
+        datasets, licenses, readability_sum, readability_count = self.connection.execute(
+            "SELECT COUNT(*), SUM(licenses), SUM(readability_sum), SUM(readability_count) FROM subjects WHERE types & ?",
+            (TYPE_BITS["dataset"][1],),
+        ).fetchone()
+        duplicated, duplicate_keys = self.connection.execute(
+            "SELECT SUM(count > 1), COUNT(*) FROM duplicate_keys"
+        ).fetchone()
+        # A link that could not be fetched has no status and counts as broken, as in check_links; only the
+        # links never passed to a checker leave the metric undefined
+        broken, unchecked, occurrences = self.connection.execute(
+            "SELECT SUM(CASE WHEN status = 200 THEN 0 ELSE occurrences END), SUM(NOT checked), SUM(occurrences) FROM link_status"
+        ).fetchone()
+
+        consistency = {}
+        for entity_type, (_, bit) in TYPE_BITS.items():
+            inconsistent, pairs = self.connection.execute(
+                "SELECT SUM(inconsistent), SUM(pairs) FROM subjects WHERE types & ?", (bit,)
+            ).fetchone()
+            consistency[entity_type] = ratio(inconsistent, pairs, 100)
+
+        return {
+            "subjects": self.connection.execute("SELECT COUNT(*) FROM subjects").fetchone()[0],
+            "completeness_dcat": ratio(completeness_dcat, weights),
+            "completeness_dct": ratio(completeness_dct, weights),
+            "licensing": ratio(licenses, datasets, 100),
+            "duplicates": ratio(duplicated, duplicate_keys, 100),
+            "readability": ratio(readability_sum, readability_count),
+            "consistency": consistency,
+            "links": None if unchecked else ratio(broken, occurrences, 100),
+        }
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+"""
+This program rescores a new version of a catalog from the state of the previous run, printing
+the subject-level diff and the updated metrics as JSON.
+
+Usage: python incremental.py state_file filepath [link_cache_file]
+    Links are checked only when a link cache file is given.
+"""
+def main():
+    try:
+        if len(sys.argv) < 3:
+            print("Usage: python incremental.py state_file filepath [link_cache_file]")
+            sys.exit(1)
+
+        state_path = sys.argv[1]
+        rdf_data_path = sys.argv[2]
+
+        with open(rdf_data_path, "r", encoding="utf-8") as f:
+            rdf_data = f.read()
+
+        if len(sys.argv) > 3:
+            from link_checker import LinkChecker
+            from link_cache import LinkCache
+            with LinkCache(sys.argv[3]) as cache, LinkChecker(cache=cache) as checker, IncrementalScorer(state_path, checker) as scorer:
+                diff = scorer.update(rdf_data)
+                report = scorer.report()
+        else:
+            with IncrementalScorer(state_path) as scorer:
+                diff = scorer.update(rdf_data)
+                report = scorer.report()
+        print(json.dumps({"diff": diff, "metrics": report}, indent=2))
+
+    except FileNotFoundError:
+        print(f"File not found: {rdf_data_path}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
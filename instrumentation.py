@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import json
+import time
+import functools
+import threading
+import tracemalloc
+
+# Enables instrumentation for every check when set: '1' for time and counters, 'memory' to trace memory too
+INSTRUMENTATION_ENV = "DATAQ_INSTRUMENTATION"
+
+# Record of the phases and counters that happen outside any check, such as parsing the catalog once for all checks
+OUTSIDE_CHECKS = "(outside checks)"
+
+# Phase of a check's own work: the time not spent parsing, on the network, analysing text or in nested checks
+SUBJECTS_PHASE = "subjects"
+
+_enabled = False
+_trace_memory = False
+_records = {}
+_records_lock = threading.Lock()
+
+# Each thread, such as a worker of the scoring service, keeps its own stack of running checks
+_local = threading.local()
+
+
+def _stack():
+    # The checks running in the calling thread, innermost last
+    frames = getattr(_local, "frames", None)
+    if frames is None:
+        frames = _local.frames = []
+    return frames
+
+
+def enable(memory=False):
+    """
+    Starts recording the time, memory and counters of every instrumented check.
+
+    Args:
+        memory (bool): Whether to trace the peak memory of each check with tracemalloc, which slows Python down several times.
+            tracemalloc sees the whole process, so with checks running in several threads the peaks overlap.
+    """
+    global _enabled, _trace_memory
+    _enabled = True
+    _trace_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    """
+    Stops recording; the instrumented code then runs at its own speed. Records are kept until reset.
+    """
+    global _enabled, _trace_memory
+    _enabled = False
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _trace_memory = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """
+    Discards every record.
+    """
+    with _records_lock:
+        _records.clear()
+
+
+def _record(name):
+    record = _records.get(name)
+    if record is None:
+        record = _records[name] = {
+            "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_bytes": None, "phases": {}, "counters": {},
+        }
+    return record
+
+
+def _add_phase(record, name, wall_seconds, cpu_seconds):
+    phase_record = record["phases"].setdefault(name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+    phase_record["calls"] += 1
+    phase_record["wall_seconds"] += wall_seconds
+    phase_record["cpu_seconds"] += cpu_seconds
+
+
+class _Frame:
+    """
+    A check running under instrumentation, which collects the time of its phases and nested checks.
+    """
+    __slots__ = ("name", "wall_start", "cpu_start", "inner_wall", "inner_cpu", "memory_start", "memory_peak", "graphs")
+
+    def __init__(self, name):
+        self.name = name
+        self.inner_wall = 0.0
+        self.inner_cpu = 0.0
+        self.graphs = set()
+        self.memory_start = self.memory_peak = 0
+        if _trace_memory:
+            # The peak so far belongs to the enclosing checks before it is reset for this one
+            current, peak = tracemalloc.get_traced_memory()
+            for frame in _stack():
+                frame.memory_peak = max(frame.memory_peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.memory_peak = current
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+
+    def finish(self):
+        wall_seconds = time.perf_counter() - self.wall_start
+        cpu_seconds = time.thread_time() - self.cpu_start
+        with _records_lock:
+            record = _record(self.name)
+            record["calls"] += 1
+            record["wall_seconds"] += wall_seconds
+            record["cpu_seconds"] += cpu_seconds
+            _add_phase(record, SUBJECTS_PHASE, max(0.0, wall_seconds - self.inner_wall), max(0.0, cpu_seconds - self.inner_cpu))
+        if _trace_memory:
+            peak = max(self.memory_peak, tracemalloc.get_traced_memory()[1])
+            for frame in _stack():
+                frame.memory_peak = max(frame.memory_peak, peak)
+            with _records_lock:
+                record["peak_bytes"] = max(record["peak_bytes"] or 0, peak - self.memory_start)
+        return wall_seconds, cpu_seconds
+
+
+def instrumented(name):
+    """
+    Decorates a check so that, while instrumentation is enabled, its calls are recorded under the given name.
+    When it is disabled the check is called directly, at the cost of one flag test.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            stack = _stack()
+            frame = _Frame(name)
+            stack.append(frame)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stack.pop()
+                wall_seconds, cpu_seconds = frame.finish()
+                if stack:
+                    stack[-1].inner_wall += wall_seconds
+                    stack[-1].inner_cpu += cpu_seconds
+        return wrapper
+    return decorator
+
+
+class _Phase:
+    __slots__ = ("name", "wall_start", "cpu_start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+
+    def __exit__(self, *exc_info):
+        wall_seconds = time.perf_counter() - self.wall_start
+        cpu_seconds = time.thread_time() - self.cpu_start
+        stack = _stack()
+        if stack:
+            frame = stack[-1]
+            frame.inner_wall += wall_seconds
+            frame.inner_cpu += cpu_seconds
+        with _records_lock:
+            _add_phase(_record(frame.name if stack else OUTSIDE_CHECKS), self.name, wall_seconds, cpu_seconds)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name):
+    """
+    Returns a context manager that records the time spent in a phase of the running check, such as 'parse',
+    'network' or 'text_analysis'. When instrumentation is disabled it is a shared no-op.
+    """
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+def count(name, amount=1):
+    """
+    Adds to a counter of the running check, such as the number of URIs fetched.
+    """
+    if not _enabled:
+        return
+    stack = _stack()
+    with _records_lock:
+        record = _record(stack[-1].name if stack else OUTSIDE_CHECKS)
+        record["counters"][name] = record["counters"].get(name, 0) + amount
+
+
+def scanned(graph):
+    """
+    Counts the triples of a graph as scanned by the running check, once per check call however often it is loaded.
+    """
+    if not _enabled:
+        return
+    stack = _stack()
+    if stack:
+        if id(graph) in stack[-1].graphs:
+            return
+        stack[-1].graphs.add(id(graph))
+    count("triples_scanned", len(graph))
+
+
+def report():
+    """
+    Returns every record: per check, the number of calls, the total wall seconds and CPU seconds of the
+    threads that ran it, the peak of
+    traced memory in bytes (None when memory is not traced), and the time of each phase and each counter.
+    """
+    with _records_lock:
+        return {"checks": json.loads(json.dumps(_records))}
+
+
+def to_json(path=None):
+    """
+    Exports the records as JSON, to a file if a path is given.
+
+    Returns:
+        str: The JSON report.
+    """
+    text = json.dumps(report(), indent=2)
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return text
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_prometheus(path=None, prefix="dataq"):
+    """
+    Exports the records in the Prometheus text exposition format, to a file if a path is given,
+    e.g. for the textfile collector of the node exporter.
+
+    Returns:
+        str: The exposition text.
+    """
+    metrics = [
+        ("check_calls_total", "counter", "Calls of each quality check."),
+        ("check_wall_seconds_total", "counter", "Wall time spent in each quality check."),
+        ("check_cpu_seconds_total", "counter", "CPU time spent in each quality check."),
+        ("check_peak_bytes", "gauge", "Peak of traced memory allocated by each quality check."),
+        ("phase_calls_total", "counter", "Calls of each phase of each quality check."),
+        ("phase_wall_seconds_total", "counter", "Wall time spent in each phase of each quality check."),
+        ("phase_cpu_seconds_total", "counter", "CPU time spent in each phase of each quality check."),
+        ("events_total", "counter", "Counters of each quality check, such as triples scanned and URIs fetched."),
+    ]
+    samples = {name: [] for name, _, _ in metrics}
+    for check, record in sorted(report()["checks"].items()):
+        labels = f'check="{_label(check)}"'
+        samples["check_calls_total"].append((labels, record["calls"]))
+        samples["check_wall_seconds_total"].append((labels, record["wall_seconds"]))
+        samples["check_cpu_seconds_total"].append((labels, record["cpu_seconds"]))
+        if record["peak_bytes"] is not None:
+            samples["check_peak_bytes"].append((labels, record["peak_bytes"]))
+        for phase_name, phase_record in sorted(record["phases"].items()):
+            phase_labels = f'{labels},phase="{_label(phase_name)}"'
+            samples["phase_calls_total"].append((phase_labels, phase_record["calls"]))
+            samples["phase_wall_seconds_total"].append((phase_labels, phase_record["wall_seconds"]))
+            samples["phase_cpu_seconds_total"].append((phase_labels, phase_record["cpu_seconds"]))
+        for counter, value in sorted(record["counters"].items()):
+            samples["events_total"].append((f'{labels},event="{_label(counter)}"', value))
+
+    lines = []
+    for name, kind, description in metrics:
+        if not samples[name]:
+            continue
+        lines.append(f"# HELP {prefix}_{name} {description}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        lines.extend(f"{prefix}_{name}{{{labels}}} {value}" for labels, value in samples[name])
+    text = "\n".join(lines) + "\n"
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return text
+
+
+if os.environ.get(INSTRUMENTATION_ENV):
+    enable(memory=os.environ[INSTRUMENTATION_ENV] == "memory")
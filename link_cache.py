@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import time
+import sqlite3
+
+# Default lifetimes of cached results, in seconds
+GOOD_TTL = 7 * 24 * 3600
+BROKEN_TTL = 24 * 3600
+
+# SQLite limits the number of parameters per statement
+_BATCH_SIZE = 500
+
+
+class LinkCache:
+    """
+    On-disk store of link check results, keyed by URI.
+
+    Every entry keeps the status, the time it was checked and the ETag and Last-Modified validators,
+    so that expired entries can be revalidated with conditional requests.
+
+    Args:
+        path (str): The SQLite file holding the cache.
+        good_ttl (float): Seconds a result with status 200 stays fresh.
+        broken_ttl (float): Seconds any other result stays fresh.
+        max_entries (int): The number of entries kept; the least recently used ones are evicted first.
+    """
+
+    def __init__(self, path, good_ttl=GOOD_TTL, broken_ttl=BROKEN_TTL, max_entries=100000):
+        self.path = path
+        self.good_ttl = good_ttl
+        self.broken_ttl = broken_ttl
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS links ("
+            "uri TEXT PRIMARY KEY, status INTEGER, checked_at REAL, "
+            "etag TEXT, last_modified TEXT, accessed_at REAL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS links_accessed_at ON links (accessed_at)")
+        self.connection.commit()
+
+    def is_fresh(self, entry, now=None):
+        """
+        Tells whether a cached entry can be used without contacting the server.
+
+        Args:
+            entry (dict): An entry returned by get_many.
+            now (float): The current time. Defaults to time.time().
+
+        Returns:
+            bool: True if the entry has not outlived its TTL.
+        """
+        ttl = self.good_ttl if entry["status"] == 200 else self.broken_ttl
+        return (now or time.time()) - entry["checked_at"] < ttl
+
+    def get_many(self, uris):
+        """
+        Looks up several URIs at once and marks the ones found as recently used.
+
+        Args:
+            uris (list): The URIs to look up.
+
+        Returns:
+            dict: The entries found, keyed by URI, with keys status, checked_at, etag and last_modified.
+        """
+        entries = {}
+        for start in range(0, len(uris), _BATCH_SIZE):
+            batch = uris[start:start + _BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT uri, status, checked_at, etag, last_modified FROM links WHERE uri IN ({placeholders})",
+                batch,
+            )
+            for uri, status, checked_at, etag, last_modified in rows:
+                entries[uri] = {"status": status, "checked_at": checked_at, "etag": etag, "last_modified": last_modified}
+        if entries:
+            now = time.time()
+            self.connection.executemany("UPDATE links SET accessed_at = ? WHERE uri = ?", [(now, uri) for uri in entries])
+            self.connection.commit()
+        return entries
+
+    def put_many(self, results):
+        """
+        Stores several link check results at once, then evicts entries beyond max_entries.
+
+        Args:
+            results (dict): Tuples of (status, etag, last_modified) keyed by URI.
+        """
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO links (uri, status, checked_at, etag, last_modified, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(uri, status, now, etag, last_modified, now) for uri, (status, etag, last_modified) in results.items()],
+        )
+        self.evict()
+        self.connection.commit()
+
+    def evict(self):
+        """
+        Removes the least recently used entries so that at most max_entries remain.
+        """
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM links").fetchone()
+        if count > self.max_entries:
+            self.connection.execute(
+                "DELETE FROM links WHERE uri IN (SELECT uri FROM links ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
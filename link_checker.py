@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from urllib.parse import urlsplit
+from instrumentation import phase, count
+
+# Only these schemes can be fetched; any other link is reported as broken
+FETCHABLE_SCHEMES = ("http", "https")
+
+
+class LinkChecker:
+    """
+    Checks many links concurrently, fetching every distinct URI only once.
+
+    Args:
+        max_workers (int): The global number of concurrent requests.
+        per_host (int): The number of concurrent requests to the same host.
+        connect_timeout (float): Seconds allowed to establish a connection.
+        read_timeout (float): Seconds allowed between bytes of the response.
+        cache (LinkCache): An optional persistent store of previous results.
+    """
+
+    def __init__(self, max_workers=16, per_host=4, connect_timeout=5.0, read_timeout=10.0, cache=None):
+        self.max_workers = max_workers
+        self.cache = cache
+        self.per_host = per_host
+        self.timeout = (connect_timeout, read_timeout)
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+
+        # requests is only imported once links are actually checked
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._request_error = requests.RequestException
+
+        # One session with a pool large enough for every worker keeps connections alive between requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _host_limit(self, host):
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def fetch(self, uri, entry=None):
+        """
+        Fetches a single URI with HEAD, falling back to GET when HEAD is not answered with 200.
+
+        When a cached entry with validators is given, both requests are conditional and a
+        304 Not Modified answer keeps the cached status.
+
+        Args:
+            uri (str): The URI to fetch.
+            entry (dict): The expired cache entry of the URI, if any.
+
+        Returns:
+            tuple: The final HTTP status code after redirects (or None if the URI could not be fetched),
+            the ETag and the Last-Modified validators.
+        """
+        parts = urlsplit(str(uri))
+        if parts.scheme not in FETCHABLE_SCHEMES or not parts.netloc:
+            return None, None, None
+
+        headers = {}
+        if entry is not None and entry["status"] == 200:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        with self._host_limit(parts.netloc):
+            try:
+                response = self.session.head(uri, headers=headers, timeout=self.timeout, allow_redirects=True)
+                response.close()
+                if response.status_code not in (200, 304):
+                    # Many servers reject or mishandle HEAD, so confirm with a GET without reading the body
+                    response = self.session.get(uri, headers=headers, timeout=self.timeout, allow_redirects=True, stream=True)
+                    response.close()
+            except self._request_error:
+                return None, None, None
+
+        if response.status_code == 304 and headers:
+            return entry["status"], entry["etag"], entry["last_modified"]
+        return response.status_code, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    def check_uri(self, uri):
+        """
+        Fetches a single URI with HEAD, falling back to GET when HEAD is not answered with 200.
+
+        Args:
+            uri (str): The URI to check.
+
+        Returns:
+            int: The final HTTP status code after redirects, or None if the URI could not be fetched.
+        """
+        return self.fetch(uri)[0]
+
+    def check_uris(self, uris):
+        """
+        Checks a collection of URIs concurrently.
+
+        URIs with a fresh cache entry are not fetched, and expired entries are revalidated
+        with conditional requests.
+
+        Args:
+            uris (iterable): The URIs to check. Repeated URIs are fetched only once.
+
+        Returns:
+            dict: The status code (or None) of every distinct URI.
+        """
+        with phase("network"):
+            return self._check_uris(uris)
+
+    def _check_uris(self, uris):
+        unique_uris = list(dict.fromkeys(str(uri) for uri in uris))
+        if not unique_uris:
+            return {}
+
+        statuses = {}
+        entries = {}
+        if self.cache is not None:
+            entries = self.cache.get_many(unique_uris)
+            now = time.time()
+            statuses = {uri: entry["status"] for uri, entry in entries.items() if self.cache.is_fresh(entry, now)}
+        pending = [uri for uri in unique_uris if uri not in statuses]
+        count("uris_checked", len(unique_uris))
+        count("uris_fetched", len(pending))
+        if not pending:
+            return statuses
+
+        # Interleave hosts so that workers are not all parked on the same host's limit
+        by_host = {}
+        for uri in pending:
+            by_host.setdefault(urlsplit(uri).netloc, []).append(uri)
+        pending = [uri for group in zip_longest(*by_host.values()) for uri in group if uri is not None]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            results = dict(zip(pending, executor.map(lambda uri: self.fetch(uri, entries.get(uri)), pending)))
+        if self.cache is not None:
+            self.cache.put_many(results)
+        statuses.update((uri, result[0]) for uri, result in results.items())
+        return statuses
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
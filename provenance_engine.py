@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import json
+import argparse
+from rdflib import RDF, RDFS, Namespace
+from catalog_loader import load_graph
+from instrumentation import instrumented
+
+dcat = Namespace("http://www.w3.org/ns/dcat#")
+prov = Namespace("http://www.w3.org/ns/prov#")
+
+# Roots listed per dataset in the report; the count is always complete
+MAX_ROOTS = 20
+
+
+def _adjacency(graph, predicate):
+    adjacency = {}
+    for subject, obj in graph.subject_objects(predicate):
+        adjacency.setdefault(subject, {})[obj] = None
+    return adjacency
+
+
+def strongly_connected_components(adjacency):
+    """
+    Finds the strongly connected components of a directed graph with an iterative Tarjan traversal,
+    in time linear in its nodes and edges.
+
+    Args:
+        adjacency (dict): The successors of each node, as an iterable per node.
+
+    Returns:
+        list: The components as lists of nodes, every component listed after the components it reaches.
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    for start in adjacency:
+        if start in index:
+            continue
+        work = [(start, iter(adjacency.get(start, ())))]
+        index[start] = lowlink[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(adjacency.get(successor, ()))))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def lineage(adjacency):
+    """
+    Computes, for every node of a graph of upstream edges, its depth (the longest chain of edges to a root),
+    its roots (the reachable nodes without upstream edges) and whether it lies on a cycle.
+
+    Each strongly connected component is visited once, after the components upstream of it, so the
+    traversal is linear in the edges; a cycle counts as a single step of the depth.
+
+    Returns:
+        dict: (depth, roots, in_cycle) per node, where roots is a frozenset shared between nodes when possible.
+    """
+    result = {}
+    for component in strongly_connected_components(adjacency):
+        members = set(component)
+        cyclic = len(component) > 1 or component[0] in adjacency.get(component[0], ())
+        upstream = {successor for node in component for successor in adjacency.get(node, ()) if successor not in members}
+        if upstream:
+            depth = 1 + max(result[node][0] for node in upstream)
+            root_sets = {result[node][1] for node in upstream}
+            roots = root_sets.pop() if len(root_sets) == 1 else frozenset().union(*root_sets)
+        else:
+            # A cycle without upstream edges is its own root
+            depth = 1 if cyclic else 0
+            roots = frozenset(component)
+        for node in component:
+            result[node] = (depth, roots, cyclic)
+    return result
+
+
+class ProvenanceIndex:
+    """
+    The adjacency indexes of the PROV and RDFS relations of a catalog, built once.
+
+    The lineage of an entity follows prov:wasDerivedFrom to its sources, and prov:wasGeneratedBy to the
+    activity that generated it and from there prov:used to its inputs; rdfs:subClassOf edges form the
+    class hierarchy, traversed in the same way.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+    """
+
+    def __init__(self, rdf_data):
+        graph = load_graph(rdf_data)
+        self.derived_from = _adjacency(graph, prov.wasDerivedFrom)
+        self.generated_by = _adjacency(graph, prov.wasGeneratedBy)
+        self.used = _adjacency(graph, prov.used)
+        self.associated_with = _adjacency(graph, prov.wasAssociatedWith)
+        self.subclass_of = _adjacency(graph, RDFS.subClassOf)
+        self.has_subproperties = next(iter(graph.triples((None, RDFS.subPropertyOf, None))), None) is not None
+        self.entities = set(graph.subjects(RDF.type, prov.Entity))
+        self.activities = set(graph.subjects(RDF.type, prov.Activity))
+        self.datasets = list(dict.fromkeys(graph.subjects(RDF.type, dcat.Dataset)))
+
+        # Upstream entities of each entity: its sources, and the inputs of the activities that generated it
+        self.upstream = {entity: dict(sources) for entity, sources in self.derived_from.items()}
+        for entity, activities in self.generated_by.items():
+            inputs = self.upstream.setdefault(entity, {})
+            for activity in activities:
+                inputs.update(self.used.get(activity, {}))
+
+    def indicators(self):
+        """
+        Returns the six indicators of check_lineage_provenance, in the order of lineage_provenance_score.
+        """
+        has_subclasses = bool(self.subclass_of)
+        return (
+            has_subclasses or self.has_subproperties,
+            has_subclasses,
+            has_subclasses,
+            bool(self.entities),
+            any(activity in self.used for activity in self.activities),
+            any(activity in self.associated_with for activity in self.activities),
+        )
+
+    def agents(self, entity):
+        """
+        Returns the agents associated with the activities that generated an entity.
+        """
+        return {agent for activity in self.generated_by.get(entity, ()) for agent in self.associated_with.get(activity, ())}
+
+
+@instrumented("provenance_report")
+def provenance_report(rdf_data, max_roots=MAX_ROOTS):
+    """
+    Measures how deep and complete the lineage of every dataset is.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+        max_roots (int): The number of roots listed per dataset.
+
+    Returns:
+        dict: A summary (datasets with lineage, their mean and maximum depth, datasets on a cycle, distinct
+            roots, datasets generated by an activity with an agent, and the depth and cycles of the class
+            hierarchy), and per dataset its lineage depth, number of roots, first roots, whether it lies on
+            a derivation cycle, and its agents.
+    """
+    index = ProvenanceIndex(rdf_data)
+    entities = lineage(index.upstream)
+    classes = lineage(index.subclass_of)
+
+    datasets = {}
+    for dataset in index.datasets:
+        depth, roots, cyclic = entities.get(dataset, (0, frozenset(), False))
+        if not depth:
+            roots = frozenset()
+        datasets[str(dataset)] = {
+            "depth": depth,
+            "roots": len(roots),
+            "root_sources": sorted(str(root) for root in roots)[:max_roots],
+            "in_cycle": cyclic,
+            "agents": sorted(str(agent) for agent in index.agents(dataset)),
+        }
+
+    depths = [dataset["depth"] for dataset in datasets.values() if dataset["depth"]]
+    all_roots = set()
+    for dataset in index.datasets:
+        depth, roots, _ = entities.get(dataset, (0, frozenset(), False))
+        if depth:
+            all_roots.update(roots)
+    class_components = {roots for depth, roots, cyclic in classes.values() if cyclic}
+    summary = {
+        "datasets": len(datasets),
+        "with_lineage": len(depths),
+        "mean_depth": sum(depths) / len(depths) if depths else 0,
+        "max_depth": max(depths, default=0),
+        "in_cycle": sum(1 for dataset in datasets.values() if dataset["in_cycle"]),
+        "root_sources": len(all_roots),
+        "with_agents": sum(1 for dataset in datasets.values() if dataset["agents"]),
+        "class_hierarchy_depth": max((depth for depth, _, _ in classes.values()), default=0),
+        "class_cycles": len(class_components),
+    }
+    return {"summary": summary, "datasets": datasets}
+
+
+"""
+This program reports the lineage depth, root sources and derivation cycles of the datasets of a Data Catalog.
+
+Usage: python provenance_engine.py filepath [--datasets]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Reports the lineage of the datasets of a Data Catalog.")
+    parser.add_argument("filepath", help="The Data Catalog in Turtle format.")
+    parser.add_argument("--datasets", action="store_true", help="Print the lineage of every dataset as JSON too.")
+    args = parser.parse_args()
+
+    try:
+        with open(args.filepath, "r", encoding="utf-8") as f:
+            rdf_data = f.read()
+        report = provenance_report(rdf_data)
+        print(json.dumps(report if args.datasets else report["summary"], indent=2))
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import re
+import sys
+import time
+import argparse
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from instrumentation import phase, count
+
+# Language of the hyphenation dictionary, as textstat uses by default
+LANGUAGE = "en_US"
+
+# Distinct words whose syllable counts are kept; the vocabulary of a catalog is far smaller than its texts
+WORD_CACHE_SIZE = 2 ** 18
+
+# Distinct texts from which the features are extracted in several processes
+PARALLEL_TEXTS = 20000
+
+# Texts sent to a worker process at once
+CHUNK_SIZE = 2000
+
+# Grade formulas, computed exactly as textstat 0.7.3 does for English texts
+FORMULAS = ("flesch_kincaid_grade", "flesch_reading_ease", "coleman_liau_index", "automated_readability_index", "smog_index")
+
+# Counts extracted from each text, from which every formula is computed
+FEATURES = ("words", "sentences", "syllables", "characters", "letters", "polysyllables")
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SENTENCE = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+
+# Three tokens that keep a word character once punctuation is removed, possibly with punctuation-only tokens between them
+_THREE_WORDS = re.compile(r"(?:\S*\w\S*\s+(?:[^\w\s]+\s+)*){2}\S*\w")
+
+
+@lru_cache(maxsize=None)
+def _pyphen():
+    from pyphen import Pyphen
+    return Pyphen(lang=LANGUAGE)
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def word_syllables(word):
+    """
+    Counts the syllables of a lowercase word without punctuation, as textstat does with pyphen.
+    """
+    return len(_pyphen().positions(word)) + 1
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def _is_polysyllable(token):
+    # A whitespace-separated token of the raw text, as textstat's polysyllable count sees it
+    return sum(map(word_syllables, _PUNCTUATION.sub("", token.lower()).split())) >= 3
+
+
+def _is_short(sentence):
+    # textstat leaves sentences of at most two words out of the sentence count
+    return _THREE_WORDS.search(sentence) is None
+
+
+def _features(text):
+    """
+    Extracts the counts of one text, following textstat's tokenization.
+    """
+    tokens = text.split()
+    cleaned = _PUNCTUATION.sub("", text)
+    sentences = _SENTENCE.findall(text)
+    short = sum(map(_is_short, sentences))
+    syllables = sum(map(word_syllables, _PUNCTUATION.sub("", text.lower()).split()))
+    characters = sum(map(len, tokens))
+    # Removing punctuation leaves whitespace alone, so the letters are what remains besides it
+    letters = len(cleaned) - (len(text) - characters)
+    polysyllables = sum(map(_is_polysyllable, tokens))
+    return len(cleaned.split()), max(1, len(sentences) - short), syllables, characters, letters, polysyllables
+
+
+def _features_chunk(texts):
+    return [_features(text) for text in texts]
+
+
+def text_features(texts, workers=None):
+    """
+    Extracts the word, sentence, syllable, character, letter and polysyllable counts of a batch of texts,
+    once per distinct text. Batches of more than PARALLEL_TEXTS distinct texts are spread over processes.
+
+    Args:
+        texts (iterable): The texts or RDF literals.
+        workers (int): The number of processes for large batches; defaults to the number of cores, 1 disables them.
+
+    Returns:
+        dict: An integer array per feature, aligned with the texts.
+    """
+    with phase("text_analysis"):
+        texts = [str(text) for text in texts]
+        distinct = list(dict.fromkeys(texts))
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(distinct) > PARALLEL_TEXTS:
+            chunks = [distinct[start:start + CHUNK_SIZE] for start in range(0, len(distinct), CHUNK_SIZE)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rows = [row for chunk in executor.map(_features_chunk, chunks) for row in chunk]
+        else:
+            rows = _features_chunk(distinct)
+        table = np.array(rows, dtype=np.int64).reshape(len(distinct), len(FEATURES))
+        index = {text: position for position, text in enumerate(distinct)}
+        table = table[np.fromiter((index[text] for text in texts), dtype=np.int64, count=len(texts))]
+    count("texts", len(texts))
+    count("distinct_texts", len(distinct))
+    return {name: table[:, column] for column, name in enumerate(FEATURES)}
+
+
+def _round(values, points):
+    # textstat's legacy rounding: half away from zero
+    scale = 10 ** points
+    return np.floor(values * scale + np.copysign(0.5, values)) / scale
+
+
+def _ratio(numerators, denominators):
+    # textstat returns 0 where a ratio would divide by zero
+    return np.divide(numerators, denominators, out=np.zeros(len(numerators)), where=denominators != 0)
+
+
+def grades(features, formula="flesch_kincaid_grade"):
+    """
+    Computes a readability formula over every text at once from its features.
+
+    Args:
+        features (dict): The arrays returned by text_features.
+        formula (str): One of FORMULAS.
+
+    Returns:
+        numpy.ndarray: The grade of each text, equal to textstat's.
+    """
+    words = features["words"]
+    sentences = features["sentences"]
+    sentence_length = _round(words / sentences, 1)
+    syllables_per_word = _round(_ratio(features["syllables"], words), 1)
+    if formula == "flesch_kincaid_grade":
+        return _round(0.39 * sentence_length + 11.8 * syllables_per_word - 15.59, 1)
+    if formula == "flesch_reading_ease":
+        return _round(206.835 - 1.015 * sentence_length - 84.6 * syllables_per_word, 2)
+    if formula == "coleman_liau_index":
+        letters = _round(_round(_ratio(features["letters"], words), 2) * 100, 2)
+        sentences_per_word = _round(_round(_ratio(sentences, words), 2) * 100, 2)
+        return _round(0.058 * letters - 0.296 * sentences_per_word - 15.8, 2)
+    if formula == "automated_readability_index":
+        index = _round(4.71 * _round(_ratio(features["characters"], words), 2) + 0.5 * _round(words / sentences, 2) - 21.43, 1)
+        return np.where(words > 0, index, 0.0)
+    if formula == "smog_index":
+        smog = _round(1.043 * (30 * (features["polysyllables"] / sentences)) ** .5 + 3.1291, 1)
+        return np.where(sentences >= 3, smog, 0.0)
+    raise ValueError(f"Invalid readability formula: {formula}")
+
+
+def readability_scores(texts, formulas=("flesch_kincaid_grade",), workers=None):
+    """
+    Scores a batch of texts with several readability formulas, extracting their features once.
+
+    Returns:
+        dict: The array of grades of each formula, aligned with the texts.
+    """
+    features = text_features(texts, workers)
+    return {formula: grades(features, formula) for formula in formulas}
+
+
+def flesch_kincaid_grades(texts, workers=None):
+    """
+    Calculates the Flesch-Kincaid grade of a batch of texts, as textstat.flesch_kincaid_grade would.
+
+    Returns:
+        list: The grade of each text, in order.
+    """
+    return grades(text_features(texts, workers)).tolist()
+
+
+def clear_caches():
+    """
+    Empties the memoized syllable counts.
+    """
+    word_syllables.cache_clear()
+    _is_polysyllable.cache_clear()
+
+
+"""
+This program compares the readability engine with textstat on the titles and descriptions of a synthetic catalog.
+
+Usage: python readability_engine.py [datasets] [--workers N] [--skip-textstat]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Compare the readability engine with textstat on a synthetic catalog.")
+    parser.add_argument("datasets", type=int, nargs="?", default=10000, help="Number of datasets of the synthetic catalog")
+    parser.add_argument("--workers", type=int, help="Processes for large batches (default: the number of cores)")
+    parser.add_argument("--skip-textstat", action="store_true", help="Do not time textstat, which is slow on large catalogs")
+    args = parser.parse_args()
+
+    try:
+        from generate_catalog import generate_catalog
+        from catalog_loader import load_graph
+        from check_readability import dataset_texts
+        graph = load_graph(generate_catalog(args.datasets, distributions=0))
+        texts = [text for _, text in dataset_texts(graph)]
+        print(f"{len(texts)} texts, {len(set(map(str, texts)))} distinct.")
+
+        start = time.perf_counter()
+        engine = readability_scores(texts, FORMULAS, args.workers)
+        print(f"Engine: {time.perf_counter() - start:.2f}s for {len(FORMULAS)} formulas.")
+
+        if not args.skip_textstat:
+            import textstat
+            start = time.perf_counter()
+            reference = [textstat.flesch_kincaid_grade(str(text)) for text in texts]
+            print(f"textstat: {time.perf_counter() - start:.2f}s for the Flesch-Kincaid grade.")
+            mismatches = sum(1 for a, b in zip(reference, engine["flesch_kincaid_grade"]) if a != b)
+            print(f"Grades that differ from textstat: {mismatches}.")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
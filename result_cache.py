@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import ast
+import json
+import time
+import sqlite3
+import hashlib
+import functools
+import importlib
+import inspect
+from graph_cache import content_key
+
+# SQLite file of the result cache; when set, memoized checks reuse the results of catalogs scored before
+RESULT_CACHE_ENV = "DATAQ_RESULT_CACHE"
+
+# Bumped whenever the layout of the cached keys or values changes
+FORMAT_VERSION = 1
+
+MAX_ENTRIES = 100000
+
+# Checks whose results depend on the clock or the network rather than only on the catalog, and are never cached
+VOLATILE_CHECKS = ["accuracy", "timeliness", "scalability"]
+
+_result_cache = None
+
+_REPOSITORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def _imported_sources(path):
+    # The files of the modules of this repository imported by a file, including the imports made inside
+    # functions to keep heavy dependencies lazy
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        else:
+            continue
+        for name in names:
+            source = os.path.join(_REPOSITORY, name.replace(".", os.sep) + ".py")
+            if os.path.isfile(source):
+                yield source
+
+
+def _local_sources(module):
+    # The module's own file and the files of the modules of this repository it depends on, directly or not
+    paths = {os.path.abspath(module.__file__)}
+    pending = list(paths)
+    while pending:
+        for source in _imported_sources(pending.pop()):
+            if source not in paths:
+                paths.add(source)
+                pending.append(source)
+    return sorted(paths)
+
+
+@functools.lru_cache(maxsize=None)
+def implementation_version(module_name, adapter=None):
+    """
+    Returns the version tag of a check: a digest of the source of its module and of the modules of this
+    repository it depends on, so that editing one check invalidates only the results that depend on it.
+
+    Args:
+        module_name (str): The module of the check, e.g. 'check_completeness'.
+        adapter (callable): An optional function through which the check is called, e.g. one of the
+            adapters of check_all, whose source is part of the tag as well.
+
+    Returns:
+        str: The version tag.
+    """
+    digest = hashlib.sha256(f"v{FORMAT_VERSION}".encode("utf-8"))
+    for path in _local_sources(importlib.import_module(module_name)):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    if adapter is not None:
+        digest.update(inspect.getsource(adapter).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def result_key(content_digest, check, params, version):
+    """
+    Returns the key of a result: the catalog's content hash, the check, its parameters and its version tag.
+
+    Args:
+        content_digest (str): The SHA-256 of the catalog, as graph_cache.content_key returns it.
+        check (str): The name of the check.
+        params (list or dict): The JSON-serializable parameters of the check.
+        version (str): The implementation version of the check.
+
+    Returns:
+        str: The hexadecimal key.
+    """
+    payload = json.dumps([content_digest, check, params, version], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk store of check results, keyed by result_key and held as JSON.
+
+    Args:
+        path (str): The SQLite file holding the cache.
+        max_entries (int): The number of entries kept; the least recently used ones are evicted first.
+    """
+
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, check_name TEXT, version TEXT, value TEXT, accessed_at REAL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)")
+        self.connection.commit()
+
+    def get(self, key):
+        """
+        Looks up a result and marks it as recently used.
+
+        Returns:
+            tuple: Whether the result was found, and the result.
+        """
+        row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        self.connection.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self.connection.commit()
+        return True, json.loads(row[0])
+
+    def put(self, key, check, version, value):
+        """
+        Stores a result, then evicts entries beyond max_entries.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (key, check_name, version, value, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, check, version, json.dumps(value, default=str), time.time()),
+        )
+        self.evict()
+        self.connection.commit()
+
+    def get_or_compute(self, check, version, content_digest, params, compute):
+        """
+        Returns the cached result of a check, or computes and stores it.
+
+        Args:
+            check (str): The name of the check.
+            version (str): The implementation version of the check.
+            content_digest (str): The SHA-256 of the catalog.
+            params (list or dict): The parameters of the check.
+            compute (callable): Computes the result on a miss.
+        """
+        key = result_key(content_digest, check, params, version)
+        found, value = self.get(key)
+        if not found:
+            value = compute()
+            self.put(key, check, version, value)
+        return value
+
+    def evict(self):
+        """
+        Removes the least recently used entries so that at most max_entries remain.
+        """
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count > self.max_entries:
+            self.connection.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self, check=None):
+        """
+        Removes every entry, or those of one check.
+        """
+        if check is None:
+            self.connection.execute("DELETE FROM results")
+        else:
+            self.connection.execute("DELETE FROM results WHERE check_name = ?", (check,))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def configure_result_cache(path, max_entries=None):
+    """
+    Enables the result cache for every memoized check, or disables it.
+
+    Args:
+        path (str): The SQLite file of the cache, or None to disable it.
+        max_entries (int): The number of entries kept.
+    """
+    global _result_cache
+    if _result_cache is not None:
+        _result_cache.close()
+    _result_cache = ResultCache(path, max_entries or MAX_ENTRIES) if path is not None else None
+
+
+def get_result_cache():
+    return _result_cache
+
+
+def memoized(function):
+    """
+    Caches the results of a check called with a catalog's content in the configured result cache.
+
+    Calls with an already-parsed graph, or with no cache configured, run the check as usual. The
+    remaining arguments must be JSON-serializable; they are part of the key, with the check's version.
+    """
+    @functools.wraps(function)
+    def wrapper(rdf_data, *args, **kwargs):
+        if _result_cache is None or not isinstance(rdf_data, (str, bytes)):
+            return function(rdf_data, *args, **kwargs)
+        return _result_cache.get_or_compute(
+            f"{function.__module__}.{function.__name__}", implementation_version(function.__module__),
+            content_key(rdf_data), [args, kwargs], lambda: function(rdf_data, *args, **kwargs),
+        )
+    return wrapper
+
+
+if os.environ.get(RESULT_CACHE_ENV):
+    configure_result_cache(os.environ[RESULT_CACHE_ENV])
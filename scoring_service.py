@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import importlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from check_all import CHECKS, run_checks
+from catalog_loader import load_catalog_file
+
+HOST = "127.0.0.1"
+PORT = 8750
+
+# Requests scored at once; further requests wait in the pool's queue
+WORKERS = 4
+
+# Estimated memory of the parsed catalogs kept warm, before the least recently used ones are dropped
+MAX_BYTES = 1024 * 1024 * 1024
+
+# Approximate memory of one triple in an rdflib in-memory graph, measured with tracemalloc on generated catalogs
+BYTES_PER_TRIPLE = 1300
+
+
+class GraphLRU:
+    """
+    The parsed catalogs kept in memory, keyed by their real path, modification time and size, so that an
+    edited file is parsed again. The least recently used graphs are dropped once their estimated memory
+    exceeds max_bytes. A catalog requested by several threads at once is parsed only once.
+
+    Args:
+        max_bytes (int): The estimated memory of the graphs kept warm.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.graphs = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, path):
+        """
+        Returns the graph of a catalog file, parsing it on a miss.
+
+        Returns:
+            tuple: The rdflib.Graph and whether it was already warm.
+        """
+        stat = os.stat(path)
+        key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self.graphs.get(key)
+            if entry is not None:
+                self.graphs.move_to_end(key)
+                self.hits += 1
+                return entry[0], True
+            self.misses += 1
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            with self._lock:
+                entry = self.graphs.get(key)
+            if entry is not None:
+                return entry[0], True
+            try:
+                graph = load_catalog_file(path)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            with self._lock:
+                # Older versions of the same file are never requested again
+                for stale in [other for other in self.graphs if other[0] == key[0]]:
+                    self.bytes -= self.graphs.pop(stale)[1]
+                size = len(graph) * BYTES_PER_TRIPLE
+                self.graphs[key] = (graph, size)
+                self.bytes += size
+                while self.bytes > self.max_bytes and len(self.graphs) > 1:
+                    self.bytes -= self.graphs.popitem(last=False)[1][1]
+        return graph, False
+
+    def stats(self):
+        with self._lock:
+            return {"graphs": len(self.graphs), "estimated_bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+
+class ScoringService:
+    """
+    Scores catalog files against warm graphs in a pool of worker threads.
+
+    Threads share the parsed graphs, which a process pool could not; the checks only read them.
+
+    Args:
+        workers (int): The number of requests scored at once.
+        max_bytes (int): The estimated memory of the graphs kept warm.
+    """
+
+    def __init__(self, workers=WORKERS, max_bytes=MAX_BYTES):
+        self.graphs = GraphLRU(max_bytes)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def preload(self):
+        """
+        Imports every check module up front, so that no request pays for rdflib plugins, nltk or textstat.
+        """
+        for name in CHECKS:
+            importlib.import_module(f"check_{name}")
+
+    def score(self, path, checks=None, property_set="dcat", entity_types=None, other=None):
+        """
+        Runs the quality checks against a catalog file, as check_all does.
+
+        Returns:
+            dict: The report of run_checks with the catalog path, whether its graph was warm, and the elapsed seconds.
+        """
+        start_time = time.perf_counter()
+        graph, warm = self.graphs.get(path)
+        other_graph = self.graphs.get(other)[0] if other else None
+        report = run_checks(graph, checks, property_set, entity_types, other_graph)
+        with self._lock:
+            self.requests += 1
+        return {"catalog": path, "warm": warm, **report, "seconds": time.perf_counter() - start_time}
+
+    def submit(self, *args, **kwargs):
+        return self.executor.submit(self.score, *args, **kwargs)
+
+    def stats(self):
+        return {"requests": self.requests, **self.graphs.stats()}
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """
+    GET /health, GET /stats and GET /checks describe the service; POST /score takes a JSON object with
+    'path' and optionally 'checks', 'property_set', 'entity_types' and 'other', and returns the report.
+    """
+
+    def _reply(self, status, body):
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._reply(200, self.server.service.stats())
+        elif self.path == "/checks":
+            self._reply(200, list(CHECKS))
+        else:
+            self._reply(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._reply(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if "path" not in request:
+                raise ValueError("The request has no catalog 'path'.")
+            future = self.server.service.submit(request["path"], request.get("checks"), request.get("property_set", "dcat"),
+                                                request.get("entity_types"), request.get("other"))
+            self._reply(200, future.result())
+        except FileNotFoundError as e:
+            self._reply(404, {"error": f"File not found: {e.filename}"})
+        except Exception as e:
+            self._reply(400, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """
+    An HTTP server that reads each request in its own thread and scores it in the service's worker pool.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, service):
+        super().__init__(address, ScoringHandler)
+        self.service = service
+
+
+def serve(host=HOST, port=PORT, workers=WORKERS, max_bytes=MAX_BYTES, preload=True):
+    """
+    Creates a scoring server; call serve_forever() on it, and shutdown() then server_close() to stop it.
+
+    Returns:
+        ScoringServer: The server, bound to (host, port); port 0 picks a free port.
+    """
+    service = ScoringService(workers, max_bytes)
+    if preload:
+        service.preload()
+    return ScoringServer((host, port), service)
+
+
+"""
+This program keeps the quality checks and the parsed catalogs warm in a local HTTP service.
+
+Usage: python scoring_service.py [--host 127.0.0.1] [--port 8750] [--workers 4] [--max-megabytes 1024]
+
+       curl -d '{"path": "example001.ttl", "checks": ["completeness", "licensing"]}' http://127.0.0.1:8750/score
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Serves the quality checks against warm, parsed Data Catalogs.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Requests scored at once.")
+    parser.add_argument("--max-megabytes", type=int, default=MAX_BYTES // 2 ** 20, help="Estimated memory of the graphs kept warm.")
+    args = parser.parse_args()
+
+    try:
+        server = serve(args.host, args.port, args.workers, args.max_megabytes * 2 ** 20)
+        print(f"Scoring service listening on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            server.service.close()
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
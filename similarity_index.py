@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import random
+import sqlite3
+import hashlib
+from itertools import combinations
+import numpy as np
+from rdflib import Namespace
+from catalog_loader import load_catalog_file
+from check_similarity import jaccard_similarity
+from text_analysis import token_sets
+
+# Define some RDF prefixes
+dcat = Namespace("http://www.w3.org/ns/dcat#")
+dct = Namespace("http://purl.org/dc/terms/")
+
+# Titles and descriptions whose tokens describe a catalog
+TEXT_PREDICATES = [dcat.title, dcat.description, dct.title, dct.description]
+
+# Permutations are (a * x + b) mod p over 32-bit token hashes; a < 2**31 keeps a * x + b below 2**64
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def catalog_tokens(catalog):
+    """
+    Returns the preprocessed token set of all titles and descriptions of a catalog.
+
+    Args:
+        catalog (str or rdflib.Graph): The path to a Turtle catalog file, or an already-parsed graph.
+
+    Returns:
+        set: The union of the preprocessed tokens.
+    """
+    graph = load_catalog_file(catalog) if isinstance(catalog, str) else catalog
+    tokens = set()
+    for predicate in TEXT_PREDICATES:
+        for text_tokens in token_sets(graph.objects(predicate=predicate)):
+            tokens |= text_tokens
+    return tokens
+
+
+class SimilarityIndex:
+    """
+    Persistent MinHash/LSH index of catalog token sets, stored in an SQLite file.
+
+    Each catalog is summarized by a MinHash signature of num_perm values, split into bands that are
+    hashed into buckets. Catalogs sharing a bucket in any band are candidates, and their Jaccard
+    similarity is estimated from the fraction of equal signature values.
+
+    Args:
+        path (str): The SQLite file holding the index.
+        num_perm (int): The number of hash permutations per signature.
+        bands (int): The number of LSH bands; num_perm must be a multiple of it.
+        seed (int): The seed of the hash permutations.
+    """
+
+    def __init__(self, path, num_perm=128, bands=32, seed=1):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value INTEGER)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS catalogs (id INTEGER PRIMARY KEY, name TEXT UNIQUE, tokens INTEGER, signature BLOB)"
+        )
+        self.connection.execute("CREATE TABLE IF NOT EXISTS buckets (band INTEGER, bucket INTEGER, catalog_id INTEGER)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS buckets_band_bucket ON buckets (band, bucket)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS buckets_catalog_id ON buckets (catalog_id)")
+
+        # An existing index keeps the settings it was built with
+        settings = dict(self.connection.execute("SELECT name, value FROM settings"))
+        if not settings:
+            settings = {"num_perm": num_perm, "bands": bands, "seed": seed}
+            self.connection.executemany("INSERT INTO settings VALUES (?, ?)", settings.items())
+        self.connection.commit()
+        self.num_perm = settings["num_perm"]
+        self.bands = settings["bands"]
+        if self.num_perm % self.bands:
+            raise ValueError(f"num_perm ({self.num_perm}) must be a multiple of bands ({self.bands})")
+        self.rows = self.num_perm // self.bands
+
+        rng = np.random.RandomState(settings["seed"])
+        self._a = rng.randint(1, 1 << 31, size=self.num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=self.num_perm).astype(np.uint64)
+
+    def signature(self, tokens):
+        """
+        Computes the MinHash signature of a token set.
+
+        Args:
+            tokens (set): The token set.
+
+        Returns:
+            numpy.ndarray: num_perm unsigned 32-bit values.
+        """
+        if not tokens:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little") for token in tokens),
+            dtype=np.uint64,
+            count=len(tokens),
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _buckets(self, signature):
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            yield band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True)
+
+    def add(self, name, tokens):
+        """
+        Adds a catalog to the index, replacing any previous entry with the same name.
+
+        Args:
+            name (str): The name of the catalog, usually its path.
+            tokens (set): The catalog's preprocessed token set.
+        """
+        self._add(name, tokens)
+        self.connection.commit()
+
+    def add_many(self, catalogs):
+        """
+        Adds many catalogs to the index in a single transaction.
+
+        Args:
+            catalogs (iterable): (name, tokens) tuples.
+        """
+        for name, tokens in catalogs:
+            self._add(name, tokens)
+        self.connection.commit()
+
+    def _add(self, name, tokens):
+        self._remove(name)
+        signature = self.signature(tokens)
+        cursor = self.connection.execute(
+            "INSERT INTO catalogs (name, tokens, signature) VALUES (?, ?, ?)", (name, len(tokens), signature.tobytes())
+        )
+        catalog_id = cursor.lastrowid
+        self.connection.executemany(
+            "INSERT INTO buckets (band, bucket, catalog_id) VALUES (?, ?, ?)",
+            [(band, bucket, catalog_id) for band, bucket in self._buckets(signature)],
+        )
+
+    def add_catalog(self, path):
+        """
+        Parses a catalog file and adds its titles and descriptions to the index under its path.
+        """
+        self.add(path, catalog_tokens(path))
+
+    def remove(self, name):
+        """
+        Removes a catalog from the index, if present.
+        """
+        self._remove(name)
+        self.connection.commit()
+
+    def _remove(self, name):
+        row = self.connection.execute("SELECT id FROM catalogs WHERE name = ?", (name,)).fetchone()
+        if row is not None:
+            self.connection.execute("DELETE FROM buckets WHERE catalog_id = ?", row)
+            self.connection.execute("DELETE FROM catalogs WHERE id = ?", row)
+
+    def names(self):
+        """
+        Returns the names of all indexed catalogs.
+        """
+        return [name for (name,) in self.connection.execute("SELECT name FROM catalogs ORDER BY id")]
+
+    def _entry(self, name):
+        row = self.connection.execute("SELECT tokens, signature FROM catalogs WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"Catalog not in the index: {name}")
+        return row[0], np.frombuffer(row[1], dtype=np.uint32)
+
+    @staticmethod
+    def estimate(tokens1, signature1, tokens2, signature2):
+        """
+        Estimates the Jaccard similarity of two catalogs from their signatures; empty token sets score 0.
+        """
+        if tokens1 == 0 or tokens2 == 0:
+            return 0.0
+        return float(np.mean(signature1 == signature2))
+
+    def query(self, tokens, k=10, exclude=None):
+        """
+        Finds the indexed catalogs most similar to a token set, looking only at LSH candidates.
+
+        Args:
+            tokens (set): The token set to compare.
+            k (int): The number of catalogs to return.
+            exclude (str): The name of a catalog to leave out, typically the queried catalog itself.
+
+        Returns:
+            list: Up to k (name, estimated Jaccard similarity) tuples, most similar first.
+        """
+        signature = self.signature(tokens)
+        candidates = set()
+        for band, bucket in self._buckets(signature):
+            candidates.update(
+                row for row in self.connection.execute(
+                    "SELECT c.name, c.tokens, c.signature FROM buckets b JOIN catalogs c ON c.id = b.catalog_id "
+                    "WHERE b.band = ? AND b.bucket = ?",
+                    (band, bucket),
+                )
+            )
+        results = [
+            (name, self.estimate(len(tokens), signature, count, np.frombuffer(blob, dtype=np.uint32)))
+            for name, count, blob in candidates
+            if name != exclude
+        ]
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results[:k]
+
+    def query_catalog(self, name, k=10):
+        """
+        Finds the catalogs most similar to an indexed catalog.
+        """
+        tokens, signature = self._entry(name)
+        candidates = self.connection.execute(
+            "SELECT DISTINCT c.name, c.tokens, c.signature FROM buckets q "
+            "JOIN buckets b ON b.band = q.band AND b.bucket = q.bucket "
+            "JOIN catalogs c ON c.id = b.catalog_id "
+            "WHERE q.catalog_id = (SELECT id FROM catalogs WHERE name = ?) AND c.name != ?",
+            (name, name),
+        )
+        results = [
+            (other, self.estimate(tokens, signature, count, np.frombuffer(blob, dtype=np.uint32)))
+            for other, count, blob in candidates
+        ]
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results[:k]
+
+    def similar_pairs(self, threshold=0.5):
+        """
+        Finds all pairs of indexed catalogs whose estimated Jaccard similarity reaches a threshold.
+
+        Only catalogs sharing an LSH bucket are compared.
+
+        Returns:
+            list: (name1, name2, estimated Jaccard similarity) tuples, most similar first.
+        """
+        pairs = self.connection.execute(
+            "SELECT DISTINCT a.catalog_id, b.catalog_id FROM buckets a "
+            "JOIN buckets b ON a.band = b.band AND a.bucket = b.bucket AND a.catalog_id < b.catalog_id"
+        ).fetchall()
+        entries = {}
+        for catalog_id in {catalog_id for pair in pairs for catalog_id in pair}:
+            name, count, blob = self.connection.execute(
+                "SELECT name, tokens, signature FROM catalogs WHERE id = ?", (catalog_id,)
+            ).fetchone()
+            entries[catalog_id] = (name, count, np.frombuffer(blob, dtype=np.uint32))
+        results = []
+        for id1, id2 in pairs:
+            name1, count1, signature1 = entries[id1]
+            name2, count2, signature2 = entries[id2]
+            similarity = self.estimate(count1, signature1, count2, signature2)
+            if similarity >= threshold:
+                results.append((name1, name2, similarity))
+        results.sort(key=lambda result: (-result[2], result[0], result[1]))
+        return results
+
+    def verify(self, token_sets, sample_size=100, seed=0):
+        """
+        Compares estimated and exact Jaccard similarities on a sample of indexed catalog pairs.
+
+        Args:
+            token_sets (dict): The exact token set of each catalog to sample from, keyed by name.
+            sample_size (int): The number of pairs to compare.
+            seed (int): The seed of the sample.
+
+        Returns:
+            dict: The number of pairs compared and the mean and maximum absolute errors.
+        """
+        pairs = list(combinations(sorted(token_sets), 2))
+        sample = random.Random(seed).sample(pairs, min(sample_size, len(pairs)))
+        errors = []
+        for name1, name2 in sample:
+            tokens1, signature1 = self._entry(name1)
+            tokens2, signature2 = self._entry(name2)
+            estimated = self.estimate(tokens1, signature1, tokens2, signature2)
+            exact = jaccard_similarity(token_sets[name1], token_sets[name2])
+            errors.append(abs(estimated - exact))
+        return {
+            "pairs": len(errors),
+            "mean_absolute_error": sum(errors) / len(errors) if errors else 0.0,
+            "max_absolute_error": max(errors, default=0.0),
+        }
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+"""
+This program maintains a MinHash/LSH index of catalogs and finds similar catalogs across a large corpus.
+
+Usage:
+    python similarity_index.py index.sqlite add catalog.ttl [catalog.ttl ...]
+    python similarity_index.py index.sqlite query catalog.ttl [k]
+    python similarity_index.py index.sqlite pairs [threshold]
+    python similarity_index.py index.sqlite verify [sample_size]
+"""
+def main():
+    usage = "Usage: python similarity_index.py index.sqlite add|query|pairs|verify [arguments]"
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    index_path, command, arguments = sys.argv[1], sys.argv[2], sys.argv[3:]
+    try:
+        with SimilarityIndex(index_path) as index:
+            if command == "add":
+                index.add_many((path, catalog_tokens(path)) for path in arguments)
+                print(f"Indexed {len(arguments)} catalogs.")
+            elif command == "query" and arguments:
+                k = int(arguments[1]) if len(arguments) > 1 else 10
+                for name, similarity in index.query(catalog_tokens(arguments[0]), k, exclude=arguments[0]):
+                    print(f"{similarity * 100:.1f}%  {name}")
+            elif command == "pairs":
+                threshold = float(arguments[0]) if arguments else 0.5
+                for name1, name2, similarity in index.similar_pairs(threshold):
+                    print(f"{similarity * 100:.1f}%  {name1}  {name2}")
+            elif command == "verify":
+                sample_size = int(arguments[0]) if arguments else 100
+                # Exact similarities need the token sets, so only a sample of catalogs is reparsed
+                names = index.names()
+                names = random.Random(0).sample(names, min(len(names), sample_size + 1))
+                result = index.verify({name: catalog_tokens(name) for name in names}, sample_size)
+                print(f"Compared {result['pairs']} pairs: mean absolute error {result['mean_absolute_error']:.4f}, "
+                      f"max absolute error {result['max_absolute_error']:.4f}.")
+            else:
+                print(usage)
+                sys.exit(1)
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import numpy as np
+from scipy import sparse
+
+# Rows of the first side multiplied at once, which bounds the memory of the intersection matrix
+BLOCK_ROWS = 2048
+
+
+def _document_term_matrix(token_sets, vocabulary):
+    """
+    Builds the sparse binary document-term matrix of a list of token sets, extending the shared vocabulary.
+    """
+    indptr = [0]
+    indices = []
+    for tokens in token_sets:
+        for token in tokens:
+            index = vocabulary.get(token)
+            if index is None:
+                index = vocabulary[token] = len(vocabulary)
+            indices.append(index)
+        indptr.append(len(indices))
+    return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64)
+
+
+def mean_jaccard_similarity(sets1, sets2, block_rows=BLOCK_ROWS):
+    """
+    Calculates the mean Jaccard similarity over every pair of sets from two lists.
+
+    Intersection sizes come from one sparse product of the document-term matrices, and unions
+    are derived from their row sums, so no set operation is run per pair. Pairs that share no
+    token contribute 0, as do pairs of empty sets.
+
+    Args:
+        sets1 (list): The first list of sets.
+        sets2 (list): The second list of sets.
+        block_rows (int): Rows of the first matrix multiplied at once.
+
+    Returns:
+        float: The mean of jaccard_similarity(set1, set2) over all pairs, or 0.0 if either list is empty.
+    """
+    if not sets1 or not sets2:
+        return 0.0
+
+    vocabulary = {}
+    indptr1, indices1 = _document_term_matrix(sets1, vocabulary)
+    indptr2, indices2 = _document_term_matrix(sets2, vocabulary)
+    vocabulary_size = len(vocabulary)
+    matrix1 = sparse.csr_matrix((np.ones(len(indices1), dtype=np.int32), indices1, indptr1), shape=(len(sets1), vocabulary_size))
+    matrix2 = sparse.csr_matrix((np.ones(len(indices2), dtype=np.int32), indices2, indptr2), shape=(len(sets2), vocabulary_size))
+    sizes1 = np.diff(indptr1)
+    sizes2 = np.diff(indptr2)
+    matrix2_transposed = matrix2.T.tocsr()
+
+    total = 0.0
+    for start in range(0, len(sets1), block_rows):
+        intersections = (matrix1[start:start + block_rows] @ matrix2_transposed).tocoo()
+        unions = sizes1[start + intersections.row] + sizes2[intersections.col] - intersections.data
+        total += float(np.sum(intersections.data / unions))
+    return total / (len(sets1) * len(sets2))
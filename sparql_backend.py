@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import sys
+import math
+import json
+import argparse
+from itertools import chain, repeat
+from rdflib import Graph, URIRef
+from check_completeness import dcat_properties, dct_properties
+from check_timeliness import is_timely
+from check_lineage_provenance import lineage_provenance_score
+
+# Endpoint queried when none is given on the command line
+SPARQL_ENDPOINT_ENV = "DATAQ_SPARQL_ENDPOINT"
+
+PREFIXES = """PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+PREFIX dcat: <http://www.w3.org/ns/dcat#>
+PREFIX dct: <http://purl.org/dc/terms/>
+PREFIX prov: <http://www.w3.org/ns/prov#>
+"""
+
+# Entity types evaluated by the consistency check
+ENTITY_TYPES = {"catalog": "dcat:Catalog", "dataset": "dcat:Dataset", "distribution": "dcat:Distribution"}
+
+# Subjects by entity type, each counted once per type as check_completeness iterates them
+TYPED_SUBJECTS_QUERY = PREFIXES + """
+SELECT (COUNT(*) AS ?subjects) WHERE {
+    VALUES ?type { dcat:Catalog dcat:Dataset dcat:Distribution }
+    ?s rdf:type ?type
+}
+"""
+
+# Those subjects by number of required properties present; subjects with none are left out
+COMPLETENESS_QUERY = PREFIXES + """
+SELECT ?present (COUNT(*) AS ?subjects) WHERE {
+    { SELECT ?s ?type (COUNT(DISTINCT ?p) AS ?present) WHERE {
+        VALUES ?type { dcat:Catalog dcat:Dataset dcat:Distribution }
+        VALUES ?p { %s }
+        ?s rdf:type ?type ; ?p ?o
+    } GROUP BY ?s ?type }
+} GROUP BY ?present
+"""
+
+LICENSING_QUERY = PREFIXES + """
+SELECT ?licenses ?datasets WHERE {
+    { SELECT (COUNT(*) AS ?licenses) WHERE { ?d rdf:type dcat:Dataset ; dct:license ?license } }
+    { SELECT (COUNT(DISTINCT ?d) AS ?datasets) WHERE { ?d rdf:type dcat:Dataset } }
+}
+"""
+
+DUPLICATES_QUERY = PREFIXES + """
+SELECT ?duplicated ?keys WHERE {
+    { SELECT (COUNT(*) AS ?duplicated) WHERE {
+        { SELECT ?o WHERE { VALUES ?p { dcat:title dcat:downloadURL } ?s ?p ?o } GROUP BY ?o HAVING (COUNT(*) > 1) }
+    } }
+    { SELECT (COUNT(DISTINCT ?o) AS ?keys) WHERE { VALUES ?p { dcat:title dcat:downloadURL } ?s ?p ?o } }
+}
+"""
+
+# check_timeliness only looks at the first catalog, whether or not it has a modified date
+TIMELINESS_QUERY = PREFIXES + """
+SELECT ?catalog ?modified WHERE {
+    ?catalog rdf:type dcat:Catalog .
+    OPTIONAL { ?catalog dct:modified ?modified }
+} LIMIT 1
+"""
+
+CONSISTENCY_QUERY = PREFIXES + """
+SELECT ?inconsistent ?pairs WHERE {
+    { SELECT (COUNT(*) AS ?inconsistent) WHERE {
+        { SELECT ?s ?p WHERE { ?s rdf:type %(type)s ; ?p ?o } GROUP BY ?s ?p HAVING (COUNT(*) > 1) }
+    } }
+    { SELECT (COUNT(*) AS ?pairs) WHERE {
+        { SELECT DISTINCT ?s ?p WHERE { ?s rdf:type %(type)s ; ?p ?o } }
+    } }
+}
+"""
+
+LINEAGE_PROVENANCE_QUERY = PREFIXES + """
+SELECT ?lineage ?subclasses ?entities ?sources ?steps WHERE {
+    BIND(EXISTS { ?a rdfs:subClassOf|rdfs:subPropertyOf ?b } AS ?lineage)
+    BIND(EXISTS { ?a rdfs:subClassOf ?b } AS ?subclasses)
+    BIND(EXISTS { ?e rdf:type prov:Entity } AS ?entities)
+    BIND(EXISTS { ?activity rdf:type prov:Activity ; prov:used ?source } AS ?sources)
+    BIND(EXISTS { ?activity rdf:type prov:Activity ; prov:wasAssociatedWith ?agent } AS ?steps)
+}
+"""
+
+
+class SparqlBackend:
+    """
+    Runs the quality checks as SPARQL aggregate queries inside a triple store, so that only
+    counts leave the store instead of the whole catalog.
+
+    Args:
+        endpoint (str): The URL of the SPARQL query endpoint.
+        graph (rdflib.Graph): A graph queried with rdflib's own SPARQL engine instead of an endpoint,
+            e.g. an in-memory catalog or a graph over another rdflib store.
+        graph_uri (str): The named graph holding the catalog at the endpoint; defaults to the default graph.
+    """
+
+    def __init__(self, endpoint=None, graph=None, graph_uri=None):
+        if (endpoint is None) == (graph is None):
+            raise ValueError("Give either a SPARQL endpoint or a graph.")
+        if graph is None:
+            from rdflib.plugins.stores.sparqlstore import SPARQLStore
+            self._store = SPARQLStore(endpoint, returnFormat="json")
+            graph = Graph(store=self._store, identifier=URIRef(graph_uri) if graph_uri else None)
+        else:
+            self._store = None
+        self.graph = graph
+
+    def query(self, query):
+        """
+        Runs a SELECT query.
+
+        Returns:
+            list: The rows, as tuples of RDF terms (None for unbound variables).
+        """
+        return [tuple(row) for row in self.graph.query(query)]
+
+    def _counts(self, query):
+        return [tuple(int(value.toPython()) if value is not None else 0 for value in row) for row in self.query(query)]
+
+    def completeness(self, property_set):
+        """
+        Returns the completeness as check_completeness computes it.
+        """
+        required_properties = dct_properties if property_set == 'dct' else dcat_properties
+        subjects = self._counts(TYPED_SUBJECTS_QUERY)[0][0]
+        if not subjects:
+            return 0
+        rows = self._counts(COMPLETENESS_QUERY % " ".join(f"<{p}>" for p in required_properties))
+        # The same scores as check_completeness, zeros left out, summed exactly as it does
+        scores = chain.from_iterable(repeat(present / len(required_properties) * 100, count) for present, count in rows)
+        return math.fsum(scores) / subjects
+
+    def licensing(self):
+        """
+        Returns the licensing as check_licensing computes it.
+        """
+        licenses, datasets = self._counts(LICENSING_QUERY)[0]
+        if not datasets:
+            return 0
+        return licenses / datasets * 100
+
+    def duplicates(self):
+        """
+        Returns the percentage of duplicates as calculate_duplicates computes it.
+        """
+        duplicated, keys = self._counts(DUPLICATES_QUERY)[0]
+        if not keys:
+            return 0
+        return (duplicated / keys) * 100
+
+    def timeliness(self):
+        """
+        Returns the timeliness as check_timeliness computes it.
+        """
+        rows = self.query(TIMELINESS_QUERY)
+        return is_timely(rows[0][1] if rows else None)
+
+    def consistency(self, entity_type):
+        """
+        Returns the percentage of the (subject, predicate) pairs of an entity type that have several values.
+
+        The denominator counts the pairs of every entity of the type, as check_consistency does.
+        """
+        if entity_type not in ENTITY_TYPES:
+            raise ValueError(f"Invalid entity type: {entity_type}")
+        inconsistent, pairs = self._counts(CONSISTENCY_QUERY % {"type": ENTITY_TYPES[entity_type]})[0]
+        if not pairs:
+            return 0
+        return inconsistent / pairs * 100
+
+    def lineage_provenance(self):
+        """
+        Returns the lineage and provenance score as check_lineage_provenance computes it.
+        """
+        lineage, subclasses, entities, sources, steps = (value.toPython() for value in self.query(LINEAGE_PROVENANCE_QUERY)[0])
+        return lineage_provenance_score(lineage, subclasses, subclasses, entities, sources, steps)
+
+    def report(self, property_set="dcat", entity_types=None):
+        """
+        Runs every metric of the backend.
+
+        Returns:
+            dict: The result of each metric, keyed as in check_all.
+        """
+        return {
+            "completeness": self.completeness(property_set),
+            "licensing": self.licensing(),
+            "duplicates": self.duplicates(),
+            "timeliness": self.timeliness(),
+            "consistency": {entity_type: self.consistency(entity_type) for entity_type in entity_types or ENTITY_TYPES},
+            "lineage_provenance": self.lineage_provenance(),
+        }
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+"""
+This program computes the quality metrics of a Data Catalog inside a triple store, as SPARQL aggregate queries.
+With a file instead of an endpoint, the queries run on rdflib's in-memory SPARQL engine.
+
+Usage: python sparql_backend.py [--endpoint URL | --file catalog.ttl] [--graph-uri URI] [--property-set dcat|dct] [--entity-types catalog,dataset]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Computes the quality metrics of a Data Catalog inside a triple store.")
+    parser.add_argument("--endpoint", default=os.environ.get(SPARQL_ENDPOINT_ENV), help=f"The SPARQL query endpoint (default: ${SPARQL_ENDPOINT_ENV}).")
+    parser.add_argument("--file", help="A Data Catalog in Turtle format, queried in memory instead of an endpoint.")
+    parser.add_argument("--graph-uri", help="The named graph holding the catalog at the endpoint.")
+    parser.add_argument("--property-set", choices=["dcat", "dct"], default="dcat")
+    parser.add_argument("--entity-types", help=f"Comma-separated entity types for consistency ({', '.join(ENTITY_TYPES)}).")
+    args = parser.parse_args()
+
+    if (args.endpoint is None) == (args.file is None):
+        print("Give either --endpoint or --file.")
+        sys.exit(1)
+    entity_types = args.entity_types.split(",") if args.entity_types else None
+
+    try:
+        if args.file:
+            from catalog_loader import load_catalog_file
+            backend = SparqlBackend(graph=load_catalog_file(args.file))
+        else:
+            backend = SparqlBackend(endpoint=args.endpoint, graph_uri=args.graph_uri)
+        with backend:
+            report = backend.report(args.property_set, entity_types)
+        print(json.dumps({"catalog": args.file or args.endpoint, **report}, indent=2, default=str))
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import sys
+import gzip
+from rdflib import RDF, BNode, Namespace
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser, ParseError, r_nodeid, r_tail, r_wspace
+from check_timeliness import is_timely
+
+# Define some RDF prefixes
+dcat = Namespace("http://www.w3.org/ns/dcat#")
+dct = Namespace("http://purl.org/dc/terms/")
+
+# Bits of the per-subject mask: the entity types first, then the properties of both property sets
+TYPE_BITS = {
+    dcat.Catalog: 1 << 0,
+    dcat.Dataset: 1 << 1,
+    dcat.Distribution: 1 << 2,
+}
+PROPERTY_BITS = {
+    dcat.title: 1 << 3,
+    dcat.downloadURL: 1 << 4,
+    dcat.size: 1 << 5,
+    dct.title: 1 << 6,
+    dct.identifier: 1 << 7,
+    dct.description: 1 << 8,
+}
+PROPERTY_SET_MASKS = {
+    "dcat": PROPERTY_BITS[dcat.title] | PROPERTY_BITS[dcat.downloadURL] | PROPERTY_BITS[dcat.size],
+    "dct": PROPERTY_BITS[dct.title] | PROPERTY_BITS[dct.identifier] | PROPERTY_BITS[dct.description],
+}
+
+# Predicates whose objects identify duplicated datasets or distributions, as in calculate_duplicates
+DUPLICATE_PREDICATES = (dcat.title, dcat.downloadURL)
+
+# Marks an object value shared by more than one (subject, predicate) pair
+_DUPLICATE = object()
+
+
+class _LineParser(W3CNTriplesParser):
+    """
+    Parses one N-Triples or N-Quads line at a time, without collecting triples into a graph.
+
+    Blank nodes keep their labels, so no label-to-node mapping grows with the size of the dump.
+    """
+
+    def __init__(self, quads=False):
+        super().__init__()
+        self.quads = quads
+
+    def nodeid(self, bnode_context=None):
+        if self.peek("_"):
+            return BNode(self.eat(r_nodeid).group(1))
+        return False
+
+    def parse_triple(self, line):
+        self.line = line
+        self.eat(r_wspace)
+        if (not self.line) or self.line.startswith("#"):
+            return None  # The line is empty or a comment
+
+        subject = self.subject()
+        self.eat(r_wspace)
+        predicate = self.predicate()
+        self.eat(r_wspace)
+        obj = self.object()
+        self.eat(r_wspace)
+        if self.quads:
+            # The graph label is ignored: metrics are computed over the union of all graphs
+            self.uriref() or self.nodeid()
+            self.eat(r_wspace)
+        self.eat(r_tail)
+
+        if self.line:
+            raise ParseError(f"Trailing garbage: {self.line}")
+        return subject, predicate, obj
+
+
+def iter_triples(stream, format="nt"):
+    """
+    Reads triples one line at a time from an N-Triples or N-Quads stream.
+
+    Args:
+        stream (iterable): A text file or any iterable of lines.
+        format (str): 'nt' for N-Triples or 'nquads' for N-Quads.
+
+    Yields:
+        tuple: The (subject, predicate, object) of every statement in the stream.
+    """
+    if format not in ("nt", "nquads"):
+        raise ValueError(f"Invalid streaming format: {format}")
+    parser = _LineParser(quads=format == "nquads")
+    for number, line in enumerate(stream, 1):
+        try:
+            triple = parser.parse_triple(line.rstrip("\r\n"))
+        except ParseError:
+            raise ParseError(f"Invalid line {number}: {line.strip()}")
+        if triple is not None:
+            yield triple
+
+
+class StreamingMetrics:
+    """
+    Computes completeness, licensing, duplicates and timeliness in a single pass over a stream of triples.
+
+    Only per-subject state is kept (a bitmask of types and properties, the license values, the first
+    modified date), plus one entry per title or download URL value, so memory grows with the number
+    of subjects and not with the number of triples.
+    """
+
+    def __init__(self):
+        self.triples = 0
+        self._masks = {}
+        self._licenses = {}
+        self._modified = {}
+        self._first_catalog = None
+        self._duplicate_keys = {}
+
+    def add(self, subject, predicate, obj):
+        """
+        Updates the metrics with one triple.
+        """
+        self.triples += 1
+        if predicate == RDF.type:
+            bit = TYPE_BITS.get(obj)
+            if bit:
+                self._masks[subject] = self._masks.get(subject, 0) | bit
+                if bit == TYPE_BITS[dcat.Catalog] and self._first_catalog is None:
+                    self._first_catalog = subject
+            return
+
+        bit = PROPERTY_BITS.get(predicate)
+        if bit:
+            self._masks[subject] = self._masks.get(subject, 0) | bit
+        if predicate == dct.license:
+            self._licenses.setdefault(subject, set()).add(obj)
+        elif predicate == dct.modified:
+            self._modified.setdefault(subject, obj)
+        if predicate in DUPLICATE_PREDICATES:
+            # A value is duplicated once a second distinct (subject, predicate) pair carries it
+            key = self._duplicate_keys.get(obj)
+            if key is None:
+                self._duplicate_keys[obj] = (subject, predicate)
+            elif key is not _DUPLICATE and key != (subject, predicate):
+                self._duplicate_keys[obj] = _DUPLICATE
+
+    def consume(self, triples):
+        """
+        Updates the metrics with every triple of an iterable.
+
+        Returns:
+            StreamingMetrics: This object, for chaining.
+        """
+        for subject, predicate, obj in triples:
+            self.add(subject, predicate, obj)
+        return self
+
+    def completeness(self, property_set):
+        """
+        Returns the same score as check_completeness for the given property set ('dcat' or 'dct').
+        """
+        property_mask = PROPERTY_SET_MASKS[property_set]
+        required = bin(property_mask).count("1")
+        completeness_scores = []
+        for mask in self._masks.values():
+            score = bin(mask & property_mask).count("1") / required * 100
+            # A subject is scored once for each of the three entity types it has
+            for bit in TYPE_BITS.values():
+                if mask & bit:
+                    completeness_scores.append(score)
+        return sum(completeness_scores) / len(completeness_scores) if completeness_scores else 0
+
+    def licensing(self):
+        """
+        Returns the same score as check_licensing.
+        """
+        dataset_bit = TYPE_BITS[dcat.Dataset]
+        licensed_items = 0
+        total_items = 0
+        for subject, mask in self._masks.items():
+            if mask & dataset_bit:
+                licensed_items += len(self._licenses.get(subject, ()))
+                total_items += 1
+        if total_items == 0:
+            return 0
+        else:
+            return licensed_items / total_items * 100
+
+    def duplicates(self):
+        """
+        Returns the same percentage as calculate_duplicates.
+        """
+        total_items = len(self._duplicate_keys)
+        duplicates_count = sum(1 for key in self._duplicate_keys.values() if key is _DUPLICATE)
+        if total_items == 0:
+            return 0
+        else:
+            return (duplicates_count / total_items) * 100
+
+    def timeliness(self):
+        """
+        Returns the same verdict as check_timeliness, using the first catalog found in the stream.
+        """
+        if self._first_catalog is None:
+            return False
+        return is_timely(self._modified.get(self._first_catalog))
+
+    def report(self):
+        """
+        Returns every streaming metric in a dictionary.
+        """
+        return {
+            "triples": self.triples,
+            "subjects": len(self._masks),
+            "completeness_dcat": self.completeness("dcat"),
+            "completeness_dct": self.completeness("dct"),
+            "licensing": self.licensing(),
+            "duplicates": self.duplicates(),
+            "timeliness": self.timeliness(),
+        }
+
+
+def stream_metrics(stream, format="nt"):
+    """
+    Computes the streaming metrics of an N-Triples or N-Quads stream without building a Graph.
+
+    Args:
+        stream (iterable): A text file or any iterable of lines.
+        format (str): 'nt' for N-Triples or 'nquads' for N-Quads.
+
+    Returns:
+        dict: The number of triples and subjects, and the completeness, licensing, duplicates and timeliness scores.
+    """
+    return StreamingMetrics().consume(iter_triples(stream, format)).report()
+
+
+def open_dump(path):
+    """
+    Opens an N-Triples or N-Quads dump for reading as text; '-' reads from stdin and '.gz' files are decompressed.
+    """
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+"""
+This program computes completeness, licensing, duplicates and timeliness in one streaming pass over an N-Triples or N-Quads dump.
+
+Usage: python stream_metrics.py filepath|- [nt|nquads]
+"""
+def main():
+    try:
+        if len(sys.argv) < 2:
+            print("Usage: python stream_metrics.py filepath|- [nt|nquads]")
+            sys.exit(1)
+
+        rdf_data_path = sys.argv[1]
+        rdf_format = sys.argv[2] if len(sys.argv) > 2 else ("nquads" if ".nq" in rdf_data_path else "nt")
+
+        with open_dump(rdf_data_path) as f:
+            report = stream_metrics(f, rdf_format)
+
+        print(f"Triples: {report['triples']}, subjects: {report['subjects']}")
+        print(f"The completeness of {rdf_data_path} using DCAT properties is {report['completeness_dcat']}%.")
+        print(f"The completeness of {rdf_data_path} using DCT properties is {report['completeness_dct']}%.")
+        print(f"The licensing of {rdf_data_path} is {report['licensing']}.")
+        print(f"{report['duplicates']}% of datasets or distributions are duplicated.")
+        print(f"The timeliness {rdf_data_path} is {report['timeliness']}.")
+
+    except FileNotFoundError:
+        print(f"File not found: {rdf_data_path}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
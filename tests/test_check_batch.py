@@ -0,0 +1,64 @@
+import time
+import signal
+import pytest
+import check_all
+import check_batch
+
+CATALOG = "Official catalogs/euromap.ttl"
+
+
+def _slow(context):
+    time.sleep(3)
+    return "finished"
+
+
+def _stuck(context):
+    # Ignores the alarm, as a check blocked in C code would
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(3)
+    return "finished"
+
+
+def _after(context):
+    return "ran"
+
+
+def _stuck_on_easa(context):
+    return _stuck(context) if "easa" in context.rdf_data else "ran"
+
+
+@pytest.fixture
+def checks(monkeypatch):
+    monkeypatch.setitem(check_all.CHECKS, "slow", _slow)
+    monkeypatch.setitem(check_all.CHECKS, "stuck", _stuck)
+    monkeypatch.setitem(check_all.CHECKS, "after", _after)
+    monkeypatch.setitem(check_all.CHECKS, "stuck_on_easa", _stuck_on_easa)
+
+
+def _score_batch(paths, checks, workers):
+    # Without a limit of tasks per child the workers are forked, and see the checks added here
+    return list(check_batch.score_batch(paths, workers, checks, timeout=0.5, max_tasks_per_child=None))
+
+
+def test_timed_out_catalog_stops_at_deadline(checks):
+    result = check_batch.score_catalog(CATALOG, ["slow", "after"], timeout=0.5)
+    assert result["error"] == "Timed out after 0.5s"
+    assert "results" not in result
+    assert result["seconds"] < 1.5
+
+
+def test_stuck_worker_is_killed(checks, monkeypatch):
+    monkeypatch.setattr(check_batch, "GRACE", 0.5)
+    start_time = time.monotonic()
+    reports = _score_batch([CATALOG], ["stuck"], 1)
+    assert time.monotonic() - start_time < 2.5
+    assert [report["error"] for report in reports] == ["Timed out after 0.5s"]
+
+
+def test_other_catalogs_survive_a_killed_worker(checks, monkeypatch):
+    monkeypatch.setattr(check_batch, "GRACE", 0.5)
+    paths = ["Official catalogs/easa.ttl", CATALOG, "Official catalogs/hadea.ttl"]
+    reports = {report["catalog"]: report for report in _score_batch(paths, ["stuck_on_easa"], 2)}
+    assert reports["Official catalogs/easa.ttl"]["error"] == "Timed out after 0.5s"
+    assert reports[CATALOG]["results"] == {"stuck_on_easa": "ran"}
+    assert reports["Official catalogs/hadea.ttl"]["results"] == {"stuck_on_easa": "ran"}
@@ -0,0 +1,18 @@
+import catalog_loader
+from check_compatibility import check_compatibility
+
+CATALOG = "Official catalogs/euromap.ttl"
+
+
+def test_cache_keeps_blank_nodes_apart(tmp_path):
+    with open(CATALOG, "r", encoding="utf-8") as f:
+        rdf_data = f.read()
+    expected = check_compatibility(rdf_data, rdf_data)
+    catalog_loader.configure_graph_cache(str(tmp_path))
+    try:
+        cold = check_compatibility(rdf_data, rdf_data)
+        warm = check_compatibility(rdf_data, rdf_data)
+    finally:
+        catalog_loader.configure_graph_cache(None)
+    assert expected < 100
+    assert cold == warm == expected
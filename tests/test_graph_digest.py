@@ -0,0 +1,15 @@
+from rdflib import Graph
+from check_scalability import apply_replacements, sample_edits
+from check_similarity import are_graphs_identical
+
+CATALOG = "Official catalogs/easa.ttl"
+
+
+def test_edited_graph_is_no_longer_identical():
+    graph1 = Graph().parse(CATALOG, format="turtle")
+    graph2 = Graph().parse(CATALOG, format="turtle")
+    assert are_graphs_identical(graph1, graph2)
+    # The edits replace triples, so the size of the graph stays the same
+    apply_replacements(graph2, sample_edits(graph2, 3))
+    assert len(graph1) == len(graph2)
+    assert not are_graphs_identical(graph1, graph2)
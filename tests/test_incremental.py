@@ -0,0 +1,31 @@
+from check_accuracy import check_links
+from incremental import IncrementalScorer
+
+CATALOG = "Official catalogs/hadea.ttl"
+
+
+class FakeLinkChecker:
+    # Answers every link as reachable except one, which cannot be fetched at all
+    def __init__(self, unreachable):
+        self.unreachable = unreachable
+
+    def check_uris(self, uris):
+        return {str(uri): None if str(uri) == self.unreachable else 200 for uri in uris}
+
+
+def test_unreachable_link_counts_as_broken(tmp_path):
+    with open(CATALOG, "r", encoding="utf-8") as f:
+        rdf_data = f.read()
+    with IncrementalScorer(str(tmp_path / "state.sqlite")) as scorer:
+        scorer.update(rdf_data)
+        unreachable = scorer.connection.execute("SELECT uri FROM link_status ORDER BY uri").fetchone()[0]
+    checker = FakeLinkChecker(unreachable)
+    expected = check_links(rdf_data, checker)
+
+    with IncrementalScorer(str(tmp_path / "state.sqlite"), checker) as scorer:
+        scorer.update(rdf_data)
+        assert scorer.report()["links"] == expected
+        # The result holds on later runs, when no subject changed
+        scorer.update(rdf_data)
+        assert scorer.report()["links"] == expected
+    assert 0 < expected < 100
@@ -0,0 +1,37 @@
+import time
+import threading
+import instrumentation
+from instrumentation import instrumented, phase
+
+
+@instrumented("slow")
+def slow(started, release):
+    with phase("network"):
+        started.set()
+        release.wait()
+
+
+@instrumented("fast")
+def fast(release):
+    with phase("parse"):
+        # The network phase of slow ends in the other thread while this check is running
+        release.set()
+        time.sleep(0.1)
+
+
+def test_threads_keep_their_own_checks():
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        started, release = threading.Event(), threading.Event()
+        thread = threading.Thread(target=slow, args=(started, release))
+        thread.start()
+        started.wait()
+        fast(release)
+        thread.join()
+        checks = instrumentation.report()["checks"]
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+    assert set(checks["slow"]["phases"]) == {"network", "subjects"}
+    assert set(checks["fast"]["phases"]) == {"parse", "subjects"}
@@ -0,0 +1,9 @@
+from timeliness_engine import parse_timestamp
+
+
+def test_hour_24_is_only_the_end_of_the_day():
+    assert parse_timestamp("2023-05-01T24:00:00Z") == parse_timestamp("2023-05-02T00:00:00Z")
+    assert parse_timestamp("2023-05-01T24:00:00.000Z") == parse_timestamp("2023-05-02T00:00:00Z")
+    assert parse_timestamp("2023-05-01T24:30:00Z") is None
+    assert parse_timestamp("2023-05-01T24:00:01Z") is None
+    assert parse_timestamp("2023-05-01T24:00:00.5Z") is None
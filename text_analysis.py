@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from instrumentation import phase, count
+
+# Distinct texts whose token sets and readability features are kept; catalogs repeat the same
+# titles and descriptions across many datasets and distributions
+CACHE_SIZE = 65536
+
+# Readability features of the texts seen last, shared by every check, in least recently used order
+_features = OrderedDict()
+_features_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def stop_words():
+    """
+    Returns the English stopwords, read from the NLTK corpus once per process.
+    """
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def token_set(text):
+    """
+    Tokenizes a text into sentences and words, converting to lowercase and removing stopwords.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        frozenset: The set of preprocessed words, shared by every caller asking for the same text.
+    """
+    from nltk.tokenize import sent_tokenize, word_tokenize
+
+    excluded = stop_words()
+    tokens = set()
+    for sentence in sent_tokenize(text.lower()):
+        tokens.update(word for word in word_tokenize(sentence) if word not in excluded)
+    return frozenset(tokens)
+
+
+def readability_features(texts, workers=None):
+    """
+    Extracts the readability features of a batch of texts, as readability_engine.text_features does,
+    running the engine only on the distinct texts whose features are not memoized yet.
+
+    Args:
+        texts (iterable): The texts or RDF literals.
+        workers (int): The number of processes for large batches of new texts.
+
+    Returns:
+        dict: An integer array per feature, aligned with the texts.
+    """
+    import numpy as np
+    from readability_engine import FEATURES, text_features
+
+    texts = [str(text) for text in texts]
+    rows = {}
+    with _features_lock:
+        for text in dict.fromkeys(texts):
+            if text in _features:
+                _features.move_to_end(text)
+                rows[text] = _features[text]
+    missing = [text for text in dict.fromkeys(texts) if text not in rows]
+    if missing:
+        extracted = text_features(missing, workers)
+        table = np.stack([extracted[name] for name in FEATURES], axis=1)
+        with _features_lock:
+            for text, row in zip(missing, table):
+                rows[text] = _features[text] = row
+            while len(_features) > CACHE_SIZE:
+                _features.popitem(last=False)
+    count("memoized_texts", len(rows) - len(missing))
+    table = np.array([rows[text] for text in texts], dtype=np.int64).reshape(len(texts), len(FEATURES))
+    return {name: table[:, column] for column, name in enumerate(FEATURES)}
+
+
+def readability_grade(text):
+    """
+    Calculates the Flesch-Kincaid grade of a text with the readability engine, as check_readability does.
+
+    Args:
+        text (str): The text to score.
+
+    Returns:
+        float: The Flesch-Kincaid grade level.
+    """
+    return readability_grades([text], workers=1)[0]
+
+
+def _analyze(texts, analysis):
+    """
+    Applies a memoized analysis to a batch of texts, running it once per distinct text.
+    """
+    # RDF literals compare by datatype and language, so they are keyed by their lexical form
+    with phase("text_analysis"):
+        texts = [str(text) for text in texts]
+        results = {text: analysis(text) for text in dict.fromkeys(texts)}
+    count("texts", len(texts))
+    count("distinct_texts", len(results))
+    return [results[text] for text in texts]
+
+
+def token_sets(texts):
+    """
+    Tokenizes a batch of texts, such as all titles of a catalog.
+
+    Args:
+        texts (iterable): The texts or RDF literals to tokenize.
+
+    Returns:
+        list: The frozenset of preprocessed words of each text, in order.
+    """
+    return _analyze(texts, token_set)
+
+
+def readability_grades(texts, workers=None):
+    """
+    Calculates the Flesch-Kincaid grade of a batch of texts from their memoized features.
+
+    Args:
+        texts (iterable): The texts or RDF literals to score.
+        workers (int): The number of processes for large batches of new texts.
+
+    Returns:
+        list: The grade of each text, in order.
+    """
+    from readability_engine import grades
+    return grades(readability_features(texts, workers)).tolist()
+
+
+def clear_caches():
+    """
+    Empties the memoized token sets and readability features, e.g. between unrelated batches.
+    """
+    token_set.cache_clear()
+    with _features_lock:
+        _features.clear()
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import re
+import sys
+import json
+import argparse
+from datetime import date, datetime, timezone
+from functools import lru_cache
+import numpy as np
+from rdflib import RDF, Namespace
+from catalog_loader import load_graph
+from instrumentation import instrumented
+
+dcat = Namespace("http://www.w3.org/ns/dcat#")
+dcterms = Namespace("http://purl.org/dc/terms/")
+
+# Entity types scored by default, by name
+ENTITY_CLASSES = {
+    "catalog": dcat.Catalog,
+    "dataset": dcat.Dataset,
+    "distribution": dcat.Distribution,
+}
+
+# An entity is timely when it was updated within this many days, unless its update frequency asks for less
+THRESHOLD_DAYS = 365
+
+# Upper bounds of the staleness histogram bins, in days; the last bin holds every older entity
+HISTOGRAM_DAYS = [30, 90, 180, 365, 730]
+
+PERCENTILES = [50, 90, 99]
+
+# Distinct temporal literals whose parsed values are kept; dates repeat across entities far more than timestamps
+CACHE_SIZE = 65536
+
+# Expected days between updates for the last segment of an EU or Dublin Core frequency URI
+FREQUENCY_DAYS = {
+    "cont": 1, "update_cont": 1, "continuous": 1, "daily": 1, "daily_2": 1,
+    "weekly": 7, "weekly_2": 4, "weekly_3": 3, "biweekly": 14, "semiweekly": 4,
+    "monthly": 31, "monthly_2": 16, "monthly_3": 11, "bimonthly": 62, "semimonthly": 16,
+    "quarterly": 92, "annual_3": 122, "annual_2": 183, "semiannual": 183,
+    "annual": 366, "biennial": 731, "triennial": 1096, "quadrennial": 1461, "quinquennial": 1827, "decennial": 3653,
+}
+
+# ISO-8601 and XSD dates, date-times with optional fractional seconds, and gYear / gYearMonth values, with an optional offset
+_TIMESTAMP = re.compile(
+    r"\s*(-?\d{4,})(?:-(\d\d)(?:-(\d\d)(?:[T ](\d\d):(\d\d)(?::(\d\d)(?:[.,](\d+))?)?)?)?)?"
+    r"\s*(Z|[+-]\d\d:?\d\d)?\s*$"
+)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_timestamp(text):
+    """
+    Parses an ISO-8601 date or date-time, as found in xsd:date, xsd:dateTime, xsd:gYear or plain literals.
+    Values without an offset are taken as UTC.
+
+    Args:
+        text (str): The lexical form of the literal.
+
+    Returns:
+        float: The POSIX timestamp in seconds, or None if the text is not a valid date.
+    """
+    match = _TIMESTAMP.match(text)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    try:
+        ordinal = date(int(year), int(month or 1), int(day or 1)).toordinal()
+    except ValueError:
+        return None
+    hour, minute, second = int(hour or 0), int(minute or 0), int(second or 0)
+    # 24:00:00 is the end of the day; any later time of hour 24 is invalid
+    if hour > 24 or minute > 59 or second > 60 or (hour == 24 and (minute or second or (fraction and int(fraction)))):
+        return None
+    seconds = (ordinal - _EPOCH_ORDINAL) * 86400 + hour * 3600 + minute * 60 + second
+    if fraction:
+        seconds += int(fraction) / 10 ** len(fraction)
+    if offset and offset != "Z":
+        sign = -1 if offset[0] == "-" else 1
+        seconds -= sign * (int(offset[1:3]) * 3600 + int(offset[-2:]) * 60)
+    return float(seconds)
+
+
+def frequency_days(frequency):
+    """
+    Returns the expected days between updates of a frequency URI or literal, or None if it is irregular or unknown.
+    """
+    name = str(frequency).rstrip("/").rsplit("/", 1)[-1].rsplit("#", 1)[-1].lower()
+    return FREQUENCY_DAYS.get(name)
+
+
+def _latest(values):
+    # The latest of the parsed values of every literal of each subject
+    latest = {}
+    unparsable = set()
+    for subject, obj in values:
+        timestamp = parse_timestamp(str(obj))
+        if timestamp is None:
+            unparsable.add(subject)
+        elif timestamp > latest.get(subject, -np.inf):
+            latest[subject] = timestamp
+    return latest, unparsable
+
+
+@instrumented("timeliness_report")
+def timeliness_report(rdf_data, classes=None, now=None, threshold_days=THRESHOLD_DAYS):
+    """
+    Measures how recently every catalog, dataset and distribution was updated.
+
+    The last update of an entity is its latest dct:modified, or its latest dct:issued if it has no
+    modified date. An entity is timely when that update is no older than its dct:accrualPeriodicity
+    requires, or than threshold_days when it declares no regular frequency.
+
+    Args:
+        rdf_data (str or rdflib.Graph): The RDF data in Turtle format, or an already-parsed graph.
+        classes (dict): The entity types to report, by name. Defaults to ENTITY_CLASSES.
+        now (datetime): The reference date of the ages. Defaults to the current time.
+        threshold_days (float): The age in days above which an entity without a frequency is stale.
+
+    Returns:
+        dict: Per entity type, the number of entities, of those with a usable date, with only unparsable
+            dates, and with a frequency; the percentage of timely entities among the dated ones; the
+            percentiles of their age in days; and the histogram of their ages by HISTOGRAM_DAYS.
+    """
+    graph = load_graph(rdf_data)
+    now = (now or datetime.now(timezone.utc)).timestamp()
+
+    modified, unparsable_modified = _latest(graph.subject_objects(dcterms.modified))
+    issued, unparsable_issued = _latest(graph.subject_objects(dcterms.issued))
+    frequencies = {subject: frequency_days(obj) for subject, obj in graph.subject_objects(dcterms.accrualPeriodicity)}
+    unparsable = unparsable_modified | unparsable_issued
+
+    labels = [f"<={HISTOGRAM_DAYS[0]}"]
+    labels += [f"{low}-{high}" for low, high in zip(HISTOGRAM_DAYS, HISTOGRAM_DAYS[1:])]
+    labels.append(f">{HISTOGRAM_DAYS[-1]}")
+    bins = np.array([-np.inf] + HISTOGRAM_DAYS + [np.inf])
+
+    report = {}
+    for name, cls in (classes or ENTITY_CLASSES).items():
+        entities = list(dict.fromkeys(graph.subjects(RDF.type, cls)))
+        updates = np.array([modified.get(entity, issued.get(entity, np.nan)) for entity in entities], dtype=float)
+        limits = np.array([frequencies.get(entity) or threshold_days for entity in entities], dtype=float)
+        dated = ~np.isnan(updates)
+        ages = (now - updates[dated]) / 86400
+        timely = ages <= limits[dated]
+        histogram = np.histogram(ages, bins)[0] if len(ages) else np.zeros(len(labels), dtype=int)
+        report[name] = {
+            "entities": len(entities),
+            "dated": int(dated.sum()),
+            "unparsable": sum(1 for entity, has_date in zip(entities, dated) if not has_date and entity in unparsable),
+            "with_frequency": sum(1 for entity in entities if frequencies.get(entity)),
+            "timely": float(timely.mean() * 100) if len(ages) else 0,
+            "age_days": dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(ages, PERCENTILES).tolist()))
+                        if len(ages) else {f"p{p}": None for p in PERCENTILES},
+            "histogram": dict(zip(labels, histogram.tolist())),
+        }
+    return report
+
+
+"""
+This program reports how recently the catalogs, datasets and distributions of a Data Catalog were updated.
+
+Usage: python timeliness_engine.py filepath [--threshold-days 365] [--json]
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Reports the timeliness of every entity of a Data Catalog.")
+    parser.add_argument("filepath", help="The Data Catalog in Turtle format.")
+    parser.add_argument("--threshold-days", type=float, default=THRESHOLD_DAYS, help="Age above which an entity without a frequency is stale.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    try:
+        with open(args.filepath, "r", encoding="utf-8") as f:
+            rdf_data = f.read()
+        report = timeliness_report(rdf_data, threshold_days=args.threshold_days)
+
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+        for name, result in report.items():
+            print(f"{name}: {result['timely']:.2f}% timely of {result['dated']} dated out of {result['entities']} "
+                  f"({result['unparsable']} with unparsable dates, {result['with_frequency']} with a frequency)")
+            if result["dated"]:
+                percentiles = ", ".join(f"{key} {value:.0f}d" for key, value in result["age_days"].items())
+                print(f"    age: {percentiles}")
+                print(f"    histogram: {', '.join(f'{label}d: {count}' for label, count in result['histogram'].items())}")
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
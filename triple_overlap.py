@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+[Martinez-Gil2023d]  Framework to Automatically Determine the Quality of Open Data Catalogs, arXiv preprint arXiv:2307.15464, 2023
+
+@author: Jorge Martinez-Gil
+"""
+import os
+import sys
+import heapq
+import hashlib
+import tempfile
+import numpy as np
+from rdflib import BNode
+from catalog_loader import load_graph
+from stream_metrics import iter_triples, open_dump
+
+# Memory used for the fingerprints of a sorted run and for reading runs back, in bytes
+MEMORY_BUDGET = 256 * 1024 ** 2
+
+# Size of a triple fingerprint in bytes: 8 or 16
+DIGEST_SIZE = 16
+
+# Formats read one line at a time from a dump; any other format is parsed into a graph
+STREAMING_FORMATS = ("nt", "nquads")
+
+# Approximate memory of a fingerprint while runs are merged, on top of its digest bytes
+_MERGE_OVERHEAD = 64
+
+
+def triple_fingerprint(subject, predicate, obj, salt, digest_size=DIGEST_SIZE):
+    """
+    Hashes the canonical N-Triples form of a triple into a fixed-width fingerprint.
+
+    Blank nodes of two separately parsed catalogs are never the same node, so triples with a
+    blank node are salted with their source and can only match triples of the same source.
+
+    Args:
+        subject, predicate, obj (rdflib.term.Node): The terms of the triple.
+        salt (bytes): Identifies the source of the triple.
+        digest_size (int): The size of the fingerprint in bytes.
+
+    Returns:
+        bytes: The fingerprint.
+    """
+    line = f"{subject.n3()} {predicate.n3()} {obj.n3()} .".encode("utf-8")
+    if isinstance(subject, BNode) or isinstance(obj, BNode):
+        line = salt + line
+    return hashlib.blake2b(line, digest_size=digest_size).digest()
+
+
+def iter_source(source, format="turtle"):
+    """
+    Yields the triples of a catalog: N-Triples and N-Quads dumps are read one line at a time from
+    their path, and other formats are parsed with load_graph.
+    """
+    if format in STREAMING_FORMATS:
+        with open_dump(source) as f:
+            yield from iter_triples(f, format)
+    else:
+        yield from load_graph(source, format)
+
+
+def write_runs(triples, directory, salt, memory_budget=MEMORY_BUDGET, digest_size=DIGEST_SIZE):
+    """
+    Writes the fingerprints of a stream of triples to sorted, deduplicated run files.
+
+    Each run holds as many fingerprints as fit in the memory budget, counting the copy made by sorting.
+
+    Returns:
+        list: The paths of the run files.
+    """
+    run_size = max(1, memory_budget // (2 * digest_size)) * digest_size
+    runs = []
+    buffer = bytearray()
+
+    def flush():
+        fingerprints = np.unique(np.frombuffer(buffer, dtype=f"V{digest_size}"))
+        descriptor, path = tempfile.mkstemp(suffix=".run", dir=directory)
+        os.close(descriptor)
+        fingerprints.tofile(path)
+        runs.append(path)
+        buffer.clear()
+
+    for subject, predicate, obj in triples:
+        buffer += triple_fingerprint(subject, predicate, obj, salt, digest_size)
+        if len(buffer) >= run_size:
+            flush()
+    if buffer:
+        flush()
+    return runs
+
+
+def _read_run(path, chunk_records, digest_size):
+    """
+    Yields the fingerprints of a run file, reading a bounded chunk at a time.
+    """
+    dtype = np.dtype(f"V{digest_size}")
+    with open(path, "rb") as f:
+        while True:
+            chunk = np.fromfile(f, dtype=dtype, count=chunk_records)
+            if len(chunk) == 0:
+                return
+            yield from chunk.tolist()
+
+
+def merge_runs(runs, memory_budget=MEMORY_BUDGET, digest_size=DIGEST_SIZE):
+    """
+    Merges sorted run files into one sorted stream of distinct fingerprints.
+    """
+    chunk_records = max(1, memory_budget // (max(1, len(runs)) * (digest_size + _MERGE_OVERHEAD)))
+    previous = None
+    for fingerprint in heapq.merge(*(_read_run(path, chunk_records, digest_size) for path in runs)):
+        if fingerprint != previous:
+            yield fingerprint
+            previous = fingerprint
+
+
+def count_overlap(fingerprints1, fingerprints2):
+    """
+    Counts the distinct fingerprints of the first sorted stream and those it shares with the second.
+
+    Returns:
+        tuple: The number of fingerprints of the first stream, and the number in common.
+    """
+    total = common = 0
+    fingerprints2 = iter(fingerprints2)
+    other = next(fingerprints2, None)
+    for fingerprint in fingerprints1:
+        total += 1
+        while other is not None and other < fingerprint:
+            other = next(fingerprints2, None)
+        if other == fingerprint:
+            common += 1
+    return total, common
+
+
+def compatibility(source1, source2, format="turtle", memory_budget=MEMORY_BUDGET, digest_size=DIGEST_SIZE, temp_dir=None):
+    """
+    Calculates the percentage of the triples of the first catalog that the second one also has,
+    with memory bounded by the budget instead of the size of the catalogs.
+
+    Triples are reduced to fingerprints, written to sorted runs on disk and intersected by an
+    external merge. The result equals check_compatibility unless two distinct triples collide,
+    which for 128-bit fingerprints is negligible even at billions of triples.
+
+    Args:
+        source1 (str or rdflib.Graph): The first catalog: a dump path for streaming formats, else RDF data or a graph.
+        source2 (str or rdflib.Graph): The second catalog, in the same format.
+        format (str): The format of both catalogs, e.g. 'nt', 'nquads' or 'turtle'.
+        memory_budget (int): The memory for fingerprints, in bytes.
+        digest_size (int): The size of the fingerprints in bytes.
+        temp_dir (str): The directory for the run files. Defaults to the system temporary directory.
+
+    Returns:
+        float: The percentage of triples in common, or None if the first catalog has no triples.
+    """
+    if digest_size not in (8, 16):
+        raise ValueError(f"Invalid fingerprint size: {digest_size}")
+
+    with tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+        runs1 = write_runs(iter_source(source1, format), directory, b"1", memory_budget, digest_size)
+        # The blank nodes of a graph compared with itself are shared, as in check_compatibility
+        salt2 = b"1" if source2 is source1 and format not in STREAMING_FORMATS else b"2"
+        runs2 = write_runs(iter_source(source2, format), directory, salt2, memory_budget, digest_size)
+        # Both merges are read at once, so each gets half of the budget
+        total, common = count_overlap(
+            merge_runs(runs1, memory_budget // 2, digest_size),
+            merge_runs(runs2, memory_budget // 2, digest_size),
+        )
+
+    if total == 0:
+        return None
+    return (common / total) * 100
+
+
+"""
+This program checks the compatibility of two large Data Catalogs out of core, streaming N-Triples or N-Quads dumps.
+
+Usage: python triple_overlap.py filepath1 filepath2 [nt|nquads|turtle] [memory_budget_mb]
+"""
+def main():
+    try:
+        if len(sys.argv) < 3:
+            print("Usage: python triple_overlap.py filepath1 filepath2 [nt|nquads|turtle] [memory_budget_mb]")
+            sys.exit(1)
+
+        rdf_data_path = sys.argv[1]
+        rdf_data_path2 = sys.argv[2]
+        rdf_format = sys.argv[3] if len(sys.argv) > 3 else ("nquads" if ".nq" in rdf_data_path else "nt")
+        memory_budget = int(float(sys.argv[4]) * 1024 ** 2) if len(sys.argv) > 4 else MEMORY_BUDGET
+
+        if rdf_format in STREAMING_FORMATS:
+            result = compatibility(rdf_data_path, rdf_data_path2, rdf_format, memory_budget)
+        else:
+            with open(rdf_data_path, "r", encoding="utf-8") as f:
+                rdf_data = f.read()
+            with open(rdf_data_path2, "r", encoding="utf-8") as f:
+                rdf_data2 = f.read()
+            result = compatibility(rdf_data, rdf_data2, rdf_format, memory_budget)
+
+        if result is None:
+            print("No triples found in the RDF data.")
+        else:
+            print(f"The compatibility of {rdf_data_path} and {rdf_data_path2} is {result}%.")
+
+    except FileNotFoundError:
+        print(f"File not found: {rdf_data_path} or {rdf_data_path2}")
+        sys.exit(1)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()